@@ -0,0 +1,38 @@
+"""Indexes for keyset pagination on (created_at, id)
+
+Revision ID: 0003_keyset_pagination_indexes
+Revises: 0002_seed_admin_role_and_user
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0003_keyset_pagination_indexes"
+down_revision: Union[str, None] = "0002_seed_admin_role_and_user"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_groups_created_at_id", "groups", ["created_at", "id"])
+    op.create_index(
+        "ix_groups_parent_created_at_id",
+        "groups",
+        ["parent_group_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_groups_status_created_at_id", "groups", ["status", "created_at", "id"]
+    )
+    op.create_index("ix_clients_created_at_id", "clients", ["created_at", "id"])
+    op.create_index("ix_roles_created_at_id", "roles", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_roles_created_at_id", table_name="roles")
+    op.drop_index("ix_clients_created_at_id", table_name="clients")
+    op.drop_index("ix_groups_status_created_at_id", table_name="groups")
+    op.drop_index("ix_groups_parent_created_at_id", table_name="groups")
+    op.drop_index("ix_groups_created_at_id", table_name="groups")
@@ -0,0 +1,39 @@
+"""Client logo metadata (content type, size, sha256)
+
+Revision ID: 0004_client_logo_metadata
+Revises: 0003_keyset_pagination_indexes
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004_client_logo_metadata"
+down_revision: Union[str, None] = "0003_keyset_pagination_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("clients", sa.Column("logo_content_type", sa.String(length=100), nullable=True))
+    op.add_column("clients", sa.Column("logo_size", sa.Integer(), nullable=True))
+    op.add_column("clients", sa.Column("logo_sha256", sa.String(length=64), nullable=True))
+    # Backfill metadata for logos stored before this revision.
+    op.execute(
+        """
+        UPDATE clients
+        SET logo_size = octet_length(logo),
+            logo_sha256 = encode(sha256(logo), 'hex'),
+            logo_content_type = 'application/octet-stream'
+        WHERE logo IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("clients", "logo_sha256")
+    op.drop_column("clients", "logo_size")
+    op.drop_column("clients", "logo_content_type")
@@ -0,0 +1,55 @@
+"""Group hierarchy closure table
+
+Revision ID: 0005_group_closure
+Revises: 0004_client_logo_metadata
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0005_group_closure"
+down_revision: Union[str, None] = "0004_client_logo_metadata"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "group_closure",
+        sa.Column("ancestor_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("descendant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["groups.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["groups.id"], ondelete="CASCADE"),
+    )
+    op.create_index(
+        "ix_group_closure_descendant_depth",
+        "group_closure",
+        ["descendant_id", "depth"],
+    )
+
+    # Backfill from the existing parent_group_id links.
+    op.execute(
+        """
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM groups
+            UNION ALL
+            SELECT tree.ancestor_id, g.id, tree.depth + 1
+            FROM tree
+            JOIN groups g ON g.parent_group_id = tree.descendant_id
+        )
+        INSERT INTO group_closure (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, depth FROM tree
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_group_closure_descendant_depth", table_name="group_closure")
+    op.drop_table("group_closure")
@@ -0,0 +1,71 @@
+"""Indexes for permission/membership lookups; drop redundant ones
+
+Revision ID: 0006_hot_lookup_indexes
+Revises: 0005_group_closure
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006_hot_lookup_indexes"
+down_revision: Union[str, None] = "0005_group_closure"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Each duplicates the primary key or a UNIQUE constraint's own index.
+REDUNDANT_INDEXES = [
+    ("ix_users_id", "users", ["id"]),
+    ("ix_users_email", "users", ["email"]),
+    ("ix_users_phone", "users", ["phone"]),
+    ("ix_roles_id", "roles", ["id"]),
+    ("ix_roles_name", "roles", ["name"]),
+    ("ix_groups_id", "groups", ["id"]),
+    ("ix_groups_code", "groups", ["code"]),
+    ("ix_group_memberships_id", "group_memberships", ["id"]),
+    ("ix_user_role_assignments_id", "user_role_assignments", ["id"]),
+    ("ix_clients_id", "clients", ["id"]),
+]
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_group_memberships_user_group_active",
+        "group_memberships",
+        ["user_id", "group_id"],
+        postgresql_where=sa.text("exited_at IS NULL"),
+    )
+    op.create_index(
+        "ix_group_memberships_group_user", "group_memberships", ["group_id", "user_id"]
+    )
+    op.create_index(
+        "ix_user_role_assignments_user_scope",
+        "user_role_assignments",
+        ["user_id", "scope_type", "scope_id"],
+    )
+    op.create_index(
+        "ix_user_role_assignments_role_id", "user_role_assignments", ["role_id"]
+    )
+
+    for name, table, _ in REDUNDANT_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    for name, table, columns in reversed(REDUNDANT_INDEXES):
+        op.create_index(name, table, columns)
+
+    op.drop_index(
+        "ix_user_role_assignments_role_id", table_name="user_role_assignments"
+    )
+    op.drop_index(
+        "ix_user_role_assignments_user_scope", table_name="user_role_assignments"
+    )
+    op.drop_index("ix_group_memberships_group_user", table_name="group_memberships")
+    op.drop_index(
+        "ix_group_memberships_user_group_active", table_name="group_memberships"
+    )
@@ -0,0 +1,51 @@
+"""Refresh token revocations (rotation, logout, reuse detection)
+
+Revision ID: 0007_refresh_token_revocations
+Revises: 0006_hot_lookup_indexes
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0007_refresh_token_revocations"
+down_revision: Union[str, None] = "0006_hot_lookup_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "refresh_token_revocations",
+        sa.Column("token_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_refresh_token_revocations_expires_at",
+        "refresh_token_revocations",
+        ["expires_at"],
+    )
+    op.create_index(
+        "ix_refresh_token_revocations_kind_expires_at",
+        "refresh_token_revocations",
+        ["kind", "expires_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_refresh_token_revocations_kind_expires_at",
+        table_name="refresh_token_revocations",
+    )
+    op.drop_index(
+        "ix_refresh_token_revocations_expires_at",
+        table_name="refresh_token_revocations",
+    )
+    op.drop_table("refresh_token_revocations")
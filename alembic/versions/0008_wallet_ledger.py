@@ -0,0 +1,146 @@
+"""Wallet ledger (wallets, append-only transactions and entries, holds)
+
+Revision ID: 0008_wallet_ledger
+Revises: 0007_refresh_token_revocations
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0008_wallet_ledger"
+down_revision: Union[str, None] = "0007_refresh_token_revocations"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "wallets",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("owner_type", sa.String(length=16), nullable=False),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("balance", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("held", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("min_balance", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("sequence", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_wallets_owner_currency",
+        "wallets",
+        ["owner_type", "owner_id", "currency"],
+        unique=True,
+    )
+
+    op.create_table(
+        "ledger_transactions",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("reference", sa.String(length=64), nullable=False, unique=True),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+
+    op.create_table(
+        "ledger_entries",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "transaction_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("ledger_transactions.id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "wallet_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("wallets.id"),
+            nullable=False,
+        ),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("sequence", sa.BigInteger(), nullable=True),
+        sa.Column("balance_after", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_ledger_entries_wallet_sequence",
+        "ledger_entries",
+        ["wallet_id", "sequence"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_ledger_entries_transaction_id",
+        "ledger_entries",
+        ["transaction_id"],
+    )
+
+    op.create_table(
+        "wallet_holds",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "wallet_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("wallets.id"),
+            nullable=False,
+        ),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("reference", sa.String(length=64), nullable=False, unique=True),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="active"),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column(
+            "transaction_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("ledger_transactions.id"),
+            nullable=True,
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("resolved_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_wallet_holds_wallet_status",
+        "wallet_holds",
+        ["wallet_id", "status"],
+    )
+
+    # Postings are immutable: reject UPDATE and DELETE whatever issues them.
+    op.execute(
+        """
+        CREATE FUNCTION ledger_append_only() RETURNS trigger AS $$
+        BEGIN
+            RAISE EXCEPTION '% rows are append-only', TG_TABLE_NAME;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in ("ledger_transactions", "ledger_entries"):
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_append_only
+            BEFORE UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION ledger_append_only()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in ("ledger_entries", "ledger_transactions"):
+        op.execute(f"DROP TRIGGER {table}_append_only ON {table}")
+    op.execute("DROP FUNCTION ledger_append_only()")
+    op.drop_index("ix_wallet_holds_wallet_status", table_name="wallet_holds")
+    op.drop_table("wallet_holds")
+    op.drop_index("ix_ledger_entries_transaction_id", table_name="ledger_entries")
+    op.drop_index("ix_ledger_entries_wallet_sequence", table_name="ledger_entries")
+    op.drop_table("ledger_entries")
+    op.drop_table("ledger_transactions")
+    op.drop_index("ix_wallets_owner_currency", table_name="wallets")
+    op.drop_table("wallets")
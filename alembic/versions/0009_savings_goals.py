@@ -0,0 +1,89 @@
+"""Savings goals and contribution schedules
+
+Revision ID: 0009_savings_goals
+Revises: 0008_wallet_ledger
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0009_savings_goals"
+down_revision: Union[str, None] = "0008_wallet_ledger"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "savings_goals",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "group_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("groups.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("target_amount", sa.BigInteger(), nullable=True),
+        sa.Column("contribution_amount", sa.BigInteger(), nullable=True),
+        sa.Column("frequency", sa.String(length=16), nullable=False),
+        sa.Column("interval_days", sa.Integer(), nullable=True),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("include_subgroups", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="active"),
+        sa.Column("schedule_cut_date", sa.Date(), nullable=False),
+        sa.Column("schedule_cut_period", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.CheckConstraint(
+            "(group_id IS NULL) <> (user_id IS NULL)", name="ck_savings_goals_one_owner"
+        ),
+    )
+    op.create_index("ix_savings_goals_group_id", "savings_goals", ["group_id"])
+    op.create_index("ix_savings_goals_user_id", "savings_goals", ["user_id"])
+
+    op.create_table(
+        "contribution_schedules",
+        sa.Column(
+            "goal_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("savings_goals.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("period", sa.Integer(), primary_key=True),
+        sa.Column("due_date", sa.Date(), nullable=False),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+    )
+    op.create_index(
+        "ix_contribution_schedules_user_due_date",
+        "contribution_schedules",
+        ["user_id", "due_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contribution_schedules_user_due_date", table_name="contribution_schedules")
+    op.drop_table("contribution_schedules")
+    op.drop_index("ix_savings_goals_user_id", table_name="savings_goals")
+    op.drop_index("ix_savings_goals_group_id", table_name="savings_goals")
+    op.drop_table("savings_goals")
@@ -0,0 +1,45 @@
+"""Database-assigned permission versions
+
+Revision ID: 0010_permission_versions
+Revises: 0009_savings_goals
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0010_permission_versions"
+down_revision: Union[str, None] = "0009_savings_goals"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GLOBAL_SCOPE = "00000000-0000-0000-0000-000000000000"
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE permission_version_seq")
+    op.create_table(
+        "permission_versions",
+        sa.Column("scope_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column(
+            "changed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+    )
+    op.create_index(
+        "ix_permission_versions_changed_at", "permission_versions", ["changed_at"]
+    )
+    # The global row always exists: user-level bumps share-lock it.
+    op.execute(
+        f"INSERT INTO permission_versions (scope_id, version) VALUES ('{GLOBAL_SCOPE}', 0)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_permission_versions_changed_at", table_name="permission_versions")
+    op.drop_table("permission_versions")
+    op.execute("DROP SEQUENCE permission_version_seq")
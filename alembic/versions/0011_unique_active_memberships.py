@@ -0,0 +1,57 @@
+"""Make the active-membership index unique
+
+Revision ID: 0011_unique_active_memberships
+Revises: 0010_permission_versions
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0011_unique_active_memberships"
+down_revision: Union[str, None] = "0010_permission_versions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duplicates left by concurrent imports: keep the earliest active row.
+    op.execute(
+        """
+        UPDATE group_memberships AS m
+        SET exited_at = now()
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY user_id, group_id ORDER BY joined_at, id
+            ) AS n
+            FROM group_memberships
+            WHERE exited_at IS NULL
+        ) AS d
+        WHERE m.id = d.id AND d.n > 1
+        """
+    )
+    op.drop_index(
+        "ix_group_memberships_user_group_active", table_name="group_memberships"
+    )
+    op.create_index(
+        "ix_group_memberships_user_group_active",
+        "group_memberships",
+        ["user_id", "group_id"],
+        unique=True,
+        postgresql_where=sa.text("exited_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_group_memberships_user_group_active", table_name="group_memberships"
+    )
+    op.create_index(
+        "ix_group_memberships_user_group_active",
+        "group_memberships",
+        ["user_id", "group_id"],
+        postgresql_where=sa.text("exited_at IS NULL"),
+    )
@@ -0,0 +1,172 @@
+"""
+Helpers for serving stored binaries (client logos) over HTTP.
+
+Bytes are read from Postgres in ``CLIENT_LOGO_CHUNK_BYTES`` slices with
+``substr()`` so a worker never holds a whole blob, and responses carry a
+strong ETag (the content sha256), honour ``If-None-Match`` and single
+``Range`` requests, and are cacheable forever when addressed by hash.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterator, Optional, Tuple, Union
+
+from fastapi import HTTPException, Request, UploadFile, status
+from fastapi.responses import Response, StreamingResponse
+
+from app.api.conditional import etag_matches
+from app.core.config import settings
+
+ALLOWED_IMAGE_TYPES = {"image/png", "image/jpeg", "image/webp", "image/gif"}
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+@dataclass
+class BlobMeta:
+    content_type: str
+    size: int
+    sha256: str
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.sha256}"'
+
+
+class BlobChanged(RuntimeError):
+    """
+    Raised by a chunk iterator when the blob no longer matches the headers
+    already sent. The server then drops the connection, so the client sees
+    a failed transfer instead of a body that ends cleanly but short.
+    """
+
+
+# Read every chunk of a blob from one snapshot (Postgres), so a concurrent
+# replacement does not cut the stream short.
+SNAPSHOT_READ = {"isolation_level": "REPEATABLE READ"}
+
+
+async def read_image_upload(file: UploadFile, max_bytes: int) -> Tuple[bytes, BlobMeta]:
+    """Read an uploaded image, enforcing type and size, and hash it on the way."""
+    content_type = (file.content_type or "").lower()
+    if content_type not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported image type; use one of {', '.join(sorted(ALLOWED_IMAGE_TYPES))}",
+        )
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    while True:
+        chunk = await file.read(64 * 1024)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Image exceeds {max_bytes} bytes",
+            )
+        digest.update(chunk)
+        chunks.append(chunk)
+    if size == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty upload",
+        )
+    return b"".join(chunks), BlobMeta(content_type, size, digest.hexdigest())
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into an inclusive ``(start, end)``.
+
+    Returns None to serve the full body (no/multi/unknown-unit range) and
+    raises 416 when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    spec = header[len("bytes="):].strip()
+    start_s, sep, end_s = spec.partition("-")
+    if not sep:
+        return None
+    try:
+        if start_s == "":
+            suffix = int(end_s)
+            if suffix <= 0:
+                raise ValueError
+            start, end = max(size - suffix, 0), size - 1
+        else:
+            start = int(start_s)
+            end = int(end_s) if end_s else size - 1
+            end = min(end, size - 1)
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+ChunkIterator = Union[Iterator[bytes], AsyncIterator[bytes]]
+
+
+def blob_response(
+    request: Request,
+    meta: BlobMeta,
+    open_chunks: Callable[[int, int], ChunkIterator],
+) -> Response:
+    """
+    Build a conditional, range-aware streaming response.
+
+    ``open_chunks(offset, length)`` must yield the bytes ``[offset, offset+length)``,
+    or raise ``BlobChanged`` if it cannot; it is only called when a body is
+    actually sent.
+    """
+    versioned = request.query_params.get("v") == meta.sha256
+    headers = {
+        "ETag": meta.etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if versioned else REVALIDATE_CACHE_CONTROL,
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, meta.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == meta.etag:
+        byte_range = parse_range(request.headers.get("range"), meta.size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(meta.size)
+        return StreamingResponse(
+            open_chunks(0, meta.size), media_type=meta.content_type, headers=headers
+        )
+
+    start, end = byte_range
+    length = end - start + 1
+    headers["Content-Length"] = str(length)
+    headers["Content-Range"] = f"bytes {start}-{end}/{meta.size}"
+    return StreamingResponse(
+        open_chunks(start, length),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=meta.content_type,
+        headers=headers,
+    )
+
+
+def chunk_bounds(offset: int, length: int) -> Iterator[Tuple[int, int]]:
+    """Split ``[offset, offset+length)`` into 1-based ``substr`` (start, count) pairs."""
+    chunk = settings.CLIENT_LOGO_CHUNK_BYTES
+    position = offset
+    stop = offset + length
+    while position < stop:
+        count = min(chunk, stop - position)
+        yield position + 1, count
+        position += count
@@ -0,0 +1,94 @@
+"""
+Conditional GET support (``ETag`` / ``Last-Modified`` / ``304 Not Modified``).
+
+Validators are derived from ``updated_at`` only, never from the serialized
+body, so a matching request is answered before anything is serialized:
+- single resources: ``id`` + ``updated_at`` of the row;
+- list pages: the query string plus ``(id, updated_at)`` of every row on the
+  page (one narrow query over the same keyset window), so edits, inserts and
+  deletes that change the page all change the ETag. Pages carry no
+  ``Last-Modified``: a row deleted or moved out of the filter leaves the newest
+  remaining ``updated_at`` unchanged, so ``If-Modified-Since`` would answer 304
+  for a page that did change.
+
+Responses are ``Cache-Control: private, no-cache``: clients keep them but
+revalidate on every use, which is what a poll on screen open wants.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional, Sequence
+
+from fastapi import Request, Response, status
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def weak_etag(parts: Iterable[Any]) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+@dataclass
+class Validators:
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def for_row(cls, row_id: Any, updated_at: Optional[datetime]) -> "Validators":
+        return cls(
+            weak_etag((row_id, updated_at.isoformat() if updated_at else "")),
+            _as_utc(updated_at) if updated_at else None,
+        )
+
+    @classmethod
+    def for_page(cls, request: Request, rows: Sequence[Any]) -> "Validators":
+        """``rows`` are ``(id, updated_at)`` pairs for the page (including the look-ahead row)."""
+        return cls(weak_etag([request.url.query, *(f"{row_id}@{ts}" for row_id, ts in rows)]))
+
+    @property
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def is_fresh(self, request: Request) -> bool:
+        """True when the client's cached copy is still current (RFC 9110 precedence)."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, self.etag)
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified.replace(microsecond=0) <= _as_utc(since)
+        return False
+
+    def apply(self, response: Response) -> None:
+        response.headers.update(self.headers)
+
+    def not_modified(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
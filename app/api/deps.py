@@ -1,37 +1,54 @@
+import uuid
 from typing import Set
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from app.api.v1.routes_auth import get_current_user
-from app.core.acl import has_any_permission
-from app.core.permissions import get_user_permissions
+from app.api.v1.routes_auth import Principal, get_current_principal
+from app.core.acl import mask_has_any, permission_mask, required_mask
+from app.core.permission_cache import get_cached_user_permissions, get_permission_snapshot
+from app.core.permissions import get_group_permissions
 from app.db.session import get_db
-from app.models.user import User
 
 
 def get_current_user_permissions(
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ) -> Set[str]:
-    return get_user_permissions(db, current_user.id)
+    # Stateless tokens carry their permissions; otherwise resolve (cached) from the DB.
+    if principal.permissions is not None:
+        return principal.permissions
+    return get_cached_user_permissions(db, principal.id)
+
+
+def get_current_user_permission_mask(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+) -> int:
+    """The caller's platform permissions as ACL bits (see ``app.core.acl``)."""
+    if principal.permission_mask is not None:
+        return principal.permission_mask
+    return get_permission_snapshot(db, principal.id).mask
+
+
+def enforce_mask(mask: int, required: int) -> int:
+    """Raise 403 unless ``mask`` grants at least one bit of ``required`` (0 = no requirement)."""
+    if required and not mask_has_any(mask, required):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions",
+        )
+    return mask
 
 
 def require_permissions(*required: str):
     """Dependency that requires the current user to have at least one of the given permissions."""
+    required_bits = required_mask(required)
 
     def _require(
-        perms: Set[str] = Depends(get_current_user_permissions),
-    ) -> Set[str]:
-        required_set = set(required)
-        if not required_set:
-            return perms
-        if not has_any_permission(perms, required_set):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions",
-            )
-        return perms
+        mask: int = Depends(get_current_user_permission_mask),
+    ) -> int:
+        return enforce_mask(mask, required_bits)
 
     return _require
 
@@ -39,3 +56,36 @@ def require_permissions(*required: str):
 def require_permission(required: str):
     """Dependency that requires the current user to have the given permission."""
     return require_permissions(required)
+
+
+def group_id_from_path(request: Request, param: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(str(request.path_params[param]))
+    except (KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Group not found",
+        )
+
+
+def require_group_permissions(*required: str, param: str = "group_id"):
+    """
+    Like ``require_permissions``, but also accepts group-scoped roles held on the
+    group named by the ``param`` path parameter or on any of its ancestors.
+    Platform permissions are checked first, so admins cost no extra query.
+    """
+    required_bits = required_mask(required)
+
+    def _require(
+        request: Request,
+        principal: Principal = Depends(get_current_principal),
+        mask: int = Depends(get_current_user_permission_mask),
+        db: Session = Depends(get_db),
+    ) -> int:
+        if not required_bits or mask_has_any(mask, required_bits):
+            return mask
+        group_id = group_id_from_path(request, param)
+        group_perms = get_group_permissions(db, principal.id, group_id, set())
+        return enforce_mask(mask | permission_mask(group_perms), required_bits)
+
+    return _require
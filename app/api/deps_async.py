@@ -0,0 +1,81 @@
+"""AsyncSession counterparts of ``app.api.deps`` (used when ``DB_ASYNC`` is enabled)."""
+
+from typing import Set
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import enforce_mask, group_id_from_path
+from app.api.v1.routes_auth_async import Principal, get_current_principal
+from app.core.acl import mask_has_any, permission_mask, required_mask
+from app.core.permission_cache import (
+    get_cached_user_permissions,
+    get_permission_snapshot,
+    permission_cache,
+)
+from app.core.permissions import get_group_permissions
+from app.db.session import get_async_db
+
+
+async def get_current_user_permissions(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+) -> Set[str]:
+    if principal.permissions is not None:
+        return principal.permissions
+    cached = permission_cache.get(principal.id)
+    if cached is not None:
+        return cached.permissions
+    # Reuse the sync resolver on the AsyncSession's connection.
+    return await db.run_sync(get_cached_user_permissions, principal.id)
+
+
+async def get_current_user_permission_mask(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+) -> int:
+    if principal.permission_mask is not None:
+        return principal.permission_mask
+    cached = permission_cache.get(principal.id)
+    if cached is not None:
+        return cached.mask
+    return (await db.run_sync(get_permission_snapshot, principal.id)).mask
+
+
+def require_permissions(*required: str):
+    """Dependency that requires the current user to have at least one of the given permissions."""
+    required_bits = required_mask(required)
+
+    async def _require(
+        mask: int = Depends(get_current_user_permission_mask),
+    ) -> int:
+        return enforce_mask(mask, required_bits)
+
+    return _require
+
+
+def require_permission(required: str):
+    """Dependency that requires the current user to have the given permission."""
+    return require_permissions(required)
+
+
+def require_group_permissions(*required: str, param: str = "group_id"):
+    """
+    Like ``require_permissions``, but also accepts group-scoped roles held on the
+    group named by the ``param`` path parameter or on any of its ancestors.
+    """
+    required_bits = required_mask(required)
+
+    async def _require(
+        request: Request,
+        principal: Principal = Depends(get_current_principal),
+        mask: int = Depends(get_current_user_permission_mask),
+        db: AsyncSession = Depends(get_async_db),
+    ) -> int:
+        if not required_bits or mask_has_any(mask, required_bits):
+            return mask
+        group_id = group_id_from_path(request, param)
+        group_perms = await db.run_sync(get_group_permissions, principal.id, group_id, set())
+        return enforce_mask(mask | permission_mask(group_perms), required_bits)
+
+    return _require
@@ -0,0 +1,119 @@
+"""
+Request metrics middleware and the Prometheus scrape endpoint.
+
+The middleware is plain ASGI (no per-request task like ``BaseHTTPMiddleware``)
+and records, per route template:
+- latency histogram and request counter by method and status code;
+- in-flight requests;
+- SQL statements and DB time spent by the request (see ``app.db.query_stats``).
+
+With ``SERVER_TIMING_ENABLED`` each response also carries
+``Server-Timing: app;dur=..., db;dur=...;desc="queries=N"`` (milliseconds,
+measured when the response starts).
+
+Unless ``QUERY_BUDGET_MODE`` is ``off`` the middleware also enforces the
+route's query budget (``app.db.query_budget``) before the response starts.
+"""
+
+import time
+
+from fastapi import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.db.query_budget import budget_for, tracking_enabled
+from app.db.query_stats import QueryStats, begin_query_stats, end_query_stats
+
+HTTP_REQUESTS = metrics.counter(
+    "savemo_http_requests_total",
+    "HTTP requests handled.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = metrics.histogram(
+    "savemo_http_request_duration_seconds",
+    "HTTP request latency, until the response body has been sent.",
+    ["method", "route", "status"],
+)
+HTTP_IN_FLIGHT = metrics.gauge(
+    "savemo_http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    ["method"],
+)
+HTTP_REQUEST_DB_QUERIES = metrics.histogram(
+    "savemo_http_request_db_queries",
+    "SQL statements executed per HTTP request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+HTTP_REQUEST_DB_DURATION = metrics.histogram(
+    "savemo_http_request_db_seconds",
+    "Time spent in SQL statements per HTTP request.",
+    ["route"],
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_label(scope: Scope) -> str:
+    """Route template (e.g. ``/api/v1/groups/{group_id}``) to keep label cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def server_timing(app_seconds: float, stats: QueryStats) -> str:
+    return (
+        f"app;dur={app_seconds * 1000:.1f}, "
+        f'db;dur={stats.seconds * 1000:.1f};desc="queries={stats.count}"'
+    )
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp, server_timing: bool = False) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+        check_budget = tracking_enabled()
+        stats, token = begin_query_stats(track_statements=check_budget)
+
+        async def _send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                if check_budget:
+                    route = scope.get("route")
+                    budget_for(getattr(route, "endpoint", None)).enforce(
+                        stats, f"{method} {route_label(scope)}"
+                    )
+                status_code = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", server_timing(time.perf_counter() - started, stats)
+                    )
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method=method)
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = route_label(scope)
+            status_label = str(status_code)
+            HTTP_IN_FLIGHT.dec(method=method)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status_label)
+            HTTP_REQUEST_DURATION.observe(elapsed, method=method, route=route, status=status_label)
+            HTTP_REQUEST_DB_QUERIES.observe(stats.count, route=route)
+            HTTP_REQUEST_DB_DURATION.observe(stats.seconds, route=route)
+            end_query_stats(token)
+
+
+def metrics_endpoint() -> Response:
+    """Prometheus text exposition of this worker's metrics."""
+    return Response(metrics.render_text(), media_type=metrics.CONTENT_TYPE_TEXT)
@@ -0,0 +1,66 @@
+"""
+Prebuilt OpenAPI schema.
+
+FastAPI builds the schema on the first ``/openapi.json`` (or ``/docs``) hit,
+walking every route and response model in the worker that happens to get the
+request. The schema only changes with the code, so it can be generated once
+at build time::
+
+    python -m app.api.openapi --output app/openapi.json
+
+and served from the file with ``OPENAPI_PREBUILT_PATH=app/openapi.json``. A
+file that is missing, unreadable or made for another API version is ignored
+(with a warning) and the schema is built as usual.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+
+def load_prebuilt_schema(path: str, version: str) -> Optional[Dict[str, Any]]:
+    try:
+        schema = json.loads(Path(path).read_bytes())
+    except (OSError, ValueError) as exc:
+        logger.warning("Prebuilt OpenAPI schema %s not usable (%s); building it instead", path, exc)
+        return None
+    if schema.get("info", {}).get("version") != version:
+        logger.warning("Prebuilt OpenAPI schema %s is for another API version; ignoring it", path)
+        return None
+    return schema
+
+
+def use_prebuilt_schema(app: FastAPI, path: str) -> None:
+    """Serve the schema from ``path`` (read on first use) instead of building it."""
+    build = app.openapi
+
+    def openapi() -> Dict[str, Any]:
+        if app.openapi_schema is None:
+            app.openapi_schema = load_prebuilt_schema(path, app.version) or build()
+        return app.openapi_schema
+
+    app.openapi = openapi  # type: ignore[method-assign]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Write the API's OpenAPI schema to a file.")
+    parser.add_argument("--output", type=Path, default=Path("app/openapi.json"))
+    args = parser.parse_args(argv)
+
+    from app.main import create_application
+
+    schema = create_application().openapi()
+    args.output.write_text(json.dumps(schema, separators=(",", ":")))
+    print(f"wrote {args.output} ({len(schema.get('paths', {}))} paths)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
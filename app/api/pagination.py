@@ -0,0 +1,112 @@
+"""
+Keyset (cursor) pagination over ``(created_at, id)``, or newest first over a
+per-parent integer sequence (``sequence_page``, e.g. a wallet's entries).
+
+Cursors are opaque url-safe tokens encoding the last row's sort key; the next
+page is ``WHERE (created_at, id) > (:created_at, :id) ORDER BY created_at, id``,
+which an index on ``(created_at, id)`` serves at the same cost for any page.
+List responses stay plain JSON arrays; the cursor for the next page is
+returned in the ``X-Next-Cursor`` header and as a ``Link: rel="next"``.
+"""
+
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import HTTPException, Query, Request, Response, status
+from sqlalchemy import Select, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def encode_sequence_cursor(sequence: int) -> str:
+    raw = json.dumps([sequence])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_sequence_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (sequence,) = json.loads(base64.urlsafe_b64decode(padded))
+        return int(sequence)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def keyset_page(stmt: Select, model: Any, params: PageParams) -> Select:
+    """Apply cursor, stable ordering and ``limit + 1`` (to detect a next page) to ``stmt``."""
+    if params.cursor:
+        created_at, row_id = decode_cursor(params.cursor)
+        stmt = stmt.where(tuple_(model.created_at, model.id) > tuple_(created_at, row_id))
+    return stmt.order_by(model.created_at, model.id).limit(params.limit + 1)
+
+
+def sequence_page(stmt: Select, column: Any, params: PageParams) -> Select:
+    """Like ``keyset_page``, newest first over an integer ``column``."""
+    if params.cursor:
+        stmt = stmt.where(column < decode_sequence_cursor(params.cursor))
+    return stmt.order_by(column.desc()).limit(params.limit + 1)
+
+
+def finish_page(
+    rows: Sequence[Any],
+    params: PageParams,
+    request: Request,
+    response: Response,
+    cursor_for: Optional[Callable[[Any], str]] = None,
+) -> Sequence[Any]:
+    """
+    Trim the look-ahead row and advertise the next cursor, if any. Pass
+    ``cursor_for`` (e.g. ``lambda row: encode_sequence_cursor(row.sequence)``)
+    for pages that are not ordered by ``(created_at, id)``.
+    """
+    if len(rows) <= params.limit:
+        return rows
+    rows = rows[: params.limit]
+    last = rows[-1]
+    next_cursor = (
+        cursor_for(last) if cursor_for is not None else encode_cursor(last.created_at, last.id)
+    )
+    response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    next_url = request.url.include_query_params(cursor=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return rows
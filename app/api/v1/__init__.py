@@ -1,6 +1,27 @@
 from fastapi import APIRouter
 
-from . import routes_health, routes_auth, routes_groups, routes_clients, routes_roles
+from app.core.config import settings
+
+from . import routes_health
+
+if settings.DB_ASYNC:
+    from . import routes_auth_async as routes_auth
+    from . import routes_clients_async as routes_clients
+    from . import routes_goals_async as routes_goals
+    from . import routes_groups_async as routes_groups
+    from . import routes_roles_async as routes_roles
+    from . import routes_users_async as routes_users
+    from . import routes_wallets_async as routes_wallets
+else:
+    from . import (
+        routes_auth,
+        routes_clients,
+        routes_goals,
+        routes_groups,
+        routes_roles,
+        routes_users,
+        routes_wallets,
+    )
 
 
 api_router = APIRouter()
@@ -10,4 +31,6 @@ api_router.include_router(routes_auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(routes_groups.router, prefix="/groups", tags=["groups"])
 api_router.include_router(routes_clients.router, prefix="/clients", tags=["clients"])
 api_router.include_router(routes_roles.router, prefix="/roles", tags=["roles"])
-
+api_router.include_router(routes_users.router, prefix="/users", tags=["users"])
+api_router.include_router(routes_wallets.router, prefix="/wallets", tags=["wallets"])
+api_router.include_router(routes_goals.router, prefix="/goals", tags=["goals"])
@@ -1,21 +1,33 @@
 import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Set
 
 import jwt
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
+from app.core.acl import mask_permissions, permission_mask
+from app.core.hashing import HashPoolSaturated
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
     decode_access_token,
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
 )
+from app.core.config import settings
+from app.core.refresh_tokens import RefreshClaims, refresh_token_store
 from app.db.session import get_db
 from app.models.user import User
-from app.core.permissions import get_user_permissions
+from app.core.permission_cache import (
+    get_cached_user_permissions,
+    get_permission_snapshot,
+    permission_cache,
+)
 from app.schemas import Token, UserCreate, UserRead
 from app.schemas.auth import LoginRequest, RefreshRequest
 from app.schemas.user import UserMeRead
@@ -31,21 +43,55 @@ def get_user_by_email(db: Session, email: str) -> User | None:
     return db.query(User).filter(User.email == email).first()
 
 
-def get_current_user(
-    credentials=Depends(http_bearer),
-    db: Session = Depends(get_db),
-) -> User:
-    token = credentials.credentials
+@dataclass
+class Principal:
+    """
+    Authenticated caller. ``permissions`` and ``permission_mask`` are set when
+    they came from a stateless token.
+    """
+
+    id: uuid.UUID
+    permissions: Optional[Set[str]] = None
+    user: Optional[User] = None
+    permission_mask: Optional[int] = None
+
+
+def principal_from_claims(payload: dict, user_id: uuid.UUID) -> Optional[Principal]:
+    """Authorize from an embedded claim when it is still at the current permissions version."""
+    if ("pm" not in payload and "perms" not in payload) or "pv" not in payload:
+        return None
+    if not payload.get("act"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Inactive or missing user",
+        )
+    if int(payload["pv"]) < permission_cache.version_for(user_id):
+        # Roles, assignments or the user changed since issue: fall back to the DB.
+        return None
+    if "pm" in payload:
+        mask = int(payload["pm"])
+        permissions = mask_permissions(mask)
+    else:
+        # Tokens issued before the mask claim existed.
+        permissions = set(payload["perms"])
+        mask = permission_mask(permissions)
+    return Principal(id=user_id, permissions=permissions, permission_mask=mask)
+
+
+def decode_bearer(credentials) -> tuple[dict, uuid.UUID]:
+    """Verify the bearer access token; return its payload and subject user id."""
     try:
-        payload = decode_access_token(token)
+        payload = decode_access_token(credentials.credentials)
         user_id = uuid.UUID(payload.get("sub"))
     except (ValueError, TypeError, KeyError, jwt.PyJWTError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+    return payload, user_id
 
-    user = db.get(User, user_id)
+
+def ensure_active_user(user: User | None) -> User:
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,20 +100,67 @@ def get_current_user(
     return user
 
 
-@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register_user(payload: UserCreate, db: Session = Depends(get_db)):
-    existing = get_user_by_email(db, payload.email)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
+def get_current_principal(
+    credentials=Depends(http_bearer),
+    db: Session = Depends(get_db),
+) -> Principal:
+    payload, user_id = decode_bearer(credentials)
+
+    if settings.ACCESS_TOKEN_STATELESS:
+        principal = principal_from_claims(payload, user_id)
+        if principal is not None:
+            return principal
+
+    user = ensure_active_user(db.get(User, user_id))
+    return Principal(id=user.id, user=user)
+
+
+def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+) -> User:
+    if principal.user is not None:
+        return principal.user
+    return ensure_active_user(db.get(User, principal.id))
+
 
+def issue_tokens(db: Session, user: User, family_id: Optional[uuid.UUID] = None) -> Token:
+    """Access and refresh token pair; the refresh token continues ``family_id`` if given."""
+    expires_delta = None
+    extra_claims = None
+    if settings.ACCESS_TOKEN_STATELESS:
+        snapshot = get_permission_snapshot(db, user.id)
+        extra_claims = {
+            "act": user.is_active,
+            "pm": snapshot.mask,
+            "pv": snapshot.version,
+        }
+        # Never let embedded permissions outlive the next assignment window boundary.
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        if snapshot.next_change is not None:
+            until_change = snapshot.next_change - datetime.now(timezone.utc)
+            expires_delta = max(min(expires_delta, until_change), timedelta(seconds=1))
+    access_token = create_access_token(
+        subject=str(user.id), expires_delta=expires_delta, extra_claims=extra_claims
+    )
+    refresh_token = create_refresh_token(subject=str(user.id), family_id=family_id)
+    return Token(access_token=access_token, refresh_token=refresh_token)
+
+
+def hash_pool_unavailable(exc: HashPoolSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def _create_user(db: Session, payload: UserCreate, hashed_password: str) -> User:
     user = User(
         email=payload.email,
         full_name=payload.full_name,
         phone=payload.phone,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=hashed_password,
         is_active=True,
         is_superuser=False,
     )
@@ -77,67 +170,133 @@ def register_user(payload: UserCreate, db: Session = Depends(get_db)):
     return user
 
 
-def _login_with_credentials(email: str, password: str, db: Session) -> Token:
-    user = get_user_by_email(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+async def register_user(payload: UserCreate, db: Session = Depends(get_db)):
+    # DB work stays on the threadpool; bcrypt runs on the dedicated hashing pool.
+    existing = await run_in_threadpool(get_user_by_email, db, payload.email)
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+
+    try:
+        hashed_password = await get_password_hash_async(payload.password)
+    except HashPoolSaturated as exc:
+        raise hash_pool_unavailable(exc)
+    return await run_in_threadpool(_create_user, db, payload, hashed_password)
+
+
+async def _login_with_credentials(email: str, password: str, db: Session) -> Token:
+    user = await run_in_threadpool(get_user_by_email, db, email)
+    try:
+        valid = user is not None and await verify_password_async(
+            password, user.hashed_password
+        )
+    except HashPoolSaturated as exc:
+        raise hash_pool_unavailable(exc)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
-    access_token = create_access_token(subject=str(user.id))
-    refresh_token = create_refresh_token(subject=str(user.id))
-    return Token(access_token=access_token, refresh_token=refresh_token)
+    return await run_in_threadpool(issue_tokens, db, user)
 
 
 @router.post("/login", response_model=Token)
-def login_form(
+async def login_form(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
     """Login with form data (application/x-www-form-urlencoded). Use username=email."""
-    return _login_with_credentials(form_data.username, form_data.password, db)
+    return await _login_with_credentials(form_data.username, form_data.password, db)
 
 
 @router.post("/login/json", response_model=Token)
-def login_json(payload: LoginRequest, db: Session = Depends(get_db)):
+async def login_json(payload: LoginRequest, db: Session = Depends(get_db)):
     """Login with JSON body: { \"email\": \"...\", \"password\": \"...\" }."""
-    return _login_with_credentials(payload.email, payload.password, db)
+    return await _login_with_credentials(payload.email, payload.password, db)
 
 
-@router.post("/refresh", response_model=Token)
-def refresh_tokens(
-    payload: RefreshRequest,
-    db: Session = Depends(get_db),
-):
+def decode_refresh_token(refresh_token: str) -> RefreshClaims:
     try:
-        decoded = decode_token(payload.refresh_token)
+        decoded = decode_token(refresh_token)
         if decoded.get("type") != "refresh":
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token type",
             )
-        user_id = uuid.UUID(decoded["sub"])
-    except (ValueError, TypeError, KeyError):
+        return RefreshClaims.from_payload(decoded, refresh_token)
+    except (ValueError, TypeError, KeyError, jwt.PyJWTError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
         )
-    user = db.get(User, user_id)
+
+
+def rotate_refresh_token(db: Session, refresh_token: str) -> Token:
+    """
+    Exchange a refresh token for a new pair in the same family. The presented
+    token is used up; presenting it again revokes the whole family.
+    """
+    claims = decode_refresh_token(refresh_token)
+    if refresh_token_store.is_revoked(db, claims):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token revoked",
+        )
+    user = db.get(User, claims.user_id)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
-    access_token = create_access_token(subject=str(user.id))
-    new_refresh_token = create_refresh_token(subject=str(user.id))
-    return Token(access_token=access_token, refresh_token=new_refresh_token)
+    if not refresh_token_store.consume(db, claims):
+        refresh_token_store.revoke_family(db, claims.family_id, claims.user_id)
+        db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token reuse detected; please log in again",
+        )
+    tokens = issue_tokens(db, user, family_id=claims.family_id)
+    db.commit()
+    return tokens
+
+
+def revoke_refresh_family(db: Session, refresh_token: str) -> None:
+    claims = decode_refresh_token(refresh_token)
+    refresh_token_store.revoke_family(db, claims.family_id, claims.user_id)
+    db.commit()
+
+
+@router.post("/refresh", response_model=Token)
+def refresh_tokens(
+    payload: RefreshRequest,
+    db: Session = Depends(get_db),
+):
+    return rotate_refresh_token(db, payload.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    payload: RefreshRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Revoke the refresh token and every token rotated from or to it. Access
+    tokens already issued stay valid until they expire.
+    """
+    revoke_refresh_family(db, payload.refresh_token)
 
 
 @router.get("/me", response_model=UserMeRead)
 def read_me(
+    principal: Principal = Depends(get_current_principal),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    perms = get_user_permissions(db, current_user.id)
+    perms = principal.permissions
+    if perms is None:
+        perms = get_cached_user_permissions(db, current_user.id)
     return UserMeRead(
         id=current_user.id,
         email=current_user.email,
@@ -0,0 +1,157 @@
+"""AsyncSession version of ``routes_auth`` (mounted when ``DB_ASYNC`` is enabled)."""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.routes_auth import (
+    Principal,
+    decode_bearer,
+    ensure_active_user,
+    hash_pool_unavailable,
+    http_bearer,
+    issue_tokens,
+    principal_from_claims,
+    revoke_refresh_family,
+    rotate_refresh_token,
+)
+from app.core.config import settings
+from app.core.hashing import HashPoolSaturated
+from app.core.permission_cache import get_cached_user_permissions
+from app.core.security import get_password_hash_async, verify_password_async
+from app.db.session import get_async_db
+from app.models.user import User
+from app.schemas import Token, UserCreate, UserRead
+from app.schemas.auth import LoginRequest, RefreshRequest
+from app.schemas.user import UserMeRead
+
+
+router = APIRouter()
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    result = await db.execute(select(User).where(User.email == email).limit(1))
+    return result.scalars().first()
+
+
+async def get_current_principal(
+    credentials=Depends(http_bearer),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    payload, user_id = decode_bearer(credentials)
+
+    if settings.ACCESS_TOKEN_STATELESS:
+        principal = principal_from_claims(payload, user_id)
+        if principal is not None:
+            return principal
+
+    user = ensure_active_user(await db.get(User, user_id))
+    return Principal(id=user.id, user=user)
+
+
+async def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    if principal.user is not None:
+        return principal.user
+    return ensure_active_user(await db.get(User, principal.id))
+
+
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+async def register_user(payload: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = await get_user_by_email(db, payload.email)
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+
+    try:
+        hashed_password = await get_password_hash_async(payload.password)
+    except HashPoolSaturated as exc:
+        raise hash_pool_unavailable(exc)
+
+    user = User(
+        email=payload.email,
+        full_name=payload.full_name,
+        phone=payload.phone,
+        hashed_password=hashed_password,
+        is_active=True,
+        is_superuser=False,
+    )
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+async def _login_with_credentials(email: str, password: str, db: AsyncSession) -> Token:
+    user = await get_user_by_email(db, email)
+    try:
+        valid = user is not None and await verify_password_async(
+            password, user.hashed_password
+        )
+    except HashPoolSaturated as exc:
+        raise hash_pool_unavailable(exc)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
+    return await db.run_sync(issue_tokens, user)
+
+
+@router.post("/login", response_model=Token)
+async def login_form(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Login with form data (application/x-www-form-urlencoded). Use username=email."""
+    return await _login_with_credentials(form_data.username, form_data.password, db)
+
+
+@router.post("/login/json", response_model=Token)
+async def login_json(payload: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    """Login with JSON body: { \"email\": \"...\", \"password\": \"...\" }."""
+    return await _login_with_credentials(payload.email, payload.password, db)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_tokens(
+    payload: RefreshRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(rotate_refresh_token, payload.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    payload: RefreshRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Revoke the refresh token and every token rotated from or to it. Access
+    tokens already issued stay valid until they expire.
+    """
+    await db.run_sync(revoke_refresh_family, payload.refresh_token)
+
+
+@router.get("/me", response_model=UserMeRead)
+async def read_me(
+    principal: Principal = Depends(get_current_principal),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    perms = principal.permissions
+    if perms is None:
+        perms = await db.run_sync(get_cached_user_permissions, current_user.id)
+    return UserMeRead(
+        id=current_user.id,
+        email=current_user.email,
+        full_name=current_user.full_name,
+        phone=current_user.phone,
+        is_active=current_user.is_active,
+        permissions=sorted(perms),
+    )
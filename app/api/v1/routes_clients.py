@@ -1,15 +1,41 @@
-from typing import List
+from typing import Iterator, List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
+from app.api.binary import (
+    SNAPSHOT_READ,
+    BlobChanged,
+    BlobMeta,
+    blob_response,
+    chunk_bounds,
+    read_image_upload,
+)
+from app.api.conditional import Validators
 from app.api.deps import require_permissions
-from app.api.v1.routes_auth import get_current_user
-from app.db.session import get_db
+from app.api.pagination import PageParams, finish_page, keyset_page, page_params
+from app.api.serialization import rows_response, schema_columns
+from app.api.v1.routes_auth import Principal, get_current_principal
+from app.core.config import settings
+from app.db.query_budget import query_budget
+from app.db.session import get_db, get_read_db
 from app.models.client import Client
 from app.models.group import Group, GroupMembership
-from app.models.user import User
 from app.schemas import ClientCreate, ClientRead
+from app.services import group_hierarchy  # noqa: F401  # keeps group_closure in sync
 
 
 router = APIRouter()
@@ -19,7 +45,7 @@ router = APIRouter()
 def create_client(
     payload: ClientCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     _perms=Depends(require_permissions("all", "system.admin")),
 ):
     """
@@ -57,11 +83,109 @@ def create_client(
 
 
 @router.get("/", response_model=List[ClientRead])
+@query_budget(5)
 def list_clients(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    q: Optional[str] = Query(None, description="Case-insensitive name prefix."),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    stmt = select(*schema_columns(Client, ClientRead))
+    if q:
+        stmt = stmt.where(Client.name.istartswith(q, autoescape=True))
+    stamps = keyset_page(stmt.with_only_columns(Client.id, Client.updated_at), Client, page)
+    validators = Validators.for_page(request, db.execute(stamps).all())
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+    rows = db.execute(keyset_page(stmt, Client, page)).all()
+    return rows_response(finish_page(rows, page, request, response), Client, ClientRead, response)
+
+
+def _get_logo_meta(db: Session, client_id: UUID) -> BlobMeta:
+    row = db.execute(
+        select(Client.logo_content_type, Client.logo_size, Client.logo_sha256).where(
+            Client.id == client_id
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
+    content_type, size, sha256 = row
+    if not sha256:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client has no logo")
+    return BlobMeta(content_type or "application/octet-stream", size or 0, sha256)
+
+
+def _store_logo(db: Session, client_id: UUID, data: bytes, meta: BlobMeta) -> Client:
+    result = db.execute(
+        update(Client)
+        .where(Client.id == client_id)
+        .values(
+            logo=data,
+            logo_content_type=meta.content_type,
+            logo_size=meta.size,
+            logo_sha256=meta.sha256,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
+    db.commit()
+    return db.get(Client, client_id)
+
+
+def _iter_logo_chunks(
+    stream_db: Session, client_id: UUID, sha256: str, offset: int, length: int
+) -> Iterator[bytes]:
+    with stream_db:
+        if stream_db.get_bind().dialect.name == "postgresql":
+            stream_db.connection(execution_options=SNAPSHOT_READ)
+        for start, count in chunk_bounds(offset, length):
+            chunk = stream_db.execute(
+                select(func.substr(Client.logo, start, count)).where(
+                    Client.id == client_id, Client.logo_sha256 == sha256
+                )
+            ).scalar()
+            if not chunk:
+                # Replaced or removed since the headers were sent: never mix versions.
+                raise BlobChanged(f"Logo of client {client_id} changed while streaming")
+            yield chunk
+
+
+@router.put("/{client_id}/logo", response_model=ClientRead)
+async def upload_client_logo(
+    client_id: UUID,
+    file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     _perms=Depends(require_permissions("all", "system.admin")),
 ):
-    clients = db.query(Client).all()
-    return clients
+    """Upload or replace the client's logo (PNG, JPEG, WebP or GIF)."""
+    data, meta = await read_image_upload(file, settings.CLIENT_LOGO_MAX_BYTES)
+    return await run_in_threadpool(_store_logo, db, client_id, data, meta)
+
 
+@router.get("/{client_id}/logo", response_class=Response)
+def get_client_logo(
+    client_id: UUID,
+    request: Request,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Stream the client's logo. Unauthenticated: logos are public branding shown
+    before sign-in. Request it as ``?v=<logo_sha256>`` to get immutable caching.
+    """
+    meta = _get_logo_meta(db, client_id)
+    # The request session closes before the body is streamed; use a dedicated one.
+    bind = db.get_bind()
+    return blob_response(
+        request,
+        meta,
+        lambda offset, length: _iter_logo_chunks(
+            Session(bind), client_id, meta.sha256, offset, length
+        ),
+    )
@@ -0,0 +1,188 @@
+"""AsyncSession version of ``routes_clients`` (mounted when ``DB_ASYNC`` is enabled)."""
+
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.binary import (
+    SNAPSHOT_READ,
+    BlobChanged,
+    BlobMeta,
+    blob_response,
+    chunk_bounds,
+    read_image_upload,
+)
+from app.api.conditional import Validators
+from app.api.deps_async import require_permissions
+from app.api.pagination import PageParams, finish_page, keyset_page, page_params
+from app.api.serialization import rows_response, schema_columns
+from app.api.v1.routes_auth_async import Principal, get_current_principal
+from app.core.config import settings
+from app.db.query_budget import query_budget
+from app.db.session import get_async_db, get_async_read_db
+from app.models.client import Client
+from app.models.group import Group, GroupMembership
+from app.schemas import ClientCreate, ClientRead
+from app.services import group_hierarchy  # noqa: F401  # keeps group_closure in sync
+
+
+router = APIRouter()
+
+
+@router.post("/", response_model=ClientRead, status_code=status.HTTP_201_CREATED)
+async def create_client(
+    payload: ClientCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    """
+    Create a new client (tenant/organization).
+
+    Side effects:
+    - Create a default savings group for the client.
+    - Add the onboarding user as the first member of that group.
+    """
+    group = Group(
+        name=f"{payload.name} Main Group",
+        description=payload.tagline,
+    )
+    db.add(group)
+    await db.flush()  # get group.id
+
+    db.add(GroupMembership(user_id=current_user.id, group_id=group.id))
+
+    client = Client(
+        name=payload.name,
+        tagline=payload.tagline,
+        primary_color=payload.primary_color,
+        secondary_color=payload.secondary_color,
+        default_group_id=group.id,
+    )
+    db.add(client)
+
+    await db.commit()
+    await db.refresh(client)
+    return client
+
+
+@router.get("/", response_model=List[ClientRead])
+@query_budget(5)
+async def list_clients(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    q: Optional[str] = Query(None, description="Case-insensitive name prefix."),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    stmt = select(*schema_columns(Client, ClientRead))
+    if q:
+        stmt = stmt.where(Client.name.istartswith(q, autoescape=True))
+    stamps = keyset_page(stmt.with_only_columns(Client.id, Client.updated_at), Client, page)
+    validators = Validators.for_page(request, (await db.execute(stamps)).all())
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+    rows = (await db.execute(keyset_page(stmt, Client, page))).all()
+    return rows_response(finish_page(rows, page, request, response), Client, ClientRead, response)
+
+
+async def _get_logo_meta(db: AsyncSession, client_id: UUID) -> BlobMeta:
+    row = (
+        await db.execute(
+            select(Client.logo_content_type, Client.logo_size, Client.logo_sha256).where(
+                Client.id == client_id
+            )
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
+    content_type, size, sha256 = row
+    if not sha256:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client has no logo")
+    return BlobMeta(content_type or "application/octet-stream", size or 0, sha256)
+
+
+async def _iter_logo_chunks(
+    stream_db: AsyncSession, client_id: UUID, sha256: str, offset: int, length: int
+) -> AsyncIterator[bytes]:
+    async with stream_db:
+        if stream_db.bind.dialect.name == "postgresql":
+            await stream_db.connection(execution_options=SNAPSHOT_READ)
+        for start, count in chunk_bounds(offset, length):
+            chunk = (
+                await stream_db.execute(
+                    select(func.substr(Client.logo, start, count)).where(
+                        Client.id == client_id, Client.logo_sha256 == sha256
+                    )
+                )
+            ).scalar()
+            if not chunk:
+                # Replaced or removed since the headers were sent: never mix versions.
+                raise BlobChanged(f"Logo of client {client_id} changed while streaming")
+            yield chunk
+
+
+@router.put("/{client_id}/logo", response_model=ClientRead)
+async def upload_client_logo(
+    client_id: UUID,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    """Upload or replace the client's logo (PNG, JPEG, WebP or GIF)."""
+    data, meta = await read_image_upload(file, settings.CLIENT_LOGO_MAX_BYTES)
+    result = await db.execute(
+        update(Client)
+        .where(Client.id == client_id)
+        .values(
+            logo=data,
+            logo_content_type=meta.content_type,
+            logo_size=meta.size,
+            logo_sha256=meta.sha256,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
+    await db.commit()
+    return await db.get(Client, client_id)
+
+
+@router.get("/{client_id}/logo", response_class=Response)
+async def get_client_logo(
+    client_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Stream the client's logo. Unauthenticated: logos are public branding shown
+    before sign-in. Request it as ``?v=<logo_sha256>`` to get immutable caching.
+    """
+    meta = await _get_logo_meta(db, client_id)
+    # The request session closes before the body is streamed; use a dedicated one.
+    bind = db.bind
+    return blob_response(
+        request,
+        meta,
+        lambda offset, length: _iter_logo_chunks(
+            AsyncSession(bind), client_id, meta.sha256, offset, length
+        ),
+    )
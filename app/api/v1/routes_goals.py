@@ -0,0 +1,203 @@
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import enforce_mask, get_current_user_permission_mask
+from app.api.v1.routes_auth import Principal, get_current_principal
+from app.core.acl import mask_has_any, permission_mask, required_mask
+from app.core.permissions import load_group_permissions
+from app.db.query_budget import query_budget
+from app.db.session import get_db, get_read_db
+from app.models.goal import SavingsGoal
+from app.models.group import Group
+from app.schemas import GoalCreate, GoalRead, GoalUpdate, ObligationRead, ScheduleRead
+from app.services import contribution_schedules
+from app.services.contribution_schedules import GoalError
+
+
+router = APIRouter()
+
+VIEW_MASK = required_mask(["group.view", "group.manage_goals"])
+MANAGE_MASK = required_mask(["group.manage_goals"])
+# Longest window GET /goals/obligations returns at once.
+MAX_OBLIGATION_DAYS = 366
+
+
+def goal_http_error(exc: GoalError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+
+
+def authorize_goal(
+    db: Session,
+    principal_id: UUID,
+    mask: int,
+    group_id: Optional[UUID],
+    user_id: Optional[UUID],
+    required: int,
+) -> int:
+    """
+    Raise 403 unless the caller may act on goals of this owner: through
+    platform roles, group-scoped roles on the group or its ancestors, or as
+    the owner of a personal goal.
+    """
+    if mask_has_any(mask, required):
+        return mask
+    if user_id is not None and user_id == principal_id:
+        mask |= VIEW_MASK | MANAGE_MASK
+    elif group_id is not None:
+        granted = load_group_permissions(db, principal_id, [group_id]).get(group_id, ())
+        mask |= permission_mask(granted)
+    return enforce_mask(mask, required)
+
+
+def get_goal_for(
+    db: Session, principal_id: UUID, mask: int, goal_id: UUID, required: int
+) -> SavingsGoal:
+    goal = db.get(SavingsGoal, goal_id)
+    if goal is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
+    authorize_goal(db, principal_id, mask, goal.group_id, goal.user_id, required)
+    return goal
+
+
+def create_goal_for(db: Session, principal_id: UUID, mask: int, payload: GoalCreate) -> SavingsGoal:
+    """A group goal (needs goal management on the group) or the caller's personal goal."""
+    fields = payload.model_dump()
+    if payload.group_id is None:
+        fields["user_id"] = principal_id
+    else:
+        if db.get(Group, payload.group_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+        authorize_goal(db, principal_id, mask, payload.group_id, None, MANAGE_MASK)
+    return contribution_schedules.create_goal(db, **fields)
+
+
+def adjust_goal_for(
+    db: Session, principal_id: UUID, mask: int, goal_id: UUID, payload: GoalUpdate
+) -> SavingsGoal:
+    goal = get_goal_for(db, principal_id, mask, goal_id, MANAGE_MASK)
+    return contribution_schedules.adjust_goal(db, goal, payload.model_dump(exclude_unset=True))
+
+
+def schedule_owner_check(
+    db: Session, principal_id: UUID, mask: int, goal_id: UUID, user_id: UUID
+) -> None:
+    """Members see their own schedule; anyone else's needs view rights on the goal."""
+    if user_id == principal_id:
+        return
+    get_goal_for(db, principal_id, mask, goal_id, VIEW_MASK)
+
+
+def list_goals_query(
+    db: Session, principal_id: UUID, mask: int, group_id: Optional[UUID]
+):
+    """Goals of a group (with view rights), or the caller's personal goals."""
+    if group_id is None:
+        condition = SavingsGoal.user_id == principal_id
+    else:
+        authorize_goal(db, principal_id, mask, group_id, None, VIEW_MASK)
+        condition = SavingsGoal.group_id == group_id
+    return select(SavingsGoal).where(condition).order_by(SavingsGoal.start_date, SavingsGoal.id)
+
+
+def obligation_window(from_date: Optional[date], to_date: Optional[date]) -> tuple:
+    start = from_date or date.today()
+    end = to_date or start + timedelta(days=30)
+    if end < start or (end - start).days > MAX_OBLIGATION_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"to_date must be on or after from_date, at most {MAX_OBLIGATION_DAYS} days later",
+        )
+    return start, end
+
+
+def commit_goal(db: Session, operation: Callable, *args):
+    """Run a goal operation and commit it (rollback when the goal is rejected)."""
+    try:
+        result = operation(db, *args)
+    except GoalError as exc:
+        db.rollback()
+        raise goal_http_error(exc)
+    db.commit()
+    return result
+
+
+@router.post("/", response_model=GoalRead, status_code=status.HTTP_201_CREATED)
+def create_goal(
+    payload: GoalCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Create a goal; every eligible member's contribution schedule is written with it."""
+    goal = commit_goal(db, create_goal_for, current_user.id, mask, payload)
+    db.refresh(goal)
+    return goal
+
+
+@router.get("/", response_model=List[GoalRead])
+@query_budget(4)
+def list_goals(
+    group_id: Optional[UUID] = Query(None),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """A group's goals, or without ``group_id`` the caller's personal goals."""
+    return db.scalars(list_goals_query(db, current_user.id, mask, group_id)).all()
+
+
+@router.get("/obligations", response_model=List[ObligationRead])
+@query_budget(3)
+def list_obligations(
+    from_date: Optional[date] = Query(None, description="Default: today."),
+    to_date: Optional[date] = Query(None, description="Default: 30 days after from_date."),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """What the caller owes across all their goals in a date range, soonest first."""
+    start, end = obligation_window(from_date, to_date)
+    return db.execute(contribution_schedules.obligations_query(current_user.id, start, end)).all()
+
+
+@router.get("/{goal_id}", response_model=GoalRead)
+@query_budget(4)
+def get_goal(
+    goal_id: UUID,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    return get_goal_for(db, current_user.id, mask, goal_id, VIEW_MASK)
+
+
+@router.patch("/{goal_id}", response_model=GoalRead)
+def update_goal(
+    goal_id: UUID,
+    payload: GoalUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Change a goal's terms or status; only schedule periods from today on are recomputed."""
+    goal = commit_goal(db, adjust_goal_for, current_user.id, mask, goal_id, payload)
+    db.refresh(goal)
+    return goal
+
+
+@router.get("/{goal_id}/schedules/{user_id}", response_model=List[ScheduleRead])
+@query_budget(5)
+def get_member_schedule(
+    goal_id: UUID,
+    user_id: UUID,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """A member's contribution schedule for the goal, by period."""
+    schedule_owner_check(db, current_user.id, mask, goal_id, user_id)
+    return db.scalars(contribution_schedules.member_schedule_query(goal_id, user_id)).all()
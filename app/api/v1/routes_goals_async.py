@@ -0,0 +1,120 @@
+"""AsyncSession version of ``routes_goals`` (mounted when ``DB_ASYNC`` is enabled)."""
+
+from datetime import date
+from typing import Callable, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps_async import get_current_user_permission_mask
+from app.api.v1.routes_auth_async import Principal, get_current_principal
+from app.api.v1.routes_goals import (
+    VIEW_MASK,
+    adjust_goal_for,
+    create_goal_for,
+    get_goal_for,
+    goal_http_error,
+    list_goals_query,
+    obligation_window,
+    schedule_owner_check,
+)
+from app.db.query_budget import query_budget
+from app.db.session import get_async_db, get_async_read_db
+from app.schemas import GoalCreate, GoalRead, GoalUpdate, ObligationRead, ScheduleRead
+from app.services import contribution_schedules
+from app.services.contribution_schedules import GoalError
+
+
+router = APIRouter()
+
+
+async def commit_goal(db: AsyncSession, operation: Callable, *args):
+    """Run a goal operation and commit it (rollback when the goal is rejected)."""
+    try:
+        result = await db.run_sync(operation, *args)
+    except GoalError as exc:
+        await db.rollback()
+        raise goal_http_error(exc)
+    await db.commit()
+    return result
+
+
+@router.post("/", response_model=GoalRead, status_code=status.HTTP_201_CREATED)
+async def create_goal(
+    payload: GoalCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Create a goal; every eligible member's contribution schedule is written with it."""
+    goal = await commit_goal(db, create_goal_for, current_user.id, mask, payload)
+    await db.refresh(goal)
+    return goal
+
+
+@router.get("/", response_model=List[GoalRead])
+@query_budget(4)
+async def list_goals(
+    group_id: Optional[UUID] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """A group's goals, or without ``group_id`` the caller's personal goals."""
+    stmt = await db.run_sync(list_goals_query, current_user.id, mask, group_id)
+    return (await db.scalars(stmt)).all()
+
+
+@router.get("/obligations", response_model=List[ObligationRead])
+@query_budget(3)
+async def list_obligations(
+    from_date: Optional[date] = Query(None, description="Default: today."),
+    to_date: Optional[date] = Query(None, description="Default: 30 days after from_date."),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """What the caller owes across all their goals in a date range, soonest first."""
+    start, end = obligation_window(from_date, to_date)
+    return (
+        await db.execute(contribution_schedules.obligations_query(current_user.id, start, end))
+    ).all()
+
+
+@router.get("/{goal_id}", response_model=GoalRead)
+@query_budget(4)
+async def get_goal(
+    goal_id: UUID,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    return await db.run_sync(get_goal_for, current_user.id, mask, goal_id, VIEW_MASK)
+
+
+@router.patch("/{goal_id}", response_model=GoalRead)
+async def update_goal(
+    goal_id: UUID,
+    payload: GoalUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Change a goal's terms or status; only schedule periods from today on are recomputed."""
+    goal = await commit_goal(db, adjust_goal_for, current_user.id, mask, goal_id, payload)
+    await db.refresh(goal)
+    return goal
+
+
+@router.get("/{goal_id}/schedules/{user_id}", response_model=List[ScheduleRead])
+@query_budget(5)
+async def get_member_schedule(
+    goal_id: UUID,
+    user_id: UUID,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """A member's contribution schedule for the goal, by period."""
+    await db.run_sync(schedule_owner_check, current_user.id, mask, goal_id, user_id)
+    return (await db.scalars(contribution_schedules.member_schedule_query(goal_id, user_id))).all()
@@ -1,25 +1,67 @@
-from typing import List
+from typing import List, Optional, Set
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.deps import require_permissions
-from app.api.v1.routes_auth import get_current_user
-from app.db.session import get_db
+from app.api.conditional import Validators
+from app.api.deps import (
+    enforce_mask,
+    get_current_user_permission_mask,
+    require_group_permissions,
+    require_permissions,
+)
+from app.api.pagination import PageParams, finish_page, keyset_page, page_params
+from app.api.serialization import rows_response, schema_columns
+from app.api.v1.routes_auth import Principal, get_current_principal
+from app.core.acl import mask_has_any, permission_mask, required_mask
+from app.core.config import settings
+from app.core.permissions import granting_scope_ids, load_group_permissions
+from app.db.query_budget import query_budget
+from app.db.session import get_db, get_read_db
 from app.models.group import Group
-from app.models.user import User
-from app.schemas import GroupCreate, GroupRead
+from app.schemas import GroupCreate, GroupRead, GroupTreeNode, GroupUpdate, MembershipImportResult
+from app.services.group_hierarchy import (
+    ancestors_query,
+    descendants_query,
+    in_subtree_query,
+    lock_hierarchy,
+    subtrees_ids_query,
+)
+from app.services.membership_import import ImportReport, detect_format, import_batch, iter_rows
 
 
 router = APIRouter()
 
+GROUP_VIEW_MASK = required_mask({"all", "system.admin", "group.view", "group.manage_members"})
+GROUP_MANAGE_MASK = required_mask({"all", "system.admin", "group.manage_members"})
+
+
+def code_conflict(exc: IntegrityError) -> HTTPException:
+    """409 for a duplicate ``code`` (the only unique column a caller sets); re-raise others."""
+    if "code" not in str(exc.orig):
+        raise exc
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Group code already in use")
+
+
+def visible_scope_ids(scope_ids: Set[UUID]):
+    """Subquery of group ids under ``scope_ids``; 403 when the caller has no such scope."""
+    if not scope_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions",
+        )
+    return subtrees_ids_query(scope_ids)
+
 
 @router.post("/", response_model=GroupRead, status_code=status.HTTP_201_CREATED)
 def create_group(
     payload: GroupCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     _perms=Depends(require_permissions("all", "system.admin", "group.manage_members")),
 ):
     group = Group(
@@ -29,30 +71,205 @@ def create_group(
         parent_group_id=payload.parent_group_id,
     )
     db.add(group)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise code_conflict(exc)
     db.refresh(group)
     return group
 
 
 @router.get("/", response_model=List[GroupRead])
+@query_budget(6)
 def list_groups(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    _perms=Depends(require_permissions("all", "system.admin", "group.view", "group.manage_members")),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    parent_group_id: Optional[UUID] = None,
+    q: Optional[str] = Query(None, description="Case-insensitive name prefix."),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
 ):
-    groups = db.query(Group).all()
-    return groups
+    """
+    Groups visible to the caller: all of them with a platform role, otherwise
+    the subtrees of the groups where a group-scoped role grants viewing.
+    """
+    stmt = select(*schema_columns(Group, GroupRead))
+    if not mask_has_any(mask, GROUP_VIEW_MASK):
+        scope_ids = granting_scope_ids(db, current_user.id, GROUP_VIEW_MASK)
+        stmt = stmt.where(Group.id.in_(visible_scope_ids(scope_ids)))
+    if status_filter is not None:
+        stmt = stmt.where(Group.status == status_filter)
+    if parent_group_id is not None:
+        stmt = stmt.where(Group.parent_group_id == parent_group_id)
+    if q:
+        stmt = stmt.where(Group.name.istartswith(q, autoescape=True))
+    stamps = keyset_page(stmt.with_only_columns(Group.id, Group.updated_at), Group, page)
+    validators = Validators.for_page(request, db.execute(stamps).all())
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+    rows = db.execute(keyset_page(stmt, Group, page)).all()
+    return rows_response(finish_page(rows, page, request, response), Group, GroupRead, response)
 
 
 @router.get("/{group_id}", response_model=GroupRead)
 def get_group(
     group_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    _perms=Depends(require_permissions("all", "system.admin", "group.view", "group.manage_members")),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.view", "group.manage_members")),
 ):
     group = db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    validators = Validators.for_row(group.id, group.updated_at)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+    return group
+
+
+def _tree_nodes(rows) -> List[GroupTreeNode]:
+    return [
+        GroupTreeNode(**GroupRead.model_validate(group).model_dump(), depth=depth)
+        for group, depth in rows
+    ]
+
+
+def _get_group_or_404(db: Session, group_id: UUID) -> Group:
+    group = db.get(Group, group_id)
+    if not group:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    return group
+
+
+def check_move(
+    db: Session, principal_id: UUID, mask: int, group_id: UUID, new_parent: Optional[UUID]
+) -> None:
+    """
+    Validate moving ``group_id`` under ``new_parent`` (``None``: make it a
+    root). A new root needs platform-level group management; otherwise the
+    caller must also manage the new parent (platform roles or group roles on
+    it or above), and it must not be in the group's own subtree. The checks
+    run under the hierarchy lock, held until the transaction ends, so
+    concurrent moves cannot both pass them.
+    """
+    if new_parent is None:
+        enforce_mask(mask, GROUP_MANAGE_MASK)
+        lock_hierarchy(db.connection())
+        return
+    if not mask_has_any(mask, GROUP_MANAGE_MASK):
+        granted = load_group_permissions(db, principal_id, [new_parent]).get(new_parent, ())
+        enforce_mask(mask | permission_mask(granted), GROUP_MANAGE_MASK)
+    _get_group_or_404(db, new_parent)
+    lock_hierarchy(db.connection())
+    if db.scalar(in_subtree_query(group_id, new_parent)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A group cannot be moved under itself or its descendants",
+        )
+
+
+@router.patch("/{group_id}", response_model=GroupRead)
+def update_group(
+    group_id: UUID,
+    payload: GroupUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.manage_members")),
+):
+    """Update a group; changing ``parent_group_id`` moves its whole subtree."""
+    group = _get_group_or_404(db, group_id)
+    changes = payload.model_dump(exclude_unset=True)
+    if "parent_group_id" in changes and changes["parent_group_id"] != group.parent_group_id:
+        check_move(db, current_user.id, mask, group_id, changes["parent_group_id"])
+    for field, value in changes.items():
+        setattr(group, field, value)
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise code_conflict(exc)
+    db.refresh(group)
     return group
 
+
+@router.get("/{group_id}/subtree", response_model=List[GroupTreeNode])
+def get_group_subtree(
+    group_id: UUID,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.view", "group.manage_members")),
+):
+    """The group and everything under it, shallowest first (depth 0 is the group itself)."""
+    rows = db.execute(descendants_query(group_id, include_self=True)).all()
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    return _tree_nodes(rows)
+
+
+@router.get("/{group_id}/descendants", response_model=List[GroupTreeNode])
+def get_group_descendants(
+    group_id: UUID,
+    max_depth: Optional[int] = Query(None, ge=1, description="1 = direct subgroups only."),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.view", "group.manage_members")),
+):
+    _get_group_or_404(db, group_id)
+    return _tree_nodes(db.execute(descendants_query(group_id, max_depth=max_depth)).all())
+
+
+@router.get("/{group_id}/ancestors", response_model=List[GroupTreeNode])
+def get_group_ancestors(
+    group_id: UUID,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.view", "group.manage_members")),
+):
+    """Path from the root down to the group's parent; ``depth`` counts levels up."""
+    _get_group_or_404(db, group_id)
+    return _tree_nodes(db.execute(ancestors_query(group_id)).all())
+
+
+@router.post("/{group_id}/members/import", response_model=MembershipImportResult)
+async def import_group_members(
+    group_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.manage_members")),
+):
+    """
+    Bulk-add members from a streamed ``text/csv`` (with header) or
+    ``application/x-ndjson`` body. Rows carry ``email`` and/or ``phone`` and an
+    optional ``status``; they are resolved and inserted in batches, and
+    per-row failures are reported with their line number.
+    """
+    fmt = detect_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson",
+        )
+    await run_in_threadpool(_get_group_or_404, db, group_id)
+
+    report = ImportReport(max_errors=settings.MEMBER_IMPORT_MAX_ERRORS)
+    batch = []
+    async for row in iter_rows(
+        request.stream(), fmt, report, settings.MEMBER_IMPORT_MAX_LINE_LENGTH
+    ):
+        batch.append(row)
+        if len(batch) >= settings.MEMBER_IMPORT_BATCH_SIZE:
+            await run_in_threadpool(import_batch, db, group_id, batch, report)
+            batch = []
+    if batch:
+        await run_in_threadpool(import_batch, db, group_id, batch, report)
+    return report
@@ -0,0 +1,232 @@
+"""AsyncSession version of ``routes_groups`` (mounted when ``DB_ASYNC`` is enabled)."""
+
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import Validators
+from app.api.deps_async import (
+    get_current_user_permission_mask,
+    require_group_permissions,
+    require_permissions,
+)
+from app.api.pagination import PageParams, finish_page, keyset_page, page_params
+from app.api.serialization import rows_response, schema_columns
+from app.api.v1.routes_auth_async import Principal, get_current_principal
+from app.api.v1.routes_groups import (
+    GROUP_VIEW_MASK,
+    check_move,
+    code_conflict,
+    visible_scope_ids,
+)
+from app.core.acl import mask_has_any
+from app.core.config import settings
+from app.core.permissions import granting_scope_ids
+from app.db.query_budget import query_budget
+from app.db.session import get_async_db, get_async_read_db
+from app.models.group import Group
+from app.schemas import GroupCreate, GroupRead, GroupTreeNode, GroupUpdate, MembershipImportResult
+from app.services.group_hierarchy import ancestors_query, descendants_query
+from app.services.membership_import import ImportReport, detect_format, import_batch, iter_rows
+
+
+router = APIRouter()
+
+
+@router.post("/", response_model=GroupRead, status_code=status.HTTP_201_CREATED)
+async def create_group(
+    payload: GroupCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin", "group.manage_members")),
+):
+    group = Group(
+        name=payload.name,
+        code=payload.code,
+        description=payload.description,
+        parent_group_id=payload.parent_group_id,
+    )
+    db.add(group)
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise code_conflict(exc)
+    await db.refresh(group)
+    return group
+
+
+@router.get("/", response_model=List[GroupRead])
+@query_budget(6)
+async def list_groups(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    parent_group_id: Optional[UUID] = None,
+    q: Optional[str] = Query(None, description="Case-insensitive name prefix."),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """
+    Groups visible to the caller: all of them with a platform role, otherwise
+    the subtrees of the groups where a group-scoped role grants viewing.
+    """
+    stmt = select(*schema_columns(Group, GroupRead))
+    if not mask_has_any(mask, GROUP_VIEW_MASK):
+        scope_ids = await db.run_sync(granting_scope_ids, current_user.id, GROUP_VIEW_MASK)
+        stmt = stmt.where(Group.id.in_(visible_scope_ids(scope_ids)))
+    if status_filter is not None:
+        stmt = stmt.where(Group.status == status_filter)
+    if parent_group_id is not None:
+        stmt = stmt.where(Group.parent_group_id == parent_group_id)
+    if q:
+        stmt = stmt.where(Group.name.istartswith(q, autoescape=True))
+    stamps = keyset_page(stmt.with_only_columns(Group.id, Group.updated_at), Group, page)
+    validators = Validators.for_page(request, (await db.execute(stamps)).all())
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+    rows = (await db.execute(keyset_page(stmt, Group, page))).all()
+    return rows_response(finish_page(rows, page, request, response), Group, GroupRead, response)
+
+
+@router.get("/{group_id}", response_model=GroupRead)
+async def get_group(
+    group_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.view", "group.manage_members")),
+):
+    group = await db.get(Group, group_id)
+    if not group:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    validators = Validators.for_row(group.id, group.updated_at)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+    return group
+
+
+def _tree_nodes(rows) -> List[GroupTreeNode]:
+    return [
+        GroupTreeNode(**GroupRead.model_validate(group).model_dump(), depth=depth)
+        for group, depth in rows
+    ]
+
+
+async def _get_group_or_404(db: AsyncSession, group_id: UUID) -> Group:
+    group = await db.get(Group, group_id)
+    if not group:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    return group
+
+
+@router.patch("/{group_id}", response_model=GroupRead)
+async def update_group(
+    group_id: UUID,
+    payload: GroupUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.manage_members")),
+):
+    """Update a group; changing ``parent_group_id`` moves its whole subtree."""
+    group = await _get_group_or_404(db, group_id)
+    changes = payload.model_dump(exclude_unset=True)
+    if "parent_group_id" in changes and changes["parent_group_id"] != group.parent_group_id:
+        await db.run_sync(
+            check_move, current_user.id, mask, group_id, changes["parent_group_id"]
+        )
+    for field, value in changes.items():
+        setattr(group, field, value)
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise code_conflict(exc)
+    await db.refresh(group)
+    return group
+
+
+@router.get("/{group_id}/subtree", response_model=List[GroupTreeNode])
+async def get_group_subtree(
+    group_id: UUID,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.view", "group.manage_members")),
+):
+    """The group and everything under it, shallowest first (depth 0 is the group itself)."""
+    rows = (await db.execute(descendants_query(group_id, include_self=True))).all()
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    return _tree_nodes(rows)
+
+
+@router.get("/{group_id}/descendants", response_model=List[GroupTreeNode])
+async def get_group_descendants(
+    group_id: UUID,
+    max_depth: Optional[int] = Query(None, ge=1, description="1 = direct subgroups only."),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.view", "group.manage_members")),
+):
+    await _get_group_or_404(db, group_id)
+    rows = (await db.execute(descendants_query(group_id, max_depth=max_depth))).all()
+    return _tree_nodes(rows)
+
+
+@router.get("/{group_id}/ancestors", response_model=List[GroupTreeNode])
+async def get_group_ancestors(
+    group_id: UUID,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.view", "group.manage_members")),
+):
+    """Path from the root down to the group's parent; ``depth`` counts levels up."""
+    await _get_group_or_404(db, group_id)
+    rows = (await db.execute(ancestors_query(group_id))).all()
+    return _tree_nodes(rows)
+
+
+@router.post("/{group_id}/members/import", response_model=MembershipImportResult)
+async def import_group_members(
+    group_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_group_permissions("all", "system.admin", "group.manage_members")),
+):
+    """
+    Bulk-add members from a streamed ``text/csv`` (with header) or
+    ``application/x-ndjson`` body. Rows carry ``email`` and/or ``phone`` and an
+    optional ``status``; they are resolved and inserted in batches, and
+    per-row failures are reported with their line number.
+    """
+    fmt = detect_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson",
+        )
+    await _get_group_or_404(db, group_id)
+
+    report = ImportReport(max_errors=settings.MEMBER_IMPORT_MAX_ERRORS)
+    batch = []
+    async for row in iter_rows(
+        request.stream(), fmt, report, settings.MEMBER_IMPORT_MAX_LINE_LENGTH
+    ):
+        batch.append(row)
+        if len(batch) >= settings.MEMBER_IMPORT_BATCH_SIZE:
+            await db.run_sync(import_batch, group_id, batch, report)
+            batch = []
+    if batch:
+        await db.run_sync(import_batch, group_id, batch, report)
+    return report
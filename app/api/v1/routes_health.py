@@ -1,4 +1,18 @@
+import time
+
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.pool import pool_status
+from app.db.replicas import replica_name, replica_router
+from app.db.session import (
+    get_async_engine,
+    get_async_replica_engines,
+    get_engine,
+    get_replica_engines,
+)
 
 
 router = APIRouter()
@@ -8,3 +22,45 @@ router = APIRouter()
 def health_check():
     return {"status": "ok"}
 
+
+@router.get("/health/ready", summary="Deep readiness check")
+def readiness_check():
+    """
+    Check a real DB round-trip and report connection pool usage and replica
+    lag. A lagging or unreachable replica does not fail the check: reads fall
+    back to the primary.
+
+    ``db.checkout_ms`` is the time spent getting a connection from the pool and
+    ``db.query_ms`` the time of ``SELECT 1`` itself, so slow readiness can be
+    attributed to pool queueing or to Postgres.
+    """
+    engine = get_engine()
+    db_status = {}
+    healthy = True
+    try:
+        started = time.perf_counter()
+        with engine.connect() as conn:
+            checked_out = time.perf_counter()
+            conn.execute(text("SELECT 1"))
+            finished = time.perf_counter()
+        db_status.update(
+            ok=True,
+            checkout_ms=round((checked_out - started) * 1000, 3),
+            query_ms=round((finished - checked_out) * 1000, 3),
+        )
+    except Exception as exc:
+        healthy = False
+        db_status.update(ok=False, error=type(exc).__name__)
+
+    pools = {"primary": pool_status(engine.pool)}
+    for index, replica in enumerate(get_replica_engines()):
+        pools[replica_name(index)] = pool_status(replica.pool)
+    if settings.DB_ASYNC:
+        pools["primary_async"] = pool_status(get_async_engine().sync_engine.pool)
+        for index, replica in enumerate(get_async_replica_engines()):
+            pools[f"{replica_name(index)}_async"] = pool_status(replica.sync_engine.pool)
+
+    body = {"status": "ok" if healthy else "unavailable", "db": db_status, "pools": pools}
+    if replica_router.enabled:
+        body["replicas"] = replica_router.status()
+    return JSONResponse(body, status_code=200 if healthy else 503)
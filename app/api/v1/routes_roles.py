@@ -1,49 +1,85 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.conditional import Validators, weak_etag
 from app.api.deps import require_permissions
-from app.api.v1.routes_auth import get_current_user
+from app.api.pagination import PageParams, finish_page, keyset_page, page_params
+from app.api.serialization import rows_response, schema_columns
+from app.api.v1.routes_auth import Principal, get_current_principal
 from app.core.acl import PERMISSIONS
-from app.db.session import get_db
+from app.db.query_budget import query_budget
+from app.db.session import get_db, get_read_db
 from app.models.role import Role
-from app.models.user import User
 from app.schemas.role import RoleCreate, RoleRead
 
 
 router = APIRouter()
 
+# The catalogue only changes with a deploy.
+ACL_VALIDATORS = Validators(weak_etag(sorted(PERMISSIONS)))
+
 
 @router.get("/acls", response_model=List[str])
+@query_budget(3)
 def list_acls(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
     _perms=Depends(require_permissions("all", "system.admin")),
 ):
     """List all available ACL (permission) codes defined in the system."""
+    if ACL_VALIDATORS.is_fresh(request):
+        return ACL_VALIDATORS.not_modified()
+    ACL_VALIDATORS.apply(response)
     return sorted(PERMISSIONS)
 
 
 @router.get("/", response_model=List[RoleRead])
+@query_budget(5)
 def list_roles(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    is_system: Optional[bool] = None,
+    q: Optional[str] = Query(None, description="Case-insensitive name prefix."),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
     _perms=Depends(require_permissions("all", "system.admin")),
 ):
-    return db.query(Role).all()
+    stmt = select(*schema_columns(Role, RoleRead))
+    if is_system is not None:
+        stmt = stmt.where(Role.is_system == is_system)
+    if q:
+        stmt = stmt.where(Role.name.istartswith(q, autoescape=True))
+    stamps = keyset_page(stmt.with_only_columns(Role.id, Role.updated_at), Role, page)
+    validators = Validators.for_page(request, db.execute(stamps).all())
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+    rows = db.execute(keyset_page(stmt, Role, page)).all()
+    return rows_response(finish_page(rows, page, request, response), Role, RoleRead, response)
 
 
 @router.get("/{role_id}", response_model=RoleRead)
 def get_role(
     role_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
     _perms=Depends(require_permissions("all", "system.admin")),
 ):
     role = db.get(Role, role_id)
     if not role:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+    validators = Validators.for_row(role.id, role.updated_at)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
     return role
 
 
@@ -51,7 +87,7 @@ def get_role(
 def create_role(
     payload: RoleCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     _perms=Depends(require_permissions("all", "system.admin")),
 ):
     existing = db.query(Role).filter(Role.name == payload.name).first()
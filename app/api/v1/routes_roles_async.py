@@ -0,0 +1,108 @@
+"""AsyncSession version of ``routes_roles`` (mounted when ``DB_ASYNC`` is enabled)."""
+
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import Validators
+from app.api.deps_async import require_permissions
+from app.api.pagination import PageParams, finish_page, keyset_page, page_params
+from app.api.serialization import rows_response, schema_columns
+from app.api.v1.routes_auth_async import Principal, get_current_principal
+from app.api.v1.routes_roles import ACL_VALIDATORS
+from app.core.acl import PERMISSIONS
+from app.db.query_budget import query_budget
+from app.db.session import get_async_db, get_async_read_db
+from app.models.role import Role
+from app.schemas.role import RoleCreate, RoleRead
+
+
+router = APIRouter()
+
+
+@router.get("/acls", response_model=List[str])
+@query_budget(3)
+async def list_acls(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    """List all available ACL (permission) codes defined in the system."""
+    if ACL_VALIDATORS.is_fresh(request):
+        return ACL_VALIDATORS.not_modified()
+    ACL_VALIDATORS.apply(response)
+    return sorted(PERMISSIONS)
+
+
+@router.get("/", response_model=List[RoleRead])
+@query_budget(5)
+async def list_roles(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    is_system: Optional[bool] = None,
+    q: Optional[str] = Query(None, description="Case-insensitive name prefix."),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    stmt = select(*schema_columns(Role, RoleRead))
+    if is_system is not None:
+        stmt = stmt.where(Role.is_system == is_system)
+    if q:
+        stmt = stmt.where(Role.name.istartswith(q, autoescape=True))
+    stamps = keyset_page(stmt.with_only_columns(Role.id, Role.updated_at), Role, page)
+    validators = Validators.for_page(request, (await db.execute(stamps)).all())
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+    rows = (await db.execute(keyset_page(stmt, Role, page))).all()
+    return rows_response(finish_page(rows, page, request, response), Role, RoleRead, response)
+
+
+@router.get("/{role_id}", response_model=RoleRead)
+async def get_role(
+    role_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    role = await db.get(Role, role_id)
+    if not role:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+    validators = Validators.for_row(role.id, role.updated_at)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+    return role
+
+
+@router.post("/", response_model=RoleRead, status_code=status.HTTP_201_CREATED)
+async def create_role(
+    payload: RoleCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    result = await db.execute(select(Role).where(Role.name == payload.name).limit(1))
+    if result.scalars().first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Role name already exists",
+        )
+    role = Role(
+        name=payload.name,
+        description=payload.description,
+        permissions=payload.permissions or [],
+        is_system=payload.is_system,
+    )
+    db.add(role)
+    await db.commit()
+    await db.refresh(role)
+    return role
@@ -0,0 +1,62 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.api.deps import require_permissions
+from app.api.v1.routes_auth import Principal, get_current_principal
+from app.core.config import settings
+from app.core.refresh_tokens import refresh_token_store
+from app.core.security import get_password_hashes_async
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas import BulkUserCreate, BulkUserResult
+from app.services.user_provisioning import build_results, insert_users, screen_duplicates
+
+
+router = APIRouter()
+
+
+@router.post("/bulk", response_model=BulkUserResult)
+async def bulk_create_users(
+    payload: BulkUserCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    """
+    Provision many users at once. Duplicates (already registered or repeated
+    in the payload) are reported per record; the rest are hashed in parallel
+    on the bulk process pool and inserted in batches.
+    """
+    users = payload.users
+    accepted, rejected = await run_in_threadpool(screen_duplicates, db, users)
+    hashed = await get_password_hashes_async([users[i].password for i in accepted])
+    created = await run_in_threadpool(
+        insert_users, db, users, accepted, hashed, settings.BULK_PROVISION_BATCH_SIZE
+    )
+    results = build_results(users, rejected, created)
+    succeeded = sum(1 for r in results if r.status == "created")
+    return BulkUserResult(created=succeeded, failed=len(results) - succeeded, results=results)
+
+
+def revoke_user_sessions(db: Session, user_id: uuid.UUID) -> None:
+    if db.get(User, user_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    refresh_token_store.revoke_user(db, user_id)
+    db.commit()
+
+
+@router.post("/{user_id}/sessions/revoke", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_sessions(
+    user_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    """
+    Sign the user out everywhere: every refresh token issued to them so far is
+    revoked. Access tokens already issued stay valid until they expire.
+    """
+    revoke_user_sessions(db, user_id)
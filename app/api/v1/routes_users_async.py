@@ -0,0 +1,55 @@
+"""AsyncSession version of ``routes_users`` (mounted when ``DB_ASYNC`` is enabled)."""
+
+import uuid
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps_async import require_permissions
+from app.api.v1.routes_auth_async import Principal, get_current_principal
+from app.api.v1.routes_users import revoke_user_sessions
+from app.core.config import settings
+from app.core.security import get_password_hashes_async
+from app.db.session import get_async_db
+from app.schemas import BulkUserCreate, BulkUserResult
+from app.services.user_provisioning import build_results, insert_users, screen_duplicates
+
+
+router = APIRouter()
+
+
+@router.post("/bulk", response_model=BulkUserResult)
+async def bulk_create_users(
+    payload: BulkUserCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    """
+    Provision many users at once. Duplicates (already registered or repeated
+    in the payload) are reported per record; the rest are hashed in parallel
+    on the bulk process pool and inserted in batches.
+    """
+    users = payload.users
+    accepted, rejected = await db.run_sync(screen_duplicates, users)
+    hashed = await get_password_hashes_async([users[i].password for i in accepted])
+    created = await db.run_sync(
+        insert_users, users, accepted, hashed, settings.BULK_PROVISION_BATCH_SIZE
+    )
+    results = build_results(users, rejected, created)
+    succeeded = sum(1 for r in results if r.status == "created")
+    return BulkUserResult(created=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@router.post("/{user_id}/sessions/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_sessions(
+    user_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    """
+    Sign the user out everywhere: every refresh token issued to them so far is
+    revoked. Access tokens already issued stay valid until they expire.
+    """
+    await db.run_sync(revoke_user_sessions, user_id)
@@ -0,0 +1,327 @@
+from typing import Callable, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import enforce_mask, get_current_user_permission_mask, require_permissions
+from app.api.pagination import (
+    PageParams,
+    encode_sequence_cursor,
+    finish_page,
+    page_params,
+    sequence_page,
+)
+from app.api.v1.routes_auth import Principal, get_current_principal
+from app.core.acl import mask_has_any, permission_mask, required_mask
+from app.core.permissions import load_group_permissions
+from app.db.query_budget import query_budget
+from app.db.session import get_db, get_read_db
+from app.models.wallet import LedgerEntry, LedgerTransaction, Wallet
+from app.schemas import (
+    HoldCapture,
+    HoldRead,
+    PostingRead,
+    WalletCreate,
+    WalletEntryRead,
+    WalletPosting,
+    WalletRead,
+    WalletTransfer,
+)
+from app.services import ledger
+from app.services.ledger import LedgerError, Posting
+
+
+router = APIRouter()
+
+VIEW_MASK = required_mask(["wallet.view"])
+DEBIT_MASK = required_mask(["wallet.debit"])
+CREDIT_MASK = required_mask(["wallet.credit"])
+# What a user may do with their own wallets without any role.
+OWN_WALLET_MASK = VIEW_MASK | DEBIT_MASK
+
+LEDGER_ERROR_STATUS = {
+    ledger.WalletNotFound: status.HTTP_404_NOT_FOUND,
+    ledger.OwnerNotFound: status.HTTP_404_NOT_FOUND,
+    ledger.HoldNotFound: status.HTTP_404_NOT_FOUND,
+    ledger.WalletExists: status.HTTP_409_CONFLICT,
+    ledger.InsufficientFunds: status.HTTP_409_CONFLICT,
+    ledger.ReferenceConflict: status.HTTP_409_CONFLICT,
+    ledger.HoldNotActive: status.HTTP_409_CONFLICT,
+    ledger.CurrencyMismatch: status.HTTP_422_UNPROCESSABLE_ENTITY,
+    ledger.InvalidPosting: status.HTTP_422_UNPROCESSABLE_ENTITY,
+}
+
+
+def ledger_http_error(exc: LedgerError) -> HTTPException:
+    return HTTPException(
+        status_code=LEDGER_ERROR_STATUS.get(type(exc), status.HTTP_409_CONFLICT),
+        detail=str(exc),
+    )
+
+
+def authorize_owner(
+    db: Session,
+    principal_id: UUID,
+    mask: int,
+    owner_type: str,
+    owner_id: UUID,
+    required: int,
+) -> int:
+    """
+    Raise 403 unless the caller may act on wallets of this owner: through
+    platform roles, group-scoped roles on a group (or pool) owner or its
+    ancestors, or as the owning user (view and spend only).
+    """
+    if mask_has_any(mask, required):
+        return mask
+    if owner_type == "user" and owner_id == principal_id:
+        mask |= OWN_WALLET_MASK
+    elif owner_type in ("group", "pool"):
+        granted = load_group_permissions(db, principal_id, [owner_id]).get(owner_id, ())
+        mask |= permission_mask(granted)
+    return enforce_mask(mask, required)
+
+
+def get_wallet_for(
+    db: Session, principal_id: UUID, mask: int, wallet_id: UUID, required: int
+) -> Wallet:
+    """The wallet (404 for unknown and external ones) once the caller is authorized."""
+    wallet = db.get(Wallet, wallet_id)
+    if wallet is None or wallet.owner_type == ledger.EXTERNAL:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wallet not found")
+    authorize_owner(db, principal_id, mask, wallet.owner_type, wallet.owner_id, required)
+    return wallet
+
+
+def history_query(wallet_id: UUID, page: PageParams):
+    stmt = (
+        select(
+            LedgerEntry.transaction_id,
+            LedgerTransaction.kind,
+            LedgerTransaction.reference,
+            LedgerTransaction.description,
+            LedgerEntry.amount,
+            LedgerEntry.sequence,
+            LedgerEntry.balance_after,
+            LedgerEntry.created_at,
+        )
+        .join(LedgerTransaction, LedgerTransaction.id == LedgerEntry.transaction_id)
+        .where(LedgerEntry.wallet_id == wallet_id)
+    )
+    return sequence_page(stmt, LedgerEntry.sequence, page)
+
+
+def history_cursor(row) -> str:
+    return encode_sequence_cursor(row.sequence)
+
+
+def commit_ledger(db: Session, operation: Callable, *args, **kwargs):
+    """Run a ``app.services.ledger`` operation and commit it (rollback on rejection)."""
+    try:
+        result = operation(db, *args, **kwargs)
+    except LedgerError as exc:
+        db.rollback()
+        raise ledger_http_error(exc)
+    db.commit()
+    return result
+
+
+def posting_response(posting: Posting, response: Response) -> Posting:
+    # A retried reference changed nothing: 200 with the original posting.
+    if posting.replayed:
+        response.status_code = status.HTTP_200_OK
+    return posting
+
+
+@router.post("/", response_model=WalletRead, status_code=status.HTTP_201_CREATED)
+def create_wallet(
+    payload: WalletCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    """Open a wallet for a user, a group or a group's pooled fund."""
+    wallet = commit_ledger(
+        db,
+        ledger.create_wallet,
+        payload.owner_type,
+        payload.owner_id,
+        payload.currency,
+        payload.min_balance,
+    )
+    db.refresh(wallet)
+    return wallet
+
+
+@router.get("/", response_model=List[WalletRead])
+@query_budget(4)
+def list_owner_wallets(
+    owner_type: str = Query(..., pattern="^(user|group|pool)$"),
+    owner_id: UUID = Query(...),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """The wallets (one per currency) of a user, group or pool."""
+    authorize_owner(db, current_user.id, mask, owner_type, owner_id, VIEW_MASK)
+    return db.scalars(
+        select(Wallet)
+        .where(Wallet.owner_type == owner_type, Wallet.owner_id == owner_id)
+        .order_by(Wallet.currency)
+    ).all()
+
+
+@router.get("/{wallet_id}", response_model=WalletRead)
+@query_budget(4)
+def get_wallet(
+    wallet_id: UUID,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Balance, held and available funds: a snapshot read, whatever the history length."""
+    return get_wallet_for(db, current_user.id, mask, wallet_id, VIEW_MASK)
+
+
+@router.get("/{wallet_id}/entries", response_model=List[WalletEntryRead])
+@query_budget(5)
+def list_wallet_entries(
+    wallet_id: UUID,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """The wallet's entries, newest first, each with the balance it left."""
+    get_wallet_for(db, current_user.id, mask, wallet_id, VIEW_MASK)
+    rows = db.execute(history_query(wallet_id, page)).all()
+    return finish_page(rows, page, request, response, cursor_for=history_cursor)
+
+
+@router.post("/{wallet_id}/credit", response_model=PostingRead, status_code=status.HTTP_201_CREATED)
+def credit_wallet(
+    wallet_id: UUID,
+    payload: WalletPosting,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Top-up: funds entering the platform."""
+    wallet = get_wallet_for(db, current_user.id, mask, wallet_id, CREDIT_MASK)
+    posting = commit_ledger(
+        db,
+        ledger.credit,
+        wallet,
+        payload.amount,
+        payload.reference,
+        payload.description,
+        current_user.id,
+    )
+    return posting_response(posting, response)
+
+
+@router.post("/{wallet_id}/debit", response_model=PostingRead, status_code=status.HTTP_201_CREATED)
+def debit_wallet(
+    wallet_id: UUID,
+    payload: WalletPosting,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Withdrawal: funds leaving the platform. 409 if the available funds do not cover it."""
+    wallet = get_wallet_for(db, current_user.id, mask, wallet_id, DEBIT_MASK)
+    posting = commit_ledger(
+        db,
+        ledger.debit,
+        wallet,
+        payload.amount,
+        payload.reference,
+        payload.description,
+        current_user.id,
+    )
+    return posting_response(posting, response)
+
+
+@router.post(
+    "/{wallet_id}/transfers", response_model=PostingRead, status_code=status.HTTP_201_CREATED
+)
+def transfer_from_wallet(
+    wallet_id: UUID,
+    payload: WalletTransfer,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Move funds to another wallet of the same currency (e.g. a contribution to a group)."""
+    wallet = get_wallet_for(db, current_user.id, mask, wallet_id, DEBIT_MASK)
+    posting = commit_ledger(
+        db,
+        ledger.transfer,
+        wallet,
+        payload.to_wallet_id,
+        payload.amount,
+        payload.reference,
+        payload.description,
+        current_user.id,
+    )
+    return posting_response(posting, response)
+
+
+@router.post("/{wallet_id}/holds", response_model=HoldRead, status_code=status.HTTP_201_CREATED)
+def place_hold(
+    wallet_id: UUID,
+    payload: WalletPosting,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Reserve funds: they stay in the balance but are no longer available."""
+    wallet = get_wallet_for(db, current_user.id, mask, wallet_id, DEBIT_MASK)
+    hold = commit_ledger(
+        db, ledger.place_hold, wallet, payload.amount, payload.reference, payload.description
+    )
+    db.refresh(hold)
+    return hold
+
+
+@router.post("/{wallet_id}/holds/{hold_id}/capture", response_model=PostingRead)
+def capture_hold(
+    wallet_id: UUID,
+    hold_id: UUID,
+    payload: Optional[HoldCapture] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Post the held funds (to ``to_wallet_id``, or out of the platform)."""
+    get_wallet_for(db, current_user.id, mask, wallet_id, DEBIT_MASK)
+    return commit_ledger(
+        db,
+        ledger.capture_hold,
+        wallet_id,
+        hold_id,
+        payload.to_wallet_id if payload else None,
+        current_user.id,
+    )
+
+
+@router.post("/{wallet_id}/holds/{hold_id}/release", response_model=HoldRead)
+def release_hold(
+    wallet_id: UUID,
+    hold_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Make the held funds available again."""
+    get_wallet_for(db, current_user.id, mask, wallet_id, DEBIT_MASK)
+    hold = commit_ledger(db, ledger.release_hold, wallet_id, hold_id)
+    db.refresh(hold)
+    return hold
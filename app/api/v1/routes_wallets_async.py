@@ -0,0 +1,240 @@
+"""AsyncSession version of ``routes_wallets`` (mounted when ``DB_ASYNC`` is enabled)."""
+
+from typing import Callable, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps_async import get_current_user_permission_mask, require_permissions
+from app.api.pagination import PageParams, finish_page, page_params
+from app.api.v1.routes_auth_async import Principal, get_current_principal
+from app.api.v1.routes_wallets import (
+    CREDIT_MASK,
+    DEBIT_MASK,
+    VIEW_MASK,
+    authorize_owner,
+    get_wallet_for,
+    history_cursor,
+    history_query,
+    ledger_http_error,
+    posting_response,
+)
+from app.db.query_budget import query_budget
+from app.db.session import get_async_db, get_async_read_db
+from app.models.wallet import Wallet
+from app.schemas import (
+    HoldCapture,
+    HoldRead,
+    PostingRead,
+    WalletCreate,
+    WalletEntryRead,
+    WalletPosting,
+    WalletRead,
+    WalletTransfer,
+)
+from app.services import ledger
+from app.services.ledger import LedgerError
+
+
+router = APIRouter()
+
+
+async def commit_ledger(db: AsyncSession, operation: Callable, *args, **kwargs):
+    """Run a ``app.services.ledger`` operation and commit it (rollback on rejection)."""
+    try:
+        result = await db.run_sync(operation, *args, **kwargs)
+    except LedgerError as exc:
+        await db.rollback()
+        raise ledger_http_error(exc)
+    await db.commit()
+    return result
+
+
+@router.post("/", response_model=WalletRead, status_code=status.HTTP_201_CREATED)
+async def create_wallet(
+    payload: WalletCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    _perms=Depends(require_permissions("all", "system.admin")),
+):
+    """Open a wallet for a user, a group or a group's pooled fund."""
+    return await commit_ledger(
+        db,
+        ledger.create_wallet,
+        payload.owner_type,
+        payload.owner_id,
+        payload.currency,
+        payload.min_balance,
+    )
+
+
+@router.get("/", response_model=List[WalletRead])
+@query_budget(4)
+async def list_owner_wallets(
+    owner_type: str = Query(..., pattern="^(user|group|pool)$"),
+    owner_id: UUID = Query(...),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """The wallets (one per currency) of a user, group or pool."""
+    await db.run_sync(authorize_owner, current_user.id, mask, owner_type, owner_id, VIEW_MASK)
+    return (
+        await db.scalars(
+            select(Wallet)
+            .where(Wallet.owner_type == owner_type, Wallet.owner_id == owner_id)
+            .order_by(Wallet.currency)
+        )
+    ).all()
+
+
+@router.get("/{wallet_id}", response_model=WalletRead)
+@query_budget(4)
+async def get_wallet(
+    wallet_id: UUID,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Balance, held and available funds: a snapshot read, whatever the history length."""
+    return await db.run_sync(get_wallet_for, current_user.id, mask, wallet_id, VIEW_MASK)
+
+
+@router.get("/{wallet_id}/entries", response_model=List[WalletEntryRead])
+@query_budget(5)
+async def list_wallet_entries(
+    wallet_id: UUID,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """The wallet's entries, newest first, each with the balance it left."""
+    await db.run_sync(get_wallet_for, current_user.id, mask, wallet_id, VIEW_MASK)
+    rows = (await db.execute(history_query(wallet_id, page))).all()
+    return finish_page(rows, page, request, response, cursor_for=history_cursor)
+
+
+@router.post("/{wallet_id}/credit", response_model=PostingRead, status_code=status.HTTP_201_CREATED)
+async def credit_wallet(
+    wallet_id: UUID,
+    payload: WalletPosting,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Top-up: funds entering the platform."""
+    wallet = await db.run_sync(get_wallet_for, current_user.id, mask, wallet_id, CREDIT_MASK)
+    posting = await commit_ledger(
+        db,
+        ledger.credit,
+        wallet,
+        payload.amount,
+        payload.reference,
+        payload.description,
+        current_user.id,
+    )
+    return posting_response(posting, response)
+
+
+@router.post("/{wallet_id}/debit", response_model=PostingRead, status_code=status.HTTP_201_CREATED)
+async def debit_wallet(
+    wallet_id: UUID,
+    payload: WalletPosting,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Withdrawal: funds leaving the platform. 409 if the available funds do not cover it."""
+    wallet = await db.run_sync(get_wallet_for, current_user.id, mask, wallet_id, DEBIT_MASK)
+    posting = await commit_ledger(
+        db,
+        ledger.debit,
+        wallet,
+        payload.amount,
+        payload.reference,
+        payload.description,
+        current_user.id,
+    )
+    return posting_response(posting, response)
+
+
+@router.post(
+    "/{wallet_id}/transfers", response_model=PostingRead, status_code=status.HTTP_201_CREATED
+)
+async def transfer_from_wallet(
+    wallet_id: UUID,
+    payload: WalletTransfer,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Move funds to another wallet of the same currency (e.g. a contribution to a group)."""
+    wallet = await db.run_sync(get_wallet_for, current_user.id, mask, wallet_id, DEBIT_MASK)
+    posting = await commit_ledger(
+        db,
+        ledger.transfer,
+        wallet,
+        payload.to_wallet_id,
+        payload.amount,
+        payload.reference,
+        payload.description,
+        current_user.id,
+    )
+    return posting_response(posting, response)
+
+
+@router.post("/{wallet_id}/holds", response_model=HoldRead, status_code=status.HTTP_201_CREATED)
+async def place_hold(
+    wallet_id: UUID,
+    payload: WalletPosting,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Reserve funds: they stay in the balance but are no longer available."""
+    wallet = await db.run_sync(get_wallet_for, current_user.id, mask, wallet_id, DEBIT_MASK)
+    return await commit_ledger(
+        db, ledger.place_hold, wallet, payload.amount, payload.reference, payload.description
+    )
+
+
+@router.post("/{wallet_id}/holds/{hold_id}/capture", response_model=PostingRead)
+async def capture_hold(
+    wallet_id: UUID,
+    hold_id: UUID,
+    payload: Optional[HoldCapture] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Post the held funds (to ``to_wallet_id``, or out of the platform)."""
+    await db.run_sync(get_wallet_for, current_user.id, mask, wallet_id, DEBIT_MASK)
+    return await commit_ledger(
+        db,
+        ledger.capture_hold,
+        wallet_id,
+        hold_id,
+        payload.to_wallet_id if payload else None,
+        current_user.id,
+    )
+
+
+@router.post("/{wallet_id}/holds/{hold_id}/release", response_model=HoldRead)
+async def release_hold(
+    wallet_id: UUID,
+    hold_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    mask: int = Depends(get_current_user_permission_mask),
+):
+    """Make the held funds available again."""
+    await db.run_sync(get_wallet_for, current_user.id, mask, wallet_id, DEBIT_MASK)
+    return await commit_ledger(db, ledger.release_hold, wallet_id, hold_id)
@@ -1,33 +1,87 @@
 """
 ACLs (permissions) are defined in code and attached to roles.
 The special permission "all" grants every permission.
+
+Each code also has a fixed bit, so a set of permissions compiles to an int
+mask and hot-path checks are a single AND against a precomputed mask.
 """
 
-from typing import Set
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Set
 
-# All permission codes used in the system (embedded in code).
+# All permission codes used in the system (embedded in code), in bit order.
 # "all" is special: it grants every permission.
+# Bit positions end up in access tokens and caches: only ever append.
 PERMISSION_ALL = "all"
 
-PERMISSIONS: Set[str] = {
-    PERMISSION_ALL,
-    # System
-    "system.admin",
-    # Groups
-    "group.manage_members",
-    "group.manage_goals",
-    "group.approve_loans",
-    "group.view",
-    # Wallet / finance
-    "wallet.view",
-    "wallet.debit",
-    "wallet.credit",
-    "finance.manage_invoices",
-    # Events & notifications
-    "events.manage",
-    "notifications.configure",
+PERMISSION_BITS: Dict[str, int] = {
+    code: 1 << position
+    for position, code in enumerate(
+        (
+            PERMISSION_ALL,
+            # System
+            "system.admin",
+            # Groups
+            "group.manage_members",
+            "group.manage_goals",
+            "group.approve_loans",
+            "group.view",
+            # Wallet / finance
+            "wallet.view",
+            "wallet.debit",
+            "wallet.credit",
+            "finance.manage_invoices",
+            # Events & notifications
+            "events.manage",
+            "notifications.configure",
+        )
+    )
 }
 
+PERMISSIONS: Set[str] = set(PERMISSION_BITS)
+
+MASK_ALL = PERMISSION_BITS[PERMISSION_ALL]
+
+
+@lru_cache(maxsize=4096)
+def _compile(permissions: FrozenSet[str]) -> int:
+    mask = 0
+    for code in permissions:
+        mask |= PERMISSION_BITS.get(code, 0)
+    return mask
+
+
+def permission_mask(permissions: Iterable[str]) -> int:
+    """
+    Integer mask for a set of permission codes (unknown codes are ignored).
+    Results are memoised, so compiling the same role's list again is a dict hit.
+    """
+    return _compile(frozenset(permissions))
+
+
+def required_mask(required: Iterable[str]) -> int:
+    """Mask for permissions a check requires; unknown codes are a programming error."""
+    required = set(required)
+    unknown = required - PERMISSIONS
+    if unknown:
+        raise ValueError(f"Unknown permission(s): {', '.join(sorted(unknown))}")
+    return permission_mask(required)
+
+
+def mask_permissions(mask: int) -> Set[str]:
+    """Permission codes set in ``mask``."""
+    return {code for code, bit in PERMISSION_BITS.items() if mask & bit}
+
+
+def mask_has_any(mask: int, required: int) -> bool:
+    """True if ``mask`` holds "all" or at least one bit of ``required``."""
+    return bool(mask & (required | MASK_ALL))
+
+
+def mask_has_all(mask: int, required: int) -> bool:
+    """True if ``mask`` holds "all" or every bit of ``required``."""
+    return bool(mask & MASK_ALL) or mask & required == required
+
 
 def has_permission(user_permissions: Set[str], required: str) -> bool:
     """Return True if user has the required permission."""
@@ -12,12 +12,108 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
 
     DATABASE_URL: str = "postgresql+psycopg2://savemo_user:4e3w2q11423@db:5432/savemo"
+    # Serve the API routers on AsyncSession/asyncpg instead of the sync stack.
+    DB_ASYNC: bool = False
+    # Defaults to DATABASE_URL with the asyncpg driver.
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Read replicas (app.db.replicas): JSON list of URLs. Read-only GET routes
+    # use them round-robin, but read from the primary while a replica lags more
+    # than REPLICA_MAX_LAG_SECONDS and, for REPLICA_STICKY_SECONDS after a user
+    # wrote, for that user (keep it above the maximum lag).
+    DATABASE_REPLICA_URLS: List[str] = []
+    # Defaults to DATABASE_REPLICA_URLS with the asyncpg driver.
+    ASYNC_DATABASE_REPLICA_URLS: Optional[List[str]] = None
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_SECONDS: float = 1.0
+    REPLICA_STICKY_SECONDS: float = 10.0
+    REPLICA_STICKY_MAX_ENTRIES: int = 100_000
+
+    # Connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Connections all workers of one instance may hold together; python -m
+    # app.server then derives DB_POOL_SIZE / DB_MAX_OVERFLOW per worker from it.
+    DB_CONNECTION_BUDGET: Optional[int] = None
+
+    # Server (python -m app.server)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # Worker processes; default: one per available CPU.
+    WEB_CONCURRENCY: Optional[int] = None
+    # Recycle a worker after this many requests (0: never), plus random jitter.
+    WORKER_MAX_REQUESTS: int = 0
+    WORKER_MAX_REQUESTS_JITTER: int = 0
+    # On SIGTERM, how long workers may finish in-flight requests.
+    GRACEFUL_SHUTDOWN_SECONDS: int = 30
 
     JWT_SECRET_KEY: str = "4e3w2q11423!$@#"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Refresh token rotation (app.core.refresh_tokens): revoked families and
+    # users are held in a per-worker Bloom filter, rebuilt from the table (and
+    # expired rows deleted in batches) every REFRESH_TOKEN_SWEEP_SECONDS.
+    REFRESH_TOKEN_BLOOM_CAPACITY: int = 100_000
+    REFRESH_TOKEN_BLOOM_ERROR_RATE: float = 0.001
+    REFRESH_TOKEN_SWEEP_SECONDS: int = 300
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = 5000
+
+    # Permission cache (per worker, invalidated cluster-wide via Postgres NOTIFY)
+    PERMISSION_CACHE_ENABLED: bool = True
+    PERMISSION_CACHE_TTL_SECONDS: int = 300
+    PERMISSION_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Stateless access tokens: embed active flag, permissions and permissions
+    # version so authn/authz can be served from the JWT without hitting the DB.
+    ACCESS_TOKEN_STATELESS: bool = False
+
+    # Password hashing pool (bcrypt runs here, not on the shared threadpool)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 2
+    # Process pool for bulk provisioning, per worker (0 = available CPUs
+    # divided by the number of workers python -m app.server starts)
+    PASSWORD_HASH_PROCESSES: int = 0
+
+    # Bulk user provisioning
+    BULK_PROVISION_MAX_USERS: int = 5000
+    BULK_PROVISION_BATCH_SIZE: int = 1000
+
+    # Client branding
+    CLIENT_LOGO_MAX_BYTES: int = 2 * 1024 * 1024
+    CLIENT_LOGO_CHUNK_BYTES: int = 256 * 1024
+
+    # Bulk membership import
+    MEMBER_IMPORT_BATCH_SIZE: int = 1000
+    MEMBER_IMPORT_MAX_ERRORS: int = 1000
+    MEMBER_IMPORT_MAX_LINE_LENGTH: int = 4096
+
+    # Savings goals: rows per INSERT batch when schedules are written without
+    # COPY, and the most periods a goal may have (guards runaway schedules).
+    SCHEDULE_INSERT_BATCH_SIZE: int = 5000
+    GOAL_MAX_PERIODS: int = 1000
+
+    # Observability: per-worker Prometheus metrics at METRICS_PATH, and an
+    # optional Server-Timing header with app and DB time for each response.
+    METRICS_ENABLED: bool = True
+    METRICS_PATH: str = "/metrics"
+    SERVER_TIMING_ENABLED: bool = False
+
+    # Serve the OpenAPI schema from a file generated at build time
+    # (python -m app.api.openapi) instead of building it on the first request.
+    OPENAPI_PREBUILT_PATH: Optional[str] = None
+
+    # Query budgets (app.db.query_budget): "off", "warn" or "raise". Set to
+    # "raise" in CI and staging so N+1 regressions fail instead of slowing down.
+    QUERY_BUDGET_MODE: str = "off"
+    # Identical statements allowed per request on routes without their own budget.
+    QUERY_BUDGET_MAX_REPEATS: int = 5
+
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyUrl] = []
 
@@ -25,6 +121,18 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
 
+    @property
+    def async_database_url(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        return self.DATABASE_URL.replace("+psycopg2", "+asyncpg", 1)
+
+    @property
+    def async_replica_urls(self) -> List[str]:
+        if self.ASYNC_DATABASE_REPLICA_URLS is not None:
+            return self.ASYNC_DATABASE_REPLICA_URLS
+        return [url.replace("+psycopg2", "+asyncpg", 1) for url in self.DATABASE_REPLICA_URLS]
+
 
 @lru_cache
 def get_settings() -> Settings:
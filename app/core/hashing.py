@@ -0,0 +1,160 @@
+"""
+Dedicated executors for bcrypt work.
+
+bcrypt is CPU-bound and releases the GIL, so a small, sized thread pool keeps
+hashing off the event loop and out of Starlette's shared threadpool. Admission
+is bounded: once ``workers + queue size`` jobs are pending, new jobs are
+rejected immediately with ``HashPoolSaturated`` so callers can answer 503
+instead of queueing behind a login storm.
+
+Bulk provisioning uses a separate process pool (``BulkHashPool``) so hashing
+thousands of passwords scales across cores without touching the login pool.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, TypeVar
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.cpus import available_cpus
+
+T = TypeVar("T")
+
+HASH_QUEUE_WAIT = metrics.histogram(
+    "savemo_password_hash_queue_wait_seconds",
+    "Time password hashing jobs wait for a hashing worker.",
+    ["operation"],
+)
+HASH_DURATION = metrics.histogram(
+    "savemo_password_hash_duration_seconds",
+    "Time spent running bcrypt.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+HASH_PENDING = metrics.gauge(
+    "savemo_password_hash_pending",
+    "Password hashing jobs queued or running.",
+)
+HASH_REJECTED = metrics.counter(
+    "savemo_password_hash_rejected_total",
+    "Password hashing jobs rejected because the pool was saturated.",
+    ["operation"],
+)
+
+
+class HashPoolSaturated(Exception):
+    """Raised when the hashing pool cannot accept more work."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class PasswordHashPool:
+    def __init__(self, workers: int, queue_size: int, retry_after: int) -> None:
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.retry_after = retry_after
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+        HASH_PENDING.dec()
+
+    async def run(self, operation: str, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.capacity:
+                HASH_REJECTED.inc(operation=operation)
+                raise HashPoolSaturated(self.retry_after)
+            self._pending += 1
+        HASH_PENDING.inc()
+
+        submitted = time.perf_counter()
+
+        def _job() -> T:
+            started = time.perf_counter()
+            HASH_QUEUE_WAIT.observe(started - submitted, operation=operation)
+            try:
+                return fn(*args)
+            finally:
+                HASH_DURATION.observe(time.perf_counter() - started, operation=operation)
+                self._release()
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_executor(), _job)
+        except BaseException:
+            self._release()
+            raise
+        return await future
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class BulkHashPool:
+    """Process pool that hashes large batches of passwords in parallel chunks."""
+
+    def __init__(self, processes: int) -> None:
+        self.processes = processes or available_cpus()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process that owns DB connections and threads.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def map_chunks(
+        self, fn: Callable[[List[str]], List[str]], items: List[str]
+    ) -> List[str]:
+        """Run ``fn`` over ``items`` split into roughly equal chunks, preserving order."""
+        if not items:
+            return []
+        chunk_count = min(len(items), self.processes * 4)
+        size = -(-len(items) // chunk_count)
+        chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, fn, chunk) for chunk in chunks)
+        )
+        HASH_DURATION.observe(time.perf_counter() - started, operation="bulk_hash")
+        return [value for chunk in results for value in chunk]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
+
+bulk_hash_pool = BulkHashPool(processes=settings.PASSWORD_HASH_PROCESSES)
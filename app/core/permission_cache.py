@@ -0,0 +1,410 @@
+"""
+Per-worker cache of resolved user permissions.
+
+Entries are keyed by user id and live until the earliest of:
+- the next ``starts_at``/``ends_at`` boundary of the user's role assignments,
+- ``PERMISSION_CACHE_TTL_SECONDS`` (safety net if a notification is missed),
+- a bump of the permissions version that applies to the user.
+
+Versions come from the ``permission_version_seq`` sequence, so every worker
+agrees on their order (clocks play no part) and they can be embedded in
+access tokens. A change to a ``Role`` bumps the global version; a change to
+a user's assignments or to the user row itself bumps only that user's
+version. The flush records the new version in ``permission_versions`` and
+issues ``pg_notify`` inside the same transaction, so the notification reaches
+every worker only once the change is committed. The version is drawn after
+locking the scope's row (user bumps also share-lock the global row), so of
+two conflicting changes the one committed later always has the higher
+version.
+
+Each worker runs a small LISTEN thread (started from the app lifespan) that
+applies the new versions. On every (re)connect it first loads the global
+version and the user versions changed within an access token lifetime from
+``permission_versions``, so nothing missed while disconnected is lost and
+tokens that are still current stay trusted.
+"""
+
+import logging
+import select as select_module
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.acl import permission_mask
+from app.core.config import settings
+from app.core.permissions import load_user_permissions
+from app.models.role import PermissionVersion, Role, UserRoleAssignment, permission_version_seq
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "savemo_permissions_changed"
+# ``permission_versions`` row of the global version.
+GLOBAL_SCOPE = uuid.UUID(int=0)
+
+
+@dataclass
+class PermissionSnapshot:
+    permissions: Set[str]
+    # Version the permissions were resolved at (compare with ``version_for``).
+    version: int
+    # Next starts_at/ends_at boundary, if any.
+    next_change: Optional[datetime]
+    # ``permissions`` compiled to ACL bits (see ``app.core.acl``).
+    mask: int = 0
+
+
+class PermissionCache:
+    """Thread-safe LRU of user id -> (permissions, mask, version, expires_at)."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self.max_entries = max_entries
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._entries: "OrderedDict[uuid.UUID, tuple[frozenset[str], int, int, datetime, Optional[datetime]]]" = (
+            OrderedDict()
+        )
+        self._version = 0
+        self._user_versions: Dict[uuid.UUID, int] = {}
+        # When each per-user watermark was last raised (time.monotonic()).
+        self._user_seen: Dict[uuid.UUID, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def version_for(self, user_id: uuid.UUID) -> int:
+        """Effective permissions version for a user (global or per-user, whichever is newer)."""
+        return max(self._version, self._user_versions.get(user_id, 0))
+
+    def apply_change(self, version: int, user_id: Optional[uuid.UUID] = None) -> None:
+        """Record a committed change; entries resolved before ``version`` become stale."""
+        with self._lock:
+            if user_id is None:
+                if version > self._version:
+                    self._version = version
+                self._entries.clear()
+                # Per-user watermarks at or below the global one are redundant.
+                self._user_versions = {
+                    uid: v for uid, v in self._user_versions.items() if v > self._version
+                }
+                return
+            if version > self._user_versions.get(user_id, 0):
+                self._user_versions[user_id] = version
+                self._user_seen[user_id] = time.monotonic()
+            self._entries.pop(user_id, None)
+            if len(self._user_versions) > self.max_entries:
+                self._prune_user_versions()
+
+    def _prune_user_versions(self) -> None:
+        # Only watermarks older than any still-valid access token are safe to forget.
+        horizon = time.monotonic() - settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        self._user_seen = {uid: t for uid, t in self._user_seen.items() if t > horizon}
+        self._user_versions = {
+            uid: v for uid, v in self._user_versions.items() if uid in self._user_seen
+        }
+
+    def next_local_version(self) -> int:
+        """A version above every one seen, for databases without the sequence (SQLite)."""
+        with self._lock:
+            return max(self._version, *self._user_versions.values(), 0) + 1
+
+    def get(self, user_id: uuid.UUID) -> Optional[PermissionSnapshot]:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            perms, mask, version, expires_at, next_change = entry
+            if version != self.version_for(user_id) or expires_at <= now:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return PermissionSnapshot(set(perms), version, next_change, mask)
+
+    def set(self, user_id: uuid.UUID, snapshot: PermissionSnapshot) -> None:
+        expires_at = datetime.now(timezone.utc) + self.ttl
+        if snapshot.next_change is not None and snapshot.next_change < expires_at:
+            expires_at = snapshot.next_change
+        with self._lock:
+            # A change landed while we were loading: the result may already be stale.
+            if snapshot.version != self.version_for(user_id):
+                return
+            self._entries[user_id] = (
+                frozenset(snapshot.permissions),
+                snapshot.mask,
+                snapshot.version,
+                expires_at,
+                snapshot.next_change,
+            )
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+permission_cache = PermissionCache(
+    max_entries=settings.PERMISSION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
+
+
+def get_permission_snapshot(db: Session, user_id: uuid.UUID) -> PermissionSnapshot:
+    """Resolve permissions with the version they are valid for, using the cache when enabled."""
+    if settings.PERMISSION_CACHE_ENABLED:
+        cached = permission_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+    # Capture the version before loading so a concurrent change marks the result stale.
+    version = permission_cache.version_for(user_id)
+    perms, next_change = load_user_permissions(db, user_id)
+    snapshot = PermissionSnapshot(perms, version, next_change, permission_mask(perms))
+    if settings.PERMISSION_CACHE_ENABLED:
+        permission_cache.set(user_id, snapshot)
+    return snapshot
+
+
+def get_cached_user_permissions(db: Session, user_id: uuid.UUID) -> Set[str]:
+    """Return effective permissions for a user, hitting the DB only on a cache miss."""
+    return get_permission_snapshot(db, user_id).permissions
+
+
+# ---------------------------------------------------------------------------
+# Invalidation: emit NOTIFY whenever roles, assignments or users change
+# ---------------------------------------------------------------------------
+
+
+def _encode_payload(version: int, user_id: Optional[uuid.UUID]) -> str:
+    return f"{version}:{user_id or '*'}"
+
+
+def _decode_payload(payload: str) -> tuple[int, Optional[uuid.UUID]]:
+    version, _, target = payload.partition(":")
+    return int(version), (None if target in ("", "*") else uuid.UUID(target))
+
+
+def _next_version(session: Session, user_ids: List[uuid.UUID], global_change: bool) -> int:
+    """
+    Lock the changed scopes' ``permission_versions`` rows, then draw the next
+    version from the sequence and record it there (Postgres only).
+    """
+    table = PermissionVersion.__table__
+    if not global_change:
+        session.execute(
+            pg_insert(table)
+            .values([{"scope_id": uid, "version": 0, "changed_at": func.now()} for uid in user_ids])
+            .on_conflict_do_nothing()
+        )
+    # Role changes wait for in-flight user changes and vice versa.
+    session.execute(
+        select(table.c.scope_id)
+        .where(table.c.scope_id == GLOBAL_SCOPE)
+        .with_for_update(read=not global_change)
+    )
+    scopes = [GLOBAL_SCOPE] if global_change else sorted(user_ids)
+    if not global_change:
+        session.execute(
+            select(table.c.scope_id)
+            .where(table.c.scope_id.in_(scopes))
+            .order_by(table.c.scope_id)
+            .with_for_update()
+        )
+    version = session.scalar(select(permission_version_seq.next_value()))
+    session.execute(
+        update(table)
+        .where(table.c.scope_id.in_(scopes))
+        .values(version=version, changed_at=func.now())
+    )
+    return version
+
+
+def _record_changes(
+    session: Session, user_ids: Iterable[uuid.UUID], global_change: bool
+) -> None:
+    user_ids = {uid for uid in user_ids if uid is not None}
+    if not global_change and not user_ids:
+        return
+    pending = session.info.setdefault(
+        "permission_changes", {"global": False, "users": set(), "version": None}
+    )
+    pending["global"] = pending["global"] or global_change
+    pending["users"].update(user_ids)
+
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    version = _next_version(session, list(user_ids), global_change)
+    pending["version"] = max(pending["version"] or 0, version)
+    targets: list[Optional[uuid.UUID]] = [None] if global_change else list(user_ids)
+    for target in targets:
+        # NOTIFY is transactional: other workers only see it after COMMIT.
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": _encode_payload(version, target)},
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _notify_on_permission_change(session: Session, flush_context) -> None:
+    global_change = False
+    user_ids: Set[uuid.UUID] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Role):
+            global_change = True
+        elif isinstance(obj, UserRoleAssignment):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, User) and obj not in session.new:
+            # Deactivation or profile changes revoke stateless tokens for this user.
+            user_ids.add(obj.id)
+    if global_change or user_ids:
+        _record_changes(session, user_ids, global_change)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_on_commit(session: Session) -> None:
+    pending = session.info.pop("permission_changes", None)
+    if not pending:
+        return
+    version = pending["version"] or permission_cache.next_local_version()
+    if pending["global"]:
+        permission_cache.apply_change(version)
+    for user_id in pending["users"]:
+        permission_cache.apply_change(version, user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("permission_changes", None)
+
+
+def notify_permissions_changed(db: Session, user_id: Optional[uuid.UUID] = None) -> None:
+    """
+    Explicitly invalidate cached permissions and stateless tokens on all workers,
+    for one user or (``user_id=None``) everyone. Takes effect on commit.
+    """
+    _record_changes(db, [user_id] if user_id else [], user_id is None)
+
+
+# ---------------------------------------------------------------------------
+# Cross-worker listener
+# ---------------------------------------------------------------------------
+
+
+class PermissionChangeListener:
+    """
+    Background thread that LISTENs for permission changes and applies them
+    locally. Other per-worker state can share its connection via ``subscribe``.
+    """
+
+    def __init__(self, engine: Engine, poll_seconds: float = 5.0) -> None:
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._handlers: Dict[str, Callable[[str], None]] = {}
+        self._on_connect: List[Callable[[], None]] = []
+
+    def subscribe(
+        self,
+        channel: str,
+        handler: Callable[[str], None],
+        on_connect: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Also LISTEN on ``channel`` and pass its payloads to ``handler``.
+        ``on_connect`` runs after every (re)connect, when notifications may
+        have been missed. Call before ``start``.
+        """
+        self._handlers[channel] = handler
+        if on_connect is not None:
+            self._on_connect.append(on_connect)
+
+    def start(self) -> None:
+        if self.engine.dialect.name != "postgresql" or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="permission-cache-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+
+    def _connect(self):
+        # A dedicated DBAPI connection outside the pool: LISTEN needs it forever.
+        cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+        conn = self.engine.dialect.connect(*cargs, **cparams)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            for channel in (NOTIFY_CHANNEL, *self._handlers):
+                cur.execute(f"LISTEN {channel}")
+        return conn
+
+    def _load_versions(self, conn) -> None:
+        """Apply the versions recorded while this worker was not listening."""
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT scope_id, version FROM permission_versions"
+                " WHERE scope_id = %s OR changed_at > now() - make_interval(mins => %s)",
+                (str(GLOBAL_SCOPE), settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            )
+            rows = cur.fetchall()
+        versions = {uuid.UUID(str(scope_id)): int(version) for scope_id, version in rows}
+        permission_cache.apply_change(versions.pop(GLOBAL_SCOPE, 0))
+        for user_id, version in versions.items():
+            permission_cache.apply_change(version, user_id)
+
+    def _drain(self, conn) -> None:
+        conn.poll()
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            if notify.channel in self._handlers:
+                self._handlers[notify.channel](notify.payload)
+                continue
+            try:
+                version, user_id = _decode_payload(notify.payload)
+            except ValueError:
+                logger.warning("Ignoring malformed permissions notification %r", notify.payload)
+                continue
+            permission_cache.apply_change(version, user_id)
+
+    def _run(self) -> None:
+        conn = None
+        while not self._stop.is_set():
+            try:
+                if conn is None:
+                    conn = self._connect()
+                    # Changes may have been missed while disconnected; LISTEN is
+                    # already on, so anything committed after this read arrives.
+                    self._load_versions(conn)
+                    for callback in self._on_connect:
+                        callback()
+                ready, _, _ = select_module.select([conn], [], [], self.poll_seconds)
+                if ready:
+                    self._drain(conn)
+            except Exception:
+                logger.exception("Permission cache listener failed; reconnecting")
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                    conn = None
+                self._stop.wait(self.poll_seconds)
+        if conn is not None:
+            conn.close()
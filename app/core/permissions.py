@@ -2,31 +2,140 @@
 
 import uuid
 from datetime import datetime, timezone
-from typing import Set
+from typing import Dict, Iterable, Optional, Set, Tuple
 
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session, joinedload
 
-from app.models.role import UserRoleAssignment
+from app.core.acl import mask_has_any, permission_mask
+from app.db.utils import utcnow
+from app.models.group import GroupClosure
+from app.models.role import Role, UserRoleAssignment
 
+SCOPE_PLATFORM = "platform"
+SCOPE_GROUP = "group"
 
-def get_user_permissions(db: Session, user_id: uuid.UUID) -> Set[str]:
-    """Load effective permissions for a user from their platform-level role assignments."""
+
+def _as_utc(value: datetime) -> datetime:
+    """Assignment windows are stored as naive UTC; make them comparable with aware datetimes."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def load_user_permissions(
+    db: Session, user_id: uuid.UUID
+) -> Tuple[Set[str], Optional[datetime]]:
+    """
+    Load effective platform permissions and the instant they next change.
+
+    The second element is the earliest future ``starts_at``/``ends_at`` among the
+    user's assignments (None if no window boundary is pending), so callers can
+    cache the result until then.
+    """
     now = datetime.now(timezone.utc)
     assignments = (
         db.query(UserRoleAssignment)
         .filter(
             UserRoleAssignment.user_id == user_id,
-            UserRoleAssignment.scope_type == "platform",
+            UserRoleAssignment.scope_type == SCOPE_PLATFORM,
+            # Expired assignments can neither grant nor schedule a change.
+            or_(
+                UserRoleAssignment.ends_at.is_(None),
+                UserRoleAssignment.ends_at >= now.replace(tzinfo=None),
+            ),
         )
         .options(joinedload(UserRoleAssignment.role))
         .all()
     )
     perms: Set[str] = set()
+    next_change: Optional[datetime] = None
     for a in assignments:
-        if a.starts_at and a.starts_at > now:
+        starts_at = _as_utc(a.starts_at) if a.starts_at else None
+        ends_at = _as_utc(a.ends_at) if a.ends_at else None
+        for boundary in (starts_at, ends_at):
+            if boundary and boundary > now and (next_change is None or boundary < next_change):
+                next_change = boundary
+        if starts_at and starts_at > now:
             continue
-        if a.ends_at and a.ends_at < now:
+        if ends_at and ends_at < now:
             continue
         if a.role and a.role.permissions:
             perms.update(a.role.permissions)
+    return perms, next_change
+
+
+def get_user_permissions(db: Session, user_id: uuid.UUID) -> Set[str]:
+    """Load effective permissions for a user from their platform-level role assignments."""
+    perms, _ = load_user_permissions(db, user_id)
     return perms
+
+
+# ---------------------------------------------------------------------------
+# Group-scoped permissions
+#
+# A role assigned with ``scope_type="group"`` and ``scope_id=G`` applies in G
+# and every group below it. Inheritance is resolved through ``group_closure``
+# and assignment windows are filtered in SQL, so each question below costs a
+# single query however many groups it is about.
+# ---------------------------------------------------------------------------
+
+
+def _active_group_assignments(user_id: uuid.UUID):
+    now = utcnow()
+    return (
+        select(UserRoleAssignment.scope_id, Role.permissions)
+        .join(Role, Role.id == UserRoleAssignment.role_id)
+        .where(
+            UserRoleAssignment.user_id == user_id,
+            UserRoleAssignment.scope_type == SCOPE_GROUP,
+            or_(UserRoleAssignment.starts_at.is_(None), UserRoleAssignment.starts_at <= now),
+            or_(UserRoleAssignment.ends_at.is_(None), UserRoleAssignment.ends_at >= now),
+        )
+    )
+
+
+def load_group_permissions(
+    db: Session, user_id: uuid.UUID, group_ids: Iterable[uuid.UUID]
+) -> Dict[uuid.UUID, Set[str]]:
+    """
+    Permissions granted to a user in each of ``group_ids`` by group-scoped roles
+    on the group or any of its ancestors (platform roles are not included).
+    Groups without any grant are absent from the result.
+    """
+    group_ids = set(group_ids)
+    if not group_ids:
+        return {}
+    assignments = _active_group_assignments(user_id).subquery()
+    rows = db.execute(
+        select(GroupClosure.descendant_id, assignments.c.permissions)
+        .join(assignments, assignments.c.scope_id == GroupClosure.ancestor_id)
+        .where(GroupClosure.descendant_id.in_(group_ids))
+    )
+    result: Dict[uuid.UUID, Set[str]] = {}
+    for group_id, permissions in rows:
+        result.setdefault(group_id, set()).update(permissions or ())
+    return result
+
+
+def get_group_permissions(
+    db: Session, user_id: uuid.UUID, group_id: uuid.UUID, platform_permissions: Set[str]
+) -> Set[str]:
+    """Effective permissions of a user in one group: platform roles plus inherited group roles."""
+    return platform_permissions | load_group_permissions(db, user_id, [group_id]).get(
+        group_id, set()
+    )
+
+
+def granting_scope_ids(db: Session, user_id: uuid.UUID, required: int) -> Set[uuid.UUID]:
+    """
+    Groups where the user holds a group-scoped role granting any of the
+    ``required`` bits. Their subtrees (see ``group_hierarchy.subtrees_ids_query``)
+    are what the user may see, which lets list endpoints filter in SQL instead
+    of per row.
+    """
+    return {
+        scope_id
+        for scope_id, permissions in db.execute(_active_group_assignments(user_id))
+        if scope_id is not None and mask_has_any(permission_mask(permissions or ()), required)
+    }
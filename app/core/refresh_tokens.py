@@ -0,0 +1,340 @@
+"""
+Refresh token rotation with reuse detection.
+
+Every refresh token carries a ``jti`` and a family id (``fam``): login starts
+a family, and each refresh consumes the presented token and issues the next
+one in the same family. State lives in ``refresh_token_revocations``:
+- "used": the jti of every rotated-away token. The refresh writes it with
+  ``INSERT ... ON CONFLICT DO NOTHING``, so presenting the same token twice
+  conflicts. That is reuse (the token leaked, or was replayed) and the whole
+  family is revoked: neither copy can be continued.
+- "family": logout, or reuse detected.
+- "user": all of a user's sessions revoked; covers tokens issued up to
+  ``revoked_at``.
+
+Family and user revocations are checked without a query: each worker keeps
+the ids of the live "family"/"user" rows in a Bloom filter. A miss (nearly
+every refresh) proves the token is not revoked; only a hit is confirmed
+against the table by primary key. Revocations go into the local filter at
+once and into the other workers' through Postgres NOTIFY (received by the
+permission listener connection), so a refresh racing a revocation on another
+worker can still pass within that delay. Bloom filters cannot forget, so
+``RefreshTokenMaintenance`` rebuilds the filter from the table at startup,
+periodically and after the listener reconnects (notifications may have been
+missed), and deletes expired rows in batches. Until the first build, every
+check goes to the table.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.utils import insert_for, utcnow
+from app.models.token import RefreshTokenRevocation
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "savemo_refresh_tokens_revoked"
+
+USED = "used"
+FAMILY = "family"
+USER = "user"
+
+# Tokens issued before rotation have no jti: it is derived from the token itself.
+_LEGACY_NAMESPACE = uuid.UUID("5b0d7c52-8a0e-4a8e-9d2b-2f7c1e6a4b31")
+# Only one worker at a time sweeps expired rows.
+_SWEEP_LOCK_KEY = 0x5AFE_0022
+
+REFRESH_TOKEN_CHECKS = metrics.counter(
+    "savemo_refresh_token_checks_total",
+    "Refresh token revocation checks by result (bloom_miss needed no query).",
+    ["result"],
+)
+
+
+def _from_timestamp(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+
+def _timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of UUIDs (double hashing of one BLAKE2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: uuid.UUID) -> List[int]:
+        digest = hashlib.blake2b(item.bytes, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: uuid.UUID) -> None:
+        # Not atomic: callers serialize adds.
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: uuid.UUID) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+@dataclass
+class RefreshClaims:
+    user_id: uuid.UUID
+    token_id: uuid.UUID
+    family_id: uuid.UUID
+    # Epoch seconds; 0 for tokens issued before rotation.
+    issued_at: float
+    expires_at: datetime
+
+    @classmethod
+    def from_payload(cls, payload: dict, token: str) -> "RefreshClaims":
+        if "jti" in payload:
+            token_id = uuid.UUID(payload["jti"])
+            family_id = uuid.UUID(payload["fam"])
+        else:
+            # Legacy token: usable once, and its successor starts a family.
+            token_id = uuid.uuid5(_LEGACY_NAMESPACE, token)
+            family_id = uuid.uuid5(token_id, FAMILY)
+        return cls(
+            user_id=uuid.UUID(payload["sub"]),
+            token_id=token_id,
+            family_id=family_id,
+            issued_at=float(payload.get("iat", 0)),
+            expires_at=_from_timestamp(payload["exp"]),
+        )
+
+
+class RefreshTokenStore:
+    """Per-worker view of revoked refresh token families and users."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter: Optional[BloomFilter] = None
+        # Ids revoked while a rebuild is reading the table.
+        self._pending: Optional[List[uuid.UUID]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._filter is not None
+
+    def remember(self, token_id: uuid.UUID) -> None:
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(token_id)
+            if self._pending is not None:
+                self._pending.append(token_id)
+
+    def apply_notification(self, payload: str) -> None:
+        try:
+            token_id = uuid.UUID(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed refresh token notification %r", payload)
+            return
+        self.remember(token_id)
+
+    def rebuild(self, db: Session) -> int:
+        """Reload the filter from the live family/user rows; return their count."""
+        table = RefreshTokenRevocation
+        with self._lock:
+            self._pending = []
+        try:
+            ids = db.scalars(
+                select(table.token_id).where(
+                    table.kind.in_((FAMILY, USER)), table.expires_at > utcnow()
+                )
+            ).all()
+            bloom = BloomFilter(max(self.capacity, 2 * len(ids)), self.error_rate)
+            for token_id in ids:
+                bloom.add(token_id)
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            for token_id in self._pending or ():
+                bloom.add(token_id)
+            self._filter = bloom
+            self._pending = None
+        return len(ids)
+
+    def is_revoked(self, db: Session, claims: RefreshClaims) -> bool:
+        """Whether the token's family or user was revoked; no query on a filter miss."""
+        bloom = self._filter
+        candidates = [claims.family_id, claims.user_id]
+        if bloom is not None:
+            candidates = [token_id for token_id in candidates if token_id in bloom]
+            if not candidates:
+                REFRESH_TOKEN_CHECKS.inc(result="bloom_miss")
+                return False
+        rows = db.scalars(
+            select(RefreshTokenRevocation).where(RefreshTokenRevocation.token_id.in_(candidates))
+        ).all()
+        revoked = any(
+            (row.kind == FAMILY and row.token_id == claims.family_id)
+            or (
+                row.kind == USER
+                and row.token_id == claims.user_id
+                and claims.issued_at <= _timestamp(row.revoked_at)
+            )
+            for row in rows
+        )
+        if revoked:
+            REFRESH_TOKEN_CHECKS.inc(result="revoked")
+        else:
+            REFRESH_TOKEN_CHECKS.inc(result="false_positive" if bloom is not None else "unfiltered")
+        return revoked
+
+    def consume(self, db: Session, claims: RefreshClaims) -> bool:
+        """Mark the token used (commit pending); False if it already was: reuse."""
+        result = db.execute(
+            insert_for(db, RefreshTokenRevocation)
+            .values(
+                token_id=claims.token_id,
+                kind=USED,
+                user_id=claims.user_id,
+                revoked_at=utcnow(),
+                expires_at=claims.expires_at,
+            )
+            .on_conflict_do_nothing()
+        )
+        if result.rowcount != 1:
+            REFRESH_TOKEN_CHECKS.inc(result="reused")
+            return False
+        return True
+
+    def revoke_family(self, db: Session, family_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        """Revoke a token family (commit pending)."""
+        now = utcnow()
+        db.execute(
+            insert_for(db, RefreshTokenRevocation)
+            .values(
+                token_id=family_id,
+                kind=FAMILY,
+                user_id=user_id,
+                revoked_at=now,
+                # Outlives every token of the family issued until now.
+                expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+            .on_conflict_do_nothing()
+        )
+        self._publish(db, family_id)
+
+    def revoke_user(self, db: Session, user_id: uuid.UUID) -> None:
+        """Revoke every refresh token issued to the user so far (commit pending)."""
+        now = utcnow()
+        values = {
+            "revoked_at": now,
+            "expires_at": now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        }
+        stmt = insert_for(db, RefreshTokenRevocation).values(
+            token_id=user_id, kind=USER, user_id=user_id, **values
+        )
+        db.execute(stmt.on_conflict_do_update(index_elements=["token_id"], set_=values))
+        self._publish(db, user_id)
+
+    def _publish(self, db: Session, token_id: uuid.UUID) -> None:
+        # Locally right away: a rolled-back revocation only costs a query on a hit.
+        self.remember(token_id)
+        if db.get_bind().dialect.name == "postgresql":
+            # NOTIFY is transactional: other workers only see it after COMMIT.
+            db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": NOTIFY_CHANNEL, "payload": str(token_id)},
+            )
+
+
+refresh_token_store = RefreshTokenStore(
+    capacity=settings.REFRESH_TOKEN_BLOOM_CAPACITY,
+    error_rate=settings.REFRESH_TOKEN_BLOOM_ERROR_RATE,
+)
+
+
+def sweep_expired(db: Session, batch_size: int) -> int:
+    """Delete expired rows, one transaction per batch; return how many were deleted."""
+    table = RefreshTokenRevocation.__table__
+    is_postgres = db.get_bind().dialect.name == "postgresql"
+    total = 0
+    while True:
+        if is_postgres and not db.scalar(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _SWEEP_LOCK_KEY}
+        ):
+            db.rollback()
+            return total
+        expired = select(table.c.token_id).where(table.c.expires_at <= utcnow()).limit(batch_size)
+        deleted = db.execute(delete(table).where(table.c.token_id.in_(expired))).rowcount
+        db.commit()
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+class RefreshTokenMaintenance:
+    """Background thread that rebuilds the worker's filter and sweeps expired rows."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        store: RefreshTokenStore = refresh_token_store,
+        interval_seconds: float = settings.REFRESH_TOKEN_SWEEP_SECONDS,
+        batch_size: int = settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE,
+    ) -> None:
+        self.engine = engine
+        self.store = store
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="refresh-token-maintenance", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def request_rebuild(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                with Session(bind=self.engine) as db:
+                    swept = sweep_expired(db, self.batch_size)
+                    live = self.store.rebuild(db)
+                if swept:
+                    logger.info("Swept %d expired refresh token rows", swept)
+                logger.debug("Refresh token filter rebuilt with %d revocations", live)
+            except Exception:
+                logger.exception("Refresh token maintenance failed")
+            self._wake.wait(self.interval_seconds)
@@ -1,4 +1,5 @@
 import hashlib
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
@@ -6,6 +7,7 @@ import bcrypt
 import jwt
 
 from app.core.config import settings
+from app.core.hashing import bulk_hash_pool, password_hash_pool
 
 # Bcrypt only accepts up to 72 bytes. Pre-hash longer passwords with SHA256
 # so we never exceed that (64-char hex digest).
@@ -29,8 +31,32 @@ def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(normalized, bcrypt.gensalt()).decode("utf-8")
 
 
+def get_password_hashes(passwords: list[str]) -> list[str]:
+    """Hash a batch of passwords (top-level so it can run in a worker process)."""
+    return [get_password_hash(password) for password in passwords]
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Run ``verify_password`` on the dedicated hashing pool (may raise HashPoolSaturated)."""
+    return await password_hash_pool.run(
+        "verify", verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Run ``get_password_hash`` on the dedicated hashing pool (may raise HashPoolSaturated)."""
+    return await password_hash_pool.run("hash", get_password_hash, password)
+
+
+async def get_password_hashes_async(passwords: list[str]) -> list[str]:
+    """Hash many passwords in parallel on the bulk process pool, preserving order."""
+    return await bulk_hash_pool.map_chunks(get_password_hashes, passwords)
+
+
 def create_access_token(
-    subject: Any, expires_delta: Optional[timedelta] = None
+    subject: Any,
+    expires_delta: Optional[timedelta] = None,
+    extra_claims: Optional[dict[str, Any]] = None,
 ) -> str:
     if expires_delta is None:
         expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -40,17 +66,29 @@ def create_access_token(
         "type": "access",
         "exp": datetime.now(timezone.utc) + expires_delta,
     }
+    if extra_claims:
+        to_encode.update(extra_claims)
     return jwt.encode(
         to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
     )
 
 
-def create_refresh_token(subject: Any) -> str:
+def create_refresh_token(subject: Any, family_id: Optional[uuid.UUID] = None) -> str:
+    """
+    Refresh token with a unique ``jti``. ``fam`` is the token family: a new
+    one at login, inherited by every token rotated from it (see
+    ``app.core.refresh_tokens``).
+    """
     expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    now = datetime.now(timezone.utc)
     to_encode = {
         "sub": str(subject),
         "type": "refresh",
-        "exp": datetime.now(timezone.utc) + expires_delta,
+        "jti": str(uuid.uuid4()),
+        "fam": str(family_id or uuid.uuid4()),
+        # Sub-second precision: compared with the time of a user-wide revocation.
+        "iat": now.timestamp(),
+        "exp": now + expires_delta,
     }
     return jwt.encode(
         to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
@@ -70,4 +108,3 @@ def decode_access_token(token: str) -> dict[str, Any]:
     if payload.get("type") not in ("access", None):
         raise ValueError("Invalid token type")
     return payload
-
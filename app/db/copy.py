@@ -0,0 +1,44 @@
+"""Streaming rows into Postgres ``COPY ... FROM STDIN`` (CSV format)."""
+
+import csv
+import io
+from itertools import islice
+from typing import Iterator, Sequence
+
+Row = Sequence[object]
+
+
+class CsvStream:
+    """File-like object producing CSV for ``COPY`` from a row iterator, on demand."""
+
+    def __init__(self, rows: Iterator[Row], batch: int = 2000) -> None:
+        self._rows = rows
+        self._batch = batch
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = ""
+        self.rows = 0
+
+    def _fill(self) -> bool:
+        chunk = list(islice(self._rows, self._batch))
+        if not chunk:
+            return False
+        self._writer.writerows(chunk)
+        self.rows += len(chunk)
+        self._pending += self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while (size < 0 or len(self._pending) < size) and self._fill():
+            pass
+        if size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def copy_sql(table: str, columns: Sequence[str]) -> str:
+    # None is written as an unquoted empty field, which CSV COPY reads as NULL.
+    return f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
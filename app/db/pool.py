@@ -0,0 +1,116 @@
+"""
+Instrumented connection pools.
+
+``checkout``/``checkin`` pool events keep checked-out and overflow gauges
+current; the pool subclasses time ``_do_get`` (the only place a request waits
+for a connection) so we can tell pool queueing apart from Postgres latency.
+"""
+
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core import metrics
+from app.core.config import settings
+
+POOL_CHECKOUT_WAIT = metrics.histogram(
+    "savemo_db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool (includes opening overflow connections).",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_CHECKOUT_TIMEOUTS = metrics.counter(
+    "savemo_db_pool_checkout_timeouts_total",
+    "Checkouts that failed because the pool stayed exhausted for pool_timeout.",
+    ["pool"],
+)
+POOL_CHECKED_OUT = metrics.gauge(
+    "savemo_db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    ["pool"],
+)
+POOL_OVERFLOW = metrics.gauge(
+    "savemo_db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is still filling).",
+    ["pool"],
+)
+
+
+class _TimedCheckoutMixin:
+    metrics_name = "primary"
+
+    def _do_get(self):  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(pool=self.metrics_name)
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, pool=self.metrics_name)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options() -> Dict[str, Any]:
+    """``create_engine`` keyword arguments for the configured pool."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _refresh_gauges(pool: QueuePool, name: str) -> None:
+    POOL_CHECKED_OUT.set(pool.checkedout(), pool=name)
+    POOL_OVERFLOW.set(pool.overflow(), pool=name)
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    """Label the engine's pool and keep its gauges updated on checkout/checkin."""
+    pool = engine.pool
+    if not isinstance(pool, _TimedCheckoutMixin):
+        return
+    pool.metrics_name = name
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy) -> None:
+        _refresh_gauges(pool, name)
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_conn, record) -> None:
+        _refresh_gauges(pool, name)
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """Point-in-time pool usage plus cumulative checkout-wait stats, for readiness probes."""
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    name = getattr(pool, "metrics_name", None)
+    if name is not None:
+        _, total, count = POOL_CHECKOUT_WAIT.samples().get((name,), ([], 0.0, 0))
+        status.update(
+            checkouts=count,
+            checkout_wait_avg_ms=round(total / count * 1000, 3) if count else 0.0,
+            checkout_timeouts=int(POOL_CHECKOUT_TIMEOUTS.samples().get((name,), 0)),
+        )
+    return status
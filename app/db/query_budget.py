@@ -0,0 +1,109 @@
+"""
+Query budgets: make N+1 regressions fail loudly instead of showing up as latency.
+
+A budget caps the number of SQL statements and how often one identical
+statement may repeat (lazy loads in a loop render the same SQL with different
+parameters). It can be declared on a route::
+
+    @router.get("/", response_model=List[GroupRead])
+    @query_budget(6)
+    def list_groups(...): ...
+
+which the request metrics middleware checks before the response starts, or
+wrapped around any block of code::
+
+    with query_budget(3, max_repeats=1):
+        import_batch(db, group_id, rows, report)
+
+``QUERY_BUDGET_MODE`` decides what a violation does: ``off`` (production
+default, statements are not tracked), ``warn`` (log) or ``raise``
+(``QueryBudgetExceeded``; use in tests and staging). Routes without a declared
+budget still get ``QUERY_BUDGET_MAX_REPEATS`` as an N+1 guard.
+"""
+
+import logging
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.db.query_stats import QueryStats, begin_query_stats, end_query_stats
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+MODE_OFF = "off"
+MODE_WARN = "warn"
+MODE_RAISE = "raise"
+
+BUDGET_ATTRIBUTE = "__query_budget__"
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised (in ``raise`` mode) when a route or block runs more queries than allowed."""
+
+
+class QueryBudget:
+    def __init__(self, max_queries: Optional[int] = None, max_repeats: Optional[int] = None) -> None:
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats if max_repeats is not None else settings.QUERY_BUDGET_MAX_REPEATS
+        self._stats: Optional[QueryStats] = None
+        self._token = None
+
+    def violations(self, stats: QueryStats) -> list:
+        problems = []
+        if self.max_queries is not None and stats.count > self.max_queries:
+            problems.append(f"{stats.count} queries (budget {self.max_queries})")
+        if stats.statements:
+            statement, repeats = stats.statements.most_common(1)[0]
+            if repeats > self.max_repeats:
+                sql = " ".join(statement.split())[:200]
+                problems.append(
+                    f"same statement run {repeats} times (max {self.max_repeats}), "
+                    f"likely N+1: {sql}"
+                )
+        return problems
+
+    def enforce(self, stats: QueryStats, where: str) -> None:
+        """Apply ``QUERY_BUDGET_MODE`` to any violation found in ``stats``."""
+        if settings.QUERY_BUDGET_MODE == MODE_OFF:
+            return
+        problems = self.violations(stats)
+        if not problems:
+            return
+        message = f"Query budget exceeded in {where}: " + "; ".join(problems)
+        if settings.QUERY_BUDGET_MODE == MODE_RAISE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    # Route decorator: mark the endpoint, leave it unwrapped so FastAPI
+    # introspects and runs it exactly as before.
+    def __call__(self, endpoint: F) -> F:
+        setattr(endpoint, BUDGET_ATTRIBUTE, self)
+        return endpoint
+
+    # Context manager: budget a block of code.
+    def __enter__(self) -> QueryStats:
+        self._stats, self._token = begin_query_stats(track_statements=True)
+        return self._stats
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end_query_stats(self._token)
+        if exc_type is None:
+            self.enforce(self._stats, "block")
+
+
+def query_budget(max_queries: Optional[int] = None, max_repeats: Optional[int] = None) -> QueryBudget:
+    """Declare a query budget for a route (decorator) or a block (``with``)."""
+    return QueryBudget(max_queries, max_repeats)
+
+
+def budget_for(endpoint: Optional[Callable]) -> QueryBudget:
+    """The budget declared on ``endpoint``, or the default N+1 guard."""
+    return getattr(endpoint, BUDGET_ATTRIBUTE, None) or DEFAULT_BUDGET
+
+
+def tracking_enabled() -> bool:
+    return settings.QUERY_BUDGET_MODE != MODE_OFF
+
+
+DEFAULT_BUDGET = QueryBudget()
@@ -0,0 +1,303 @@
+"""
+Query-plan regression check for the hot lookups.
+
+Seeds synthetic rows inside a transaction that is always rolled back, runs the
+real query paths while capturing the SQL they emit, and EXPLAINs every SELECT
+with ``enable_seqscan = off``. A ``Seq Scan`` that survives that setting means
+no index can serve the query, so the check fails (exit status 1).
+
+    python -m app.db.query_plans [--rows 2000] [--verbose]
+
+Needs ``DATABASE_URL`` to point at a Postgres database migrated to head. The
+same check runs under pytest (``tests/test_query_plans.py``) when
+``TEST_DATABASE_URL`` is set.
+"""
+
+import argparse
+import sys
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event, insert, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.api.pagination import PageParams, encode_cursor, keyset_page
+from app.core.acl import permission_mask
+from app.core.permissions import (
+    granting_scope_ids,
+    load_group_permissions,
+    load_user_permissions,
+)
+from app.db.session import get_engine
+from app.models.group import Group, GroupMembership
+from app.models.role import Role, UserRoleAssignment
+from app.models.user import User
+from app.services.group_hierarchy import (
+    ancestor_ids_query,
+    ancestors_query,
+    descendants_query,
+    in_subtree_query,
+    subtrees_ids_query,
+)
+
+SEEDED_TABLES = [
+    "users",
+    "roles",
+    "groups",
+    "group_closure",
+    "group_memberships",
+    "user_role_assignments",
+]
+
+
+@dataclass
+class Seed:
+    user_ids: List[uuid.UUID]
+    emails: List[str]
+    phones: List[str]
+    group_ids: List[uuid.UUID]
+    role_id: uuid.UUID
+
+
+def seed(db: Session, rows: int) -> Seed:
+    token = uuid.uuid4().hex[:8]
+    role = Role(name=f"query-plans-{token}", permissions=["group.view"])
+    db.add(role)
+
+    # A 4-ary tree so subtree/ancestor lookups have real depth.
+    groups: List[Group] = []
+    for i in range(max(rows // 10, 8)):
+        parent = groups[(i - 1) // 4] if i else None
+        groups.append(Group(name=f"qp-{token}-{i}", parent_group=parent))
+    db.add_all(groups)
+    db.flush()
+
+    users = [
+        {
+            "id": uuid.uuid4(),
+            "email": f"qp-{token}-{i}@example.invalid",
+            "phone": f"+0{token}{i}",
+            "hashed_password": "x",
+        }
+        for i in range(rows)
+    ]
+    db.execute(insert(User.__table__), users)
+
+    now = datetime.utcnow()
+    memberships = []
+    assignments = []
+    for i, user in enumerate(users):
+        for k in range(3):
+            memberships.append(
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user["id"],
+                    "group_id": groups[(i + k * 7) % len(groups)].id,
+                    "status": "active",
+                    "exited_at": now if k == 2 else None,
+                }
+            )
+        assignments.append(
+            {"id": uuid.uuid4(), "user_id": user["id"], "role_id": role.id, "scope_type": "platform"}
+        )
+        assignments.append(
+            {
+                "id": uuid.uuid4(),
+                "user_id": user["id"],
+                "role_id": role.id,
+                "scope_type": "group",
+                "scope_id": groups[i % len(groups)].id,
+            }
+        )
+    db.execute(insert(GroupMembership.__table__), memberships)
+    db.execute(insert(UserRoleAssignment.__table__), assignments)
+    db.flush()
+    for table in SEEDED_TABLES:
+        db.execute(text(f"ANALYZE {table}"))
+
+    return Seed(
+        user_ids=[u["id"] for u in users],
+        emails=[u["email"] for u in users],
+        phones=[u["phone"] for u in users],
+        group_ids=[g.id for g in groups],
+        role_id=role.id,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Hot paths. Each runs the real query code (or the exact statement the route
+# builds) against the seeded data.
+# ---------------------------------------------------------------------------
+
+
+def _permissions(db: Session, s: Seed) -> None:
+    load_user_permissions(db, s.user_ids[len(s.user_ids) // 2])
+
+
+def _group_permissions(db: Session, s: Seed) -> None:
+    load_group_permissions(db, s.user_ids[len(s.user_ids) // 2], s.group_ids[-20:])
+
+
+def _granting_scopes(db: Session, s: Seed) -> None:
+    granting_scope_ids(db, s.user_ids[len(s.user_ids) // 2], permission_mask(["group.view"]))
+
+
+def _user_by_email(db: Session, s: Seed) -> None:
+    db.execute(select(User).where(User.email == s.emails[-1]).limit(1)).first()
+
+
+def _users_by_identifier(db: Session, s: Seed) -> None:
+    db.execute(
+        select(User.id, User.email, User.phone).where(
+            or_(User.email.in_(s.emails[:50]), User.phone.in_(s.phones[50:100]))
+        )
+    ).all()
+
+
+def _active_members_of_group(db: Session, s: Seed) -> None:
+    db.scalars(
+        select(GroupMembership.user_id).where(
+            GroupMembership.group_id == s.group_ids[3],
+            GroupMembership.user_id.in_(s.user_ids[:100]),
+            GroupMembership.exited_at.is_(None),
+        )
+    ).all()
+
+
+def _active_groups_of_user(db: Session, s: Seed) -> None:
+    db.scalars(
+        select(GroupMembership.group_id).where(
+            GroupMembership.user_id == s.user_ids[7],
+            GroupMembership.exited_at.is_(None),
+        )
+    ).all()
+
+
+def _assignments_of_role(db: Session, s: Seed) -> None:
+    db.scalars(
+        select(UserRoleAssignment.id).where(UserRoleAssignment.role_id == s.role_id).limit(1)
+    ).all()
+
+
+def _group_descendants(db: Session, s: Seed) -> None:
+    db.execute(descendants_query(s.group_ids[1], max_depth=2)).all()
+
+
+def _group_ancestors(db: Session, s: Seed) -> None:
+    db.execute(ancestors_query(s.group_ids[-1])).all()
+
+
+def _group_in_subtree(db: Session, s: Seed) -> None:
+    db.scalar(in_subtree_query(s.group_ids[1], s.group_ids[-1]))
+
+
+def _group_ancestor_ids(db: Session, s: Seed) -> None:
+    db.scalars(ancestor_ids_query(s.group_ids[-1])).all()
+
+
+def _groups_page(db: Session, s: Seed) -> None:
+    middle = db.get(Group, s.group_ids[len(s.group_ids) // 2])
+    page = PageParams(cursor=encode_cursor(middle.created_at, middle.id), limit=50)
+    db.scalars(keyset_page(select(Group), Group, page)).all()
+    db.scalars(
+        keyset_page(select(Group).where(Group.parent_group_id == s.group_ids[0]), Group, page)
+    ).all()
+
+
+def _visible_groups_page(db: Session, s: Seed) -> None:
+    # What list_groups builds for a caller with only group-scoped roles.
+    visible = Group.id.in_(subtrees_ids_query(s.group_ids[1:4]))
+    db.scalars(keyset_page(select(Group).where(visible), Group, PageParams(cursor=None, limit=50))).all()
+
+
+HOT_PATHS: List[Tuple[str, Callable[[Session, Seed], None]]] = [
+    ("permissions.load_user_permissions", _permissions),
+    ("permissions.load_group_permissions", _group_permissions),
+    ("permissions.granting_scope_ids", _granting_scopes),
+    ("auth.user_by_email", _user_by_email),
+    ("members.users_by_identifier", _users_by_identifier),
+    ("members.active_members_of_group", _active_members_of_group),
+    ("members.active_groups_of_user", _active_groups_of_user),
+    ("roles.assignments_of_role", _assignments_of_role),
+    ("groups.descendants", _group_descendants),
+    ("groups.ancestors", _group_ancestors),
+    ("groups.ancestor_ids", _group_ancestor_ids),
+    ("groups.in_subtree", _group_in_subtree),
+    ("groups.keyset_page", _groups_page),
+    ("groups.visible_keyset_page", _visible_groups_page),
+]
+
+
+@contextmanager
+def capture_selects(db: Session) -> Iterator[List[Tuple[str, Any]]]:
+    statements: List[Tuple[str, Any]] = []
+    connection = db.connection()
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", _before)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", _before)
+
+
+def seq_scans(plan: dict) -> Iterator[str]:
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name", "?")
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+def check(db: Session, s: Seed, verbose: bool = False) -> List[str]:
+    """Run every hot path; return one failure message per statement that seq-scans."""
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    failures = []
+    for name, run in HOT_PATHS:
+        with capture_selects(db) as statements:
+            run(db, s)
+        ok = True
+        for statement, parameters in statements:
+            plan = db.connection().exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters
+            ).scalar()[0]["Plan"]
+            if verbose:
+                print(f"-- {name}\n{statement}\n{plan}\n")
+            scanned = sorted(set(seq_scans(plan)))
+            if scanned:
+                failures.append(f"{name}: Seq Scan on {', '.join(scanned)}")
+                ok = False
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000, help="synthetic users to seed")
+    parser.add_argument("--verbose", action="store_true", help="print each statement and plan")
+    args = parser.parse_args(argv)
+
+    engine = get_engine()
+    if engine.dialect.name != "postgresql":
+        print("query plan checks need a PostgreSQL DATABASE_URL", file=sys.stderr)
+        return 2
+
+    db = Session(bind=engine)
+    try:
+        failures = check(db, seed(db, args.rows), verbose=args.verbose)
+    finally:
+        db.rollback()
+        db.close()
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Per-request database query accounting.
+
+``instrument_queries(engine, name)`` hooks ``before/after_cursor_execute`` so
+every statement is timed into worker-wide metrics and into the ``QueryStats``
+of the request being served. The request's stats object lives in a context
+variable set by the request metrics middleware; Starlette's threadpool and
+SQLAlchemy's asyncio greenlets both carry the context along, so sync and
+async routes are accounted the same way.
+"""
+
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import metrics
+
+DB_QUERIES = metrics.counter(
+    "savemo_db_queries_total",
+    "SQL statements executed.",
+    ["engine"],
+)
+DB_QUERY_DURATION = metrics.histogram(
+    "savemo_db_query_duration_seconds",
+    "Time spent executing single SQL statements (driver round-trip).",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    # Statement text -> executions, when tracked (query budgets / N+1 detection).
+    statements: Optional[Counter] = None
+    # Enclosing scope (e.g. the request around a ``query_budget`` block).
+    parent: Optional["QueryStats"] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        stats: Optional[QueryStats] = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+            if stats.statements is not None:
+                stats.statements[statement] += 1
+            stats = stats.parent
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("savemo_query_stats", default=None)
+
+
+def begin_query_stats(track_statements: bool = False) -> "tuple[QueryStats, Token]":
+    """
+    Start accounting queries for the current request (or a block nested in it);
+    pass the token to ``end_query_stats``.
+    """
+    stats = QueryStats(statements=Counter() if track_statements else None, parent=_current.get())
+    return stats, _current.set(stats)
+
+
+def end_query_stats(token: Token) -> None:
+    _current.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def instrument_queries(engine: Engine, name: str) -> None:
+    """Time every statement run on ``engine`` (use ``AsyncEngine.sync_engine`` for async)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._savemo_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_savemo_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        DB_QUERIES.inc(engine=name)
+        DB_QUERY_DURATION.observe(elapsed, engine=name)
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
@@ -0,0 +1,312 @@
+"""
+Read replica routing.
+
+GET routes that only read take ``get_read_db`` (``get_async_read_db``)
+instead of ``get_db``. Each such session goes to the next replica in
+round-robin order among those whose lag is within ``REPLICA_MAX_LAG_SECONDS``,
+and to the primary when
+- no replica is that fresh (or none answered the last lag check while
+  streaming from the primary), or
+- the caller wrote less than ``REPLICA_STICKY_SECONDS`` ago
+  (read-your-writes). Keep it above ``REPLICA_MAX_LAG_SECONDS``.
+
+The caller is the bearer token's subject. A commit of a ``get_db`` session
+that wrote marks it in this worker and, through ``pg_notify`` in the same
+transaction, in every other worker (received by the permission listener
+connection). Each worker polls replica lag in ``ReplicaLagMonitor``.
+
+Check a setup with ``python -m app.db.replicas``: it prints every replica's
+lag and whether it would be used.
+"""
+
+import itertools
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import jwt
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "savemo_user_wrote"
+
+# Session.info keys.
+READ_ONLY = "read_only"
+WRITER_KEY = "read_your_writes_key"
+_WROTE = "read_your_writes_pending"
+
+# Seconds behind the primary; 0 when the server is not a standby. NULL
+# (unusable) unless the WAL receiver is streaming: a disconnected standby has
+# replayed everything it received and would otherwise report no lag.
+# Reading pg_stat_wal_receiver.status needs pg_read_all_stats (pg_monitor).
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+READ_ROUTING = metrics.counter(
+    "savemo_db_read_routing_total",
+    "Read-only sessions by where they were routed (replica, primary_sticky, primary_lagging).",
+    ["route"],
+)
+REPLICA_LAG = metrics.gauge(
+    "savemo_db_replica_lag_seconds",
+    "Replication lag at the last check (-1: replica unreachable or not streaming).",
+    ["replica"],
+)
+
+
+def replica_name(index: int) -> str:
+    return f"replica{index}"
+
+
+class ReplicaRouter:
+    """Per-worker replica choice and read-your-writes window."""
+
+    def __init__(
+        self,
+        replicas: int,
+        max_lag_seconds: float,
+        sticky_seconds: float,
+        max_sticky_entries: int,
+    ) -> None:
+        self.max_lag_seconds = max_lag_seconds
+        self.sticky_seconds = sticky_seconds
+        self.max_sticky_entries = max_sticky_entries
+        # None until a replica's lag is known, and while it is unreachable.
+        self._lags: List[Optional[float]] = [None] * replicas
+        self._next = itertools.count()
+        self._sticky: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._lags)
+
+    def set_lag(self, index: int, lag: Optional[float]) -> None:
+        self._lags[index] = lag
+        REPLICA_LAG.set(-1 if lag is None else lag, replica=replica_name(index))
+
+    def is_fresh(self, index: int) -> bool:
+        lag = self._lags[index]
+        return lag is not None and lag <= self.max_lag_seconds
+
+    def pick(self, key: Optional[str]) -> Optional[int]:
+        """Index of the replica to read from, or None for the primary."""
+        if not self._lags:
+            return None
+        if key is not None and self.is_sticky(key):
+            READ_ROUTING.inc(route="primary_sticky")
+            return None
+        count = len(self._lags)
+        start = next(self._next)
+        for offset in range(count):
+            index = (start + offset) % count
+            if self.is_fresh(index):
+                READ_ROUTING.inc(route="replica")
+                return index
+        READ_ROUTING.inc(route="primary_lagging")
+        return None
+
+    def mark_written(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._sticky[key] = now + self.sticky_seconds
+            self._sticky.move_to_end(key)
+            # Deadlines are in insertion order: expired ones are at the front.
+            while self._sticky and (
+                len(self._sticky) > self.max_sticky_entries
+                or next(iter(self._sticky.values())) <= now
+            ):
+                self._sticky.popitem(last=False)
+
+    def is_sticky(self, key: str) -> bool:
+        deadline = self._sticky.get(key)
+        return deadline is not None and deadline > time.monotonic()
+
+    def status(self) -> List[Dict[str, object]]:
+        return [
+            {"name": replica_name(index), "lag_seconds": lag, "in_use": self.is_fresh(index)}
+            for index, lag in enumerate(self._lags)
+        ]
+
+
+replica_router = ReplicaRouter(
+    replicas=len(settings.DATABASE_REPLICA_URLS),
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=settings.REPLICA_STICKY_SECONDS,
+    max_sticky_entries=settings.REPLICA_STICKY_MAX_ENTRIES,
+)
+
+
+def request_user_key(request: Request) -> Optional[str]:
+    """
+    Subject of the request's bearer token, unverified: it only picks where to
+    read from, and authentication checks the token anyway.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        subject = jwt.decode(token, options={"verify_signature": False}).get("sub")
+    except jwt.PyJWTError:
+        return None
+    return str(subject) if subject else None
+
+
+def replica_lag_seconds(engine: Engine) -> Optional[float]:
+    with engine.connect() as conn:
+        if engine.dialect.name != "postgresql":
+            return 0.0
+        lag = conn.execute(LAG_QUERY).scalar()
+    return None if lag is None else float(lag)
+
+
+# ---------------------------------------------------------------------------
+# Read-your-writes: remember who wrote, on commit
+# ---------------------------------------------------------------------------
+
+
+def _check_writable(session: Session) -> None:
+    if session.info.get(READ_ONLY):
+        raise RuntimeError("Write on a read-only session; use get_db for routes that write")
+
+
+def _record_write(session: Session) -> None:
+    if session.info.get(WRITER_KEY) is not None:
+        session.info[_WROTE] = True
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, flush_context, instances) -> None:
+    _check_writable(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    _record_write(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(orm_execute_state) -> None:
+    # Core INSERT/UPDATE/DELETE through the session (bulk paths) skip the flush.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _check_writable(orm_execute_state.session)
+        _record_write(orm_execute_state.session)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_on_commit(session: Session) -> None:
+    if session.info.get(_WROTE) and session.get_bind().dialect.name == "postgresql":
+        # NOTIFY is transactional: other workers only see it after COMMIT.
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": session.info[WRITER_KEY]},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_on_commit(session: Session) -> None:
+    if session.info.pop(_WROTE, False):
+        replica_router.mark_written(session.info[WRITER_KEY])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop(_WROTE, None)
+
+
+# ---------------------------------------------------------------------------
+# Lag monitor
+# ---------------------------------------------------------------------------
+
+
+class ReplicaLagMonitor:
+    """Background thread that checks every replica's lag."""
+
+    def __init__(
+        self,
+        engines: Sequence[Engine],
+        router: ReplicaRouter = replica_router,
+        interval_seconds: float = settings.REPLICA_LAG_CHECK_SECONDS,
+    ) -> None:
+        self.engines = engines
+        self.router = router
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if not self.engines or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="replica-lag-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 5)
+            self._thread = None
+
+    def check(self) -> None:
+        for index, engine in enumerate(self.engines):
+            try:
+                lag = replica_lag_seconds(engine)
+            except Exception as exc:
+                if self.router.is_fresh(index):
+                    logger.warning(
+                        "%s unreachable (%s); reading from the primary", replica_name(index), exc
+                    )
+                lag = None
+            else:
+                if lag is None and self.router.is_fresh(index):
+                    logger.warning(
+                        "%s is not streaming from the primary; reading from the primary",
+                        replica_name(index),
+                    )
+            self.router.set_lag(index, lag)
+
+    def _run(self) -> None:
+        # Replicas are skipped until their first check.
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval_seconds)
+
+
+def main() -> int:
+    from app.db.session import get_replica_engines
+
+    engines = get_replica_engines()
+    if not engines:
+        print("DATABASE_REPLICA_URLS is empty: every read goes to the primary")
+        return 1
+    ReplicaLagMonitor(engines).check()
+    for engine, replica in zip(engines, replica_router.status()):
+        lag = replica["lag_seconds"]
+        state = "in use" if replica["in_use"] else "skipped (primary instead)"
+        shown = "unreachable or not streaming" if lag is None else f"{lag:.3f}s"
+        print(f"{replica['name']}  {engine.url.render_as_string(hide_password=True)}  lag {shown}  {state}")
+    print(f"max lag {settings.REPLICA_MAX_LAG_SECONDS}s, sticky window {settings.REPLICA_STICKY_SECONDS}s")
+    return 0 if any(r["in_use"] for r in replica_router.status()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
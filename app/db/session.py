@@ -1,18 +1,126 @@
+from functools import lru_cache
+from typing import Tuple
+
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_pool,
+    pool_options,
+)
+from app.db.query_stats import instrument_queries
+from app.db.replicas import (
+    READ_ONLY,
+    WRITER_KEY,
+    replica_name,
+    replica_router,
+    request_user_key,
+)
+
+
+@lru_cache
+def get_engine() -> Engine:
+    # Created on first use (lifespan startup at the latest), so importing the
+    # app loads no DB driver and opens nothing: faster worker cold starts, and
+    # build steps such as the OpenAPI export need no database settings.
+    engine = create_engine(
+        settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_options()
+    )
+    instrument_pool(engine, "primary")
+    instrument_queries(engine, "primary")
+    return engine
+
+
+@lru_cache
+def get_replica_engines() -> Tuple[Engine, ...]:
+    engines = []
+    for index, url in enumerate(settings.DATABASE_REPLICA_URLS):
+        engine = create_engine(url, poolclass=InstrumentedQueuePool, **pool_options())
+        instrument_pool(engine, replica_name(index))
+        instrument_queries(engine, replica_name(index))
+        engines.append(engine)
+    return tuple(engines)
+
 
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _session_info(request: Request) -> dict:
+    # With replicas, commits that wrote pin the caller to the primary for a while.
+    if replica_router.enabled:
+        return {WRITER_KEY: request_user_key(request)}
+    return {}
+
+
+def get_db(request: Request):
+    db = SessionLocal(bind=get_engine(), info=_session_info(request))
+    try:
+        yield db
+    finally:
+        db.close()
 
 
-def get_db():
-    db = SessionLocal()
+def get_read_db(request: Request):
+    """
+    Session for routes that only read (flushing or executing a write raises):
+    on a replica when one is fresh enough for the caller, else the primary.
+    """
+    index = replica_router.pick(request_user_key(request)) if replica_router.enabled else None
+    engine = get_engine() if index is None else get_replica_engines()[index]
+    db = SessionLocal(bind=engine, info={READ_ONLY: True})
     try:
         yield db
     finally:
         db.close()
 
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    # Created on first use so the sync stack does not require asyncpg.
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **pool_options(),
+    )
+    instrument_pool(async_engine.sync_engine, "primary_async")
+    instrument_queries(async_engine.sync_engine, "primary_async")
+    return async_engine
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        get_async_engine(), autoflush=False, expire_on_commit=False
+    )
+
+
+@lru_cache
+def get_async_replica_engines() -> Tuple[AsyncEngine, ...]:
+    engines = []
+    for index, url in enumerate(settings.async_replica_urls):
+        engine = create_async_engine(
+            url, poolclass=InstrumentedAsyncAdaptedQueuePool, **pool_options()
+        )
+        instrument_pool(engine.sync_engine, f"{replica_name(index)}_async")
+        instrument_queries(engine.sync_engine, f"{replica_name(index)}_async")
+        engines.append(engine)
+    return tuple(engines)
+
+
+async def get_async_db(request: Request):
+    async with get_async_sessionmaker()(info=_session_info(request)) as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    """AsyncSession version of ``get_read_db``."""
+    index = replica_router.pick(request_user_key(request)) if replica_router.enabled else None
+    engine = get_async_engine() if index is None else get_async_replica_engines()[index]
+    async with get_async_sessionmaker()(bind=engine, info={READ_ONLY: True}) as db:
+        yield db
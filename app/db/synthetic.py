@@ -0,0 +1,344 @@
+"""
+Deterministic synthetic datasets for performance work.
+
+    python -m app.db.synthetic --users 1000000 [--groups N] [--seed 1]
+        [--memberships-per-user 2] [--assignments-per-user 1] [--output-dir DIR]
+
+Generates users, a group hierarchy (with its ``group_closure`` rows), group
+memberships (some exited), clients, roles with permission sets and
+group-scoped role assignments with ``starts_at``/``ends_at`` windows (some
+expired, some not yet active), plus a few platform-wide assignments.
+
+Rows are streamed straight into ``COPY ... FROM STDIN`` in one transaction:
+nothing is built through the ORM and no table is held in memory, so a
+million users load in minutes. Every user shares one bcrypt hash of
+``--password``, computed once. The same ``--seed`` and sizes always produce
+the same ids, emails, hierarchy and timestamps, so datasets can be rebuilt
+for comparable runs. Ids, emails, group codes and role names include the
+seed and phone numbers ``seed % 1000``, so datasets whose seeds differ
+modulo 1000 can share a database.
+
+Needs ``DATABASE_URL`` to point at a Postgres database migrated to head that
+does not already hold a synthetic dataset with the same ``--seed``. With
+``--output-dir`` the tables are written as CSV files with a header row
+instead, e.g. to load elsewhere with
+``\\copy users FROM users.csv WITH (FORMAT csv, HEADER)``.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.acl import PERMISSION_ALL, PERMISSION_BITS
+from app.core.security import get_password_hash
+from app.db.copy import CsvStream, Row, copy_sql
+from app.db.session import get_engine
+from app.models.user import User
+
+EPOCH = datetime(2024, 1, 1)
+SPAN = timedelta(days=730)
+
+# Load order (foreign keys) and the columns each generator yields.
+COLUMNS = {
+    "users": (
+        "id", "email", "phone", "full_name", "hashed_password",
+        "is_active", "is_superuser", "created_at", "updated_at",
+    ),
+    "groups": (
+        "id", "name", "code", "description", "status", "parent_group_id",
+        "created_at", "updated_at",
+    ),
+    "group_closure": ("ancestor_id", "descendant_id", "depth"),
+    "group_memberships": ("id", "user_id", "group_id", "status", "joined_at", "exited_at"),
+    "clients": ("id", "name", "default_group_id", "created_at", "updated_at"),
+    "roles": ("id", "name", "description", "permissions", "is_system", "created_at", "updated_at"),
+    "user_role_assignments": (
+        "id", "user_id", "role_id", "scope_type", "scope_id", "starts_at", "ends_at", "created_at",
+    ),
+}
+
+
+@dataclass
+class Sizes:
+    users: int
+    groups: int
+    roots: int
+    branching: int
+    clients: int
+    roles: int
+    memberships_per_user: int
+    assignments_per_user: int
+    platform_admins: int
+
+
+def id_factory(seed: int, kind: str) -> Callable[[int], str]:
+    """Deterministic UUID text for row ``i`` of ``kind`` (a per-kind prefix plus the index)."""
+    digest = hashlib.sha256(f"{seed}:{kind}".encode()).hexdigest()
+    prefix = f"{digest[:8]}-{digest[8:12]}-4{digest[13:16]}-8{digest[17:20]}-"
+    return lambda i: f"{prefix}{i:012x}"
+
+
+def timestamp(i: int, total: int) -> datetime:
+    """Creation times spread over ``SPAN`` in index order (keyset order == id order)."""
+    return EPOCH + SPAN * (i / max(total, 1))
+
+
+class Dataset:
+    def __init__(self, sizes: Sizes, seed: int, domain: str, hashed_password: str) -> None:
+        self.sizes = sizes
+        self.seed = seed
+        self.domain = domain
+        self.hashed_password = hashed_password
+        self.user_id = id_factory(seed, "users")
+        self.group_id = id_factory(seed, "groups")
+        self.client_id = id_factory(seed, "clients")
+        self.role_id = id_factory(seed, "roles")
+        self.membership_id = id_factory(seed, "group_memberships")
+        self.assignment_id = id_factory(seed, "user_role_assignments")
+
+    def rng(self, kind: str) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}")
+
+    def parent(self, g: int) -> Optional[int]:
+        s = self.sizes
+        return None if g < s.roots else (g - s.roots) // s.branching
+
+    def pick_group(self, rng: random.Random) -> int:
+        # Skewed towards low indexes (roots and upper levels): a few large
+        # groups, a long tail of small ones.
+        return int(self.sizes.groups * rng.random() ** 2)
+
+    # -- one generator per table (see COLUMNS) --------------------------------
+
+    def users(self) -> Iterator[Row]:
+        n = self.sizes.users
+        for i in range(n):
+            created = timestamp(i, n)
+            yield (
+                self.user_id(i),
+                f"user{i:07d}.s{self.seed}@{self.domain}",
+                f"+1{self.seed % 1000:03d}{i:09d}",
+                f"Synthetic User {i}",
+                self.hashed_password,
+                i % 50 != 0,
+                False,
+                created,
+                created,
+            )
+
+    def groups(self) -> Iterator[Row]:
+        n = self.sizes.groups
+        for g in range(n):
+            parent = self.parent(g)
+            created = timestamp(g, n)
+            yield (
+                self.group_id(g),
+                f"synthetic-group-{g}",
+                f"SYN{self.seed}-{g}",
+                None,
+                "active" if (g + 1) % 97 else "suspended",
+                self.group_id(parent) if parent is not None else None,
+                created,
+                created,
+            )
+
+    def group_closure(self) -> Iterator[Row]:
+        for g in range(self.sizes.groups):
+            node, depth = g, 0
+            while node is not None:
+                yield (self.group_id(node), self.group_id(g), depth)
+                node, depth = self.parent(node), depth + 1
+
+    def group_memberships(self) -> Iterator[Row]:
+        rng = self.rng("group_memberships")
+        n, k = self.sizes.users, self.sizes.memberships_per_user
+        row = 0
+        for i in range(n):
+            joined = timestamp(i, n)
+            for g in sorted({self.pick_group(rng) for _ in range(k)}):
+                exited = None
+                if rng.random() < 0.1:
+                    exited = joined + timedelta(days=rng.randint(1, 365))
+                yield (
+                    self.membership_id(row),
+                    self.user_id(i),
+                    self.group_id(g),
+                    "active" if exited is None else "suspended",
+                    joined,
+                    exited,
+                )
+                row += 1
+
+    def clients(self) -> Iterator[Row]:
+        n = self.sizes.clients
+        for c in range(n):
+            created = timestamp(c, n)
+            yield (
+                self.client_id(c),
+                f"Synthetic Client {c}",
+                # One root group per client (roots are reused if there are fewer).
+                self.group_id(c % self.sizes.roots),
+                created,
+                created,
+            )
+
+    def roles(self) -> Iterator[Row]:
+        rng = self.rng("roles")
+        codes = [code for code in PERMISSION_BITS if code != PERMISSION_ALL]
+        n = self.sizes.roles
+        for r in range(n):
+            if r == 0:
+                permissions = ["system.admin"]
+            elif r == 1:
+                permissions = ["group.view"]
+            else:
+                permissions = sorted(rng.sample(codes, rng.randint(1, 5)))
+            created = timestamp(r, n)
+            yield (
+                self.role_id(r),
+                f"synthetic-role-{self.seed}-{r}",
+                None,
+                json.dumps(permissions),
+                False,
+                created,
+                created,
+            )
+
+    def user_role_assignments(self) -> Iterator[Row]:
+        rng = self.rng("user_role_assignments")
+        s = self.sizes
+        now = EPOCH + SPAN
+        row = 0
+        for i in range(s.platform_admins):
+            platform = ("platform", None, None, None, EPOCH)
+            yield (self.assignment_id(row), self.user_id(i), self.role_id(0), *platform)
+            row += 1
+        for i in range(s.users):
+            for _ in range(s.assignments_per_user):
+                starts = ends = None
+                window = rng.random()
+                if window < 0.2:  # expired
+                    starts = now - timedelta(days=rng.randint(60, 365))
+                    ends = starts + timedelta(days=rng.randint(1, 59))
+                elif window < 0.25:  # not active yet
+                    starts = now + timedelta(days=rng.randint(1, 90))
+                elif window < 0.5:  # active, ends in the future
+                    starts = now - timedelta(days=rng.randint(1, 365))
+                    ends = now + timedelta(days=rng.randint(1, 365))
+                role = 1 + int((s.roles - 1) * rng.random() ** 3) if s.roles > 1 else 0
+                yield (
+                    self.assignment_id(row),
+                    self.user_id(i),
+                    self.role_id(role),
+                    "group",
+                    self.group_id(self.pick_group(rng)),
+                    starts,
+                    ends,
+                    timestamp(i, s.users),
+                )
+                row += 1
+
+    def tables(self) -> List[Tuple[str, Callable[[], Iterator[Row]]]]:
+        return [(table, getattr(self, table)) for table in COLUMNS]
+
+
+def load(dataset: Dataset) -> None:
+    raw = get_engine().raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            cursor.execute("SET LOCAL synchronous_commit = off")
+            for table, rows in dataset.tables():
+                started = time.perf_counter()
+                stream = CsvStream(rows())
+                cursor.copy_expert(copy_sql(table, COLUMNS[table]), stream)
+                _report(table, stream.rows, time.perf_counter() - started)
+            for table in COLUMNS:
+                cursor.execute(f"ANALYZE {table}")
+        raw.commit()
+    except BaseException:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
+def write_csv(dataset: Dataset, directory: Path) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for table, rows in dataset.tables():
+        started = time.perf_counter()
+        stream = CsvStream(rows())
+        with open(directory / f"{table}.csv", "w", newline="") as out:
+            out.write(",".join(COLUMNS[table]) + "\n")
+            while data := stream.read(1 << 20):
+                out.write(data)
+        _report(table, stream.rows, time.perf_counter() - started)
+
+
+def _report(table: str, rows: int, seconds: float) -> None:
+    rate = rows / seconds if seconds else 0
+    print(f"{table:<22} {rows:>11,} rows {seconds:>8.1f}s {rate:>11,.0f} rows/s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--groups", type=int, help="default: users / 50")
+    parser.add_argument("--roots", type=int, help="top-level groups (default: groups / 1000)")
+    parser.add_argument("--branching", type=int, default=8, help="children per group")
+    parser.add_argument("--clients", type=int, help="default: one per top-level group")
+    parser.add_argument("--roles", type=int, default=20)
+    parser.add_argument("--memberships-per-user", type=int, default=2)
+    parser.add_argument("--assignments-per-user", type=int, default=1)
+    parser.add_argument("--platform-admins", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--domain", default="synthetic.example.com", help="user email domain")
+    parser.add_argument("--password", default="synthetic-password", help="password of every user")
+    parser.add_argument("--output-dir", type=Path, help="write CSV files instead of loading")
+    args = parser.parse_args(argv)
+
+    groups = args.groups or max(args.users // 50, 1)
+    roots = min(args.roots or max(groups // 1000, 1), groups)
+    sizes = Sizes(
+        users=args.users,
+        groups=groups,
+        roots=roots,
+        branching=max(args.branching, 1),
+        clients=args.clients if args.clients is not None else roots,
+        roles=max(args.roles, 2),
+        memberships_per_user=args.memberships_per_user,
+        assignments_per_user=args.assignments_per_user,
+        platform_admins=min(args.platform_admins, args.users),
+    )
+    dataset = Dataset(sizes, args.seed, args.domain, get_password_hash(args.password))
+
+    started = time.perf_counter()
+    if args.output_dir is not None:
+        write_csv(dataset, args.output_dir)
+    else:
+        engine = get_engine()
+        if engine.dialect.name != "postgresql":
+            print(
+                "loading synthetic data needs a PostgreSQL DATABASE_URL (or use --output-dir)",
+                file=sys.stderr,
+            )
+            return 2
+        with engine.connect() as connection:
+            if connection.execute(select(User.id).where(User.id == dataset.user_id(0))).first():
+                print(f"a dataset with seed {args.seed} is already loaded", file=sys.stderr)
+                return 1
+        load(dataset)
+    print(f"done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""Small helpers shared by services that write with Core statements."""
+
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def utcnow() -> datetime:
+    """Naive UTC, like the model timestamps (``DateTime`` columns without a time zone)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def insert_for(db: Session, table: Any):
+    """
+    ``INSERT`` for the session's dialect, with ``on_conflict_do_nothing`` /
+    ``on_conflict_do_update`` and ``returning`` available (Postgres and SQLite).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Upserts are not supported on {dialect}")
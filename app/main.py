@@ -1,8 +1,67 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.observability import RequestMetricsMiddleware, metrics_endpoint
+from app.api.openapi import use_prebuilt_schema
 from app.core.config import settings
+from app.core.hashing import bulk_hash_pool, password_hash_pool
+from app.core.permission_cache import PermissionChangeListener
+from app.core.refresh_tokens import NOTIFY_CHANNEL as REFRESH_TOKENS_CHANNEL
+from app.core.refresh_tokens import RefreshTokenMaintenance, refresh_token_store
 from app.api.v1 import api_router
+from app.db.replicas import NOTIFY_CHANNEL as USER_WROTE_CHANNEL
+from app.db.replicas import ReplicaLagMonitor, replica_router
+from app.db.session import (
+    get_async_engine,
+    get_async_replica_engines,
+    get_engine,
+    get_replica_engines,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engines are created here, not at import (see app.db.session).
+    engine = get_engine()
+    replicas = get_replica_engines()
+    if settings.DB_ASYNC:
+        get_async_engine()
+        get_async_replica_engines()
+
+    # Each worker listens for permission changes and refresh token revocations
+    # committed by any other worker (Postgres only).
+    listener = PermissionChangeListener(engine)
+    # Builds the revoked refresh token filter, then keeps it fresh.
+    maintenance = RefreshTokenMaintenance(engine)
+    listener.subscribe(
+        REFRESH_TOKENS_CHANNEL,
+        refresh_token_store.apply_notification,
+        on_connect=maintenance.request_rebuild,
+    )
+    # Read-your-writes across workers, and replica lag for routing reads.
+    lag_monitor = ReplicaLagMonitor(replicas)
+    if replicas:
+        listener.subscribe(USER_WROTE_CHANNEL, replica_router.mark_written)
+    listener.start()
+    maintenance.start()
+    lag_monitor.start()
+    try:
+        yield
+    finally:
+        lag_monitor.stop()
+        maintenance.stop()
+        listener.stop()
+        password_hash_pool.shutdown()
+        bulk_hash_pool.shutdown()
+        engine.dispose()
+        for replica in replicas:
+            replica.dispose()
+        if settings.DB_ASYNC:
+            await get_async_engine().dispose()
+            for async_replica in get_async_replica_engines():
+                await async_replica.dispose()
 
 
 def create_application() -> FastAPI:
@@ -10,6 +69,7 @@ def create_application() -> FastAPI:
         title="Save Mo Finance API",
         version="0.1.0",
         description="Backend API for the Save Mo Finance platform.",
+        lifespan=lifespan,
     )
 
     # Open CORS for now (allow all origins). Tighten this in production.
@@ -19,12 +79,21 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "Link"],
     )
 
+    # Outermost, so latency includes the other middleware.
+    app.add_middleware(RequestMetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
     app.include_router(api_router, prefix="/api/v1")
+    if settings.METRICS_ENABLED:
+        app.add_api_route(
+            settings.METRICS_PATH, metrics_endpoint, methods=["GET"], include_in_schema=False
+        )
+    if settings.OPENAPI_PREBUILT_PATH:
+        use_prebuilt_schema(app, settings.OPENAPI_PREBUILT_PATH)
 
     return app
 
 
 app = create_application()
-
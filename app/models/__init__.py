@@ -1,8 +1,11 @@
 from app.db.base import Base  # noqa: F401
 
 from .user import User  # noqa: F401
-from .role import Role, UserRoleAssignment  # noqa: F401
-from .group import Group, GroupMembership  # noqa: F401
+from .role import PermissionVersion, Role, UserRoleAssignment  # noqa: F401
+from .group import Group, GroupClosure, GroupMembership  # noqa: F401
 from .client import Client  # noqa: F401
+from .token import RefreshTokenRevocation  # noqa: F401
 
 
+from .wallet import LedgerEntry, LedgerTransaction, Wallet, WalletHold  # noqa: F401
+from .goal import ContributionSchedule, SavingsGoal  # noqa: F401
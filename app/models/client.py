@@ -2,7 +2,7 @@ from datetime import datetime
 import uuid
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, LargeBinary, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, LargeBinary, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,13 +11,20 @@ from app.db.base import Base
 
 class Client(Base):
     __tablename__ = "clients"
+    __table_args__ = (Index("ix_clients_created_at_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     name: Mapped[str] = mapped_column(String(255), index=True)
     tagline: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    logo: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    # Deferred: only the logo endpoints read the bytes (in chunks).
+    logo: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary, nullable=True, deferred=True
+    )
+    logo_content_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    logo_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    logo_sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     primary_color: Mapped[Optional[str]] = mapped_column(String(7), nullable=True)
     secondary_color: Mapped[Optional[str]] = mapped_column(String(7), nullable=True)
 
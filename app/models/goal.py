@@ -0,0 +1,102 @@
+import uuid
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    CheckConstraint,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SavingsGoal(Base):
+    """
+    A group goal (``group_id``; every active member contributes, also those of
+    subgroups with ``include_subgroups``) or a personal goal (``user_id``).
+
+    Each member pays ``contribution_amount`` every period, or, without it,
+    their share of ``target_amount`` split over their periods (personal goals).
+    Amounts are integers in the currency's minor unit.
+
+    Periods are numbered over the goal's grid of due dates, generated from
+    ``start_date`` with the frequency. Adjusting the goal keeps the periods
+    due before ``schedule_cut_date`` and renumbers the rest from
+    ``schedule_cut_period`` (see ``app.services.contribution_schedules``).
+    """
+
+    __tablename__ = "savings_goals"
+    __table_args__ = (
+        Index("ix_savings_goals_group_id", "group_id"),
+        Index("ix_savings_goals_user_id", "user_id"),
+        CheckConstraint(
+            "(group_id IS NULL) <> (user_id IS NULL)", name="ck_savings_goals_one_owner"
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    group_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), nullable=True
+    )
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True
+    )
+    name: Mapped[str] = mapped_column(String(255))
+    description: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    currency: Mapped[str] = mapped_column(String(3))
+
+    target_amount: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    contribution_amount: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    # daily, weekly, biweekly, monthly, quarterly, yearly or custom (interval_days).
+    frequency: Mapped[str] = mapped_column(String(16))
+    interval_days: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    start_date: Mapped[date] = mapped_column(Date)
+    end_date: Mapped[date] = mapped_column(Date)
+    include_subgroups: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    # planned, active, paused, completed or cancelled.
+    status: Mapped[str] = mapped_column(String(16), default="active")
+
+    schedule_cut_date: Mapped[date] = mapped_column(Date)
+    schedule_cut_period: Mapped[int] = mapped_column(Integer, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class ContributionSchedule(Base):
+    """What a member owes a goal for one period. Rows are bulk-written by the schedule engine."""
+
+    __tablename__ = "contribution_schedules"
+    __table_args__ = (
+        # "My obligations": a user's dues across goals in a date range.
+        Index("ix_contribution_schedules_user_due_date", "user_id", "due_date"),
+    )
+
+    # Primary key order serves "does this member have future rows" per goal.
+    goal_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("savings_goals.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    period: Mapped[int] = mapped_column(Integer, primary_key=True)
+    due_date: Mapped[date] = mapped_column(Date)
+    amount: Mapped[int] = mapped_column(BigInteger)
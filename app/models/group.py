@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,12 +11,18 @@ from app.db.base import Base
 
 class Group(Base):
     __tablename__ = "groups"
+    __table_args__ = (
+        # Keyset pagination: (created_at, id), optionally under a parent/status filter.
+        Index("ix_groups_created_at_id", "created_at", "id"),
+        Index("ix_groups_parent_created_at_id", "parent_group_id", "created_at", "id"),
+        Index("ix_groups_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     name: Mapped[str] = mapped_column(String(255), index=True)
-    code: Mapped[Optional[str]] = mapped_column(String(50), unique=True, index=True)
+    code: Mapped[Optional[str]] = mapped_column(String(50), unique=True)
     description: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
     status: Mapped[str] = mapped_column(String(32), default="active")
@@ -42,9 +48,23 @@ class Group(Base):
 
 class GroupMembership(Base):
     __tablename__ = "group_memberships"
+    __table_args__ = (
+        # A user's current memberships (permission resolution, "my groups");
+        # unique, so a user is an active member of a group at most once.
+        Index(
+            "ix_group_memberships_user_group_active",
+            "user_id",
+            "group_id",
+            unique=True,
+            postgresql_where=text("exited_at IS NULL"),
+            sqlite_where=text("exited_at IS NULL"),
+        ),
+        # Members of a group; also serves the ON DELETE CASCADE from groups.
+        Index("ix_group_memberships_group_user", "group_id", "user_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE")
@@ -60,3 +80,28 @@ class GroupMembership(Base):
 
     group: Mapped["Group"] = relationship("Group", back_populates="memberships")
 
+
+class GroupClosure(Base):
+    """
+    Transitive closure of the group hierarchy: one row per (ancestor, descendant)
+    pair, including each group with itself at depth 0. Maintained by
+    ``app.services.group_hierarchy`` whenever groups are created, re-parented
+    or deleted, so subtree and ancestor lookups are single indexed queries.
+    """
+
+    __tablename__ = "group_closure"
+    __table_args__ = (
+        Index("ix_group_closure_descendant_depth", "descendant_id", "depth"),
+    )
+
+    ancestor_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("groups.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    descendant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("groups.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    depth: Mapped[int] = mapped_column(Integer, default=0)
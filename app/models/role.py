@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, String
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime, ForeignKey, Index, Sequence, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,11 +11,12 @@ from app.db.base import Base
 
 class Role(Base):
     __tablename__ = "roles"
+    __table_args__ = (Index("ix_roles_created_at_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    name: Mapped[str] = mapped_column(String(100), unique=True, index=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True)
     description: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     permissions: Mapped[list[str]] = mapped_column(JSON, default=list)
     is_system: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -32,9 +33,15 @@ class Role(Base):
 
 class UserRoleAssignment(Base):
     __tablename__ = "user_role_assignments"
+    __table_args__ = (
+        # Permission resolution: a user's assignments within one scope.
+        Index("ix_user_role_assignments_user_scope", "user_id", "scope_type", "scope_id"),
+        # ON DELETE CASCADE from roles.
+        Index("ix_user_role_assignments_role_id", "role_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE")
@@ -57,3 +64,25 @@ class UserRoleAssignment(Base):
     user: Mapped["User"] = relationship("User", back_populates="role_assignments")
     role: Mapped["Role"] = relationship("Role", back_populates="assignments")
 
+
+# Permission versions are drawn from this sequence so every worker and every
+# access token agrees on their order, whatever the clocks say.
+permission_version_seq = Sequence("permission_version_seq", metadata=Base.metadata)
+
+
+class PermissionVersion(Base):
+    """
+    Latest permissions version per scope: one row per user whose roles,
+    assignments or account changed, plus the global row (all zeros id) that
+    role changes bump. See ``app.core.permission_cache``.
+    """
+
+    __tablename__ = "permission_versions"
+    __table_args__ = (
+        # Listener (re)connect: changes recent enough to matter for live tokens.
+        Index("ix_permission_versions_changed_at", "changed_at"),
+    )
+
+    scope_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RefreshTokenRevocation(Base):
+    """
+    Refresh tokens that may no longer be used (see ``app.core.refresh_tokens``).
+
+    ``token_id`` depends on ``kind``: the ``jti`` of a rotated-away token
+    ("used"), a token family id ("family": logout, reuse detected) or a user
+    id ("user": every token issued up to ``revoked_at``). Rows are swept once
+    ``expires_at`` has passed, i.e. when no token they apply to is valid.
+    """
+
+    __tablename__ = "refresh_token_revocations"
+    __table_args__ = (
+        # Batched sweep of expired rows.
+        Index("ix_refresh_token_revocations_expires_at", "expires_at"),
+        # Bloom filter rebuild: live family/user rows only, not the used jtis.
+        Index("ix_refresh_token_revocations_kind_expires_at", "kind", "expires_at"),
+    )
+
+    token_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(16))
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
+    revoked_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
@@ -13,10 +13,10 @@ class User(Base):
     __tablename__ = "users"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
-    phone: Mapped[Optional[str]] = mapped_column(String(32), unique=True, index=True, nullable=True)
+    email: Mapped[str] = mapped_column(String(255), unique=True)
+    phone: Mapped[Optional[str]] = mapped_column(String(32), unique=True, nullable=True)
     full_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     hashed_password: Mapped[str] = mapped_column(String(255))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
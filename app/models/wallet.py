@@ -0,0 +1,149 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class Wallet(Base):
+    """
+    An account of the ledger (see ``app.services.ledger``). Amounts are
+    integers in the currency's minor unit.
+
+    ``balance`` and ``held`` are a snapshot kept up to date by every posting
+    and hold in the same transaction, so reading a balance never sums
+    ``ledger_entries``. ``sequence`` counts the wallet's entries; each entry
+    records the value it got, which makes a wallet's history gapless.
+
+    ``owner_type`` is "user", "group" or "pool" (a group's pooled fund), with
+    ``owner_id`` the user or group. "external" wallets (one per currency,
+    no owner) are the counterparty of top-ups and withdrawals: they are not
+    snapshotted, so they never become a lock hot spot.
+    """
+
+    __tablename__ = "wallets"
+    __table_args__ = (
+        # One wallet per owner and currency; also serves "wallets of X".
+        Index(
+            "ix_wallets_owner_currency",
+            "owner_type",
+            "owner_id",
+            "currency",
+            unique=True,
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    owner_type: Mapped[str] = mapped_column(String(16))
+    owner_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    currency: Mapped[str] = mapped_column(String(3))
+
+    balance: Mapped[int] = mapped_column(BigInteger, default=0)
+    held: Mapped[int] = mapped_column(BigInteger, default=0)
+    # Lowest balance - held a debit or hold may leave (negative: overdraft).
+    min_balance: Mapped[int] = mapped_column(BigInteger, default=0)
+    sequence: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    @property
+    def available(self) -> int:
+        return self.balance - self.held
+
+
+class LedgerTransaction(Base):
+    """
+    One balanced posting: its ``ledger_entries`` sum to zero. ``reference``
+    is the caller's idempotency key; retrying with it returns the original.
+    Append-only, like the entries.
+    """
+
+    __tablename__ = "ledger_transactions"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    reference: Mapped[str] = mapped_column(String(64), unique=True)
+    # "credit", "debit", "transfer" or "capture" (of a hold).
+    kind: Mapped[str] = mapped_column(String(16))
+    amount: Mapped[int] = mapped_column(BigInteger)
+    currency: Mapped[str] = mapped_column(String(3))
+    description: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_by: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class LedgerEntry(Base):
+    """
+    One leg of a ``LedgerTransaction``: positive amounts credit the wallet,
+    negative ones debit it. ``sequence`` and ``balance_after`` are the
+    wallet's values right after the entry (NULL on external wallets).
+    """
+
+    __tablename__ = "ledger_entries"
+    __table_args__ = (
+        # Wallet history, newest first; unique so two postings can never
+        # both apply on top of the same snapshot.
+        Index("ix_ledger_entries_wallet_sequence", "wallet_id", "sequence", unique=True),
+        Index("ix_ledger_entries_transaction_id", "transaction_id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    transaction_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("ledger_transactions.id")
+    )
+    wallet_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("wallets.id"))
+    amount: Mapped[int] = mapped_column(BigInteger)
+    sequence: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    balance_after: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class WalletHold(Base):
+    """
+    Funds reserved on a wallet (counted in ``Wallet.held``) until the hold is
+    captured, which posts a "capture" transaction, or released.
+    """
+
+    __tablename__ = "wallet_holds"
+    __table_args__ = (
+        Index("ix_wallet_holds_wallet_status", "wallet_id", "status"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    wallet_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("wallets.id"))
+    amount: Mapped[int] = mapped_column(BigInteger)
+    currency: Mapped[str] = mapped_column(String(3))
+    reference: Mapped[str] = mapped_column(String(64), unique=True)
+    # "active", "captured" or "released".
+    status: Mapped[str] = mapped_column(String(16), default="active")
+    description: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    transaction_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("ledger_transactions.id"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    resolved_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+def _append_only(mapper, connection, target) -> None:
+    # Corrections are new (reversing) postings. Postgres enforces the same
+    # with a trigger (migration 0008) for Core statements too.
+    raise RuntimeError(f"{type(target).__name__} rows are append-only")
+
+
+for _model in (LedgerTransaction, LedgerEntry):
+    event.listen(_model, "before_update", _append_only)
+    event.listen(_model, "before_delete", _append_only)
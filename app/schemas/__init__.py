@@ -1,6 +1,17 @@
-from .user import UserCreate, UserRead  # noqa: F401
+from .user import BulkUserCreate, BulkUserResult, UserCreate, UserRead  # noqa: F401
 from .auth import Token, LoginRequest  # noqa: F401
-from .group import GroupCreate, GroupRead  # noqa: F401
+from .group import GroupCreate, GroupRead, GroupTreeNode, GroupUpdate  # noqa: F401
 from .client import ClientCreate, ClientRead  # noqa: F401
 from .role import RoleCreate, RoleRead  # noqa: F401
-
+from .membership import MembershipImportResult  # noqa: F401
+from .wallet import (  # noqa: F401
+    HoldCapture,
+    HoldRead,
+    PostingRead,
+    WalletCreate,
+    WalletEntryRead,
+    WalletPosting,
+    WalletRead,
+    WalletTransfer,
+)
+from .goal import GoalCreate, GoalRead, GoalUpdate, ObligationRead, ScheduleRead  # noqa: F401
@@ -18,6 +18,8 @@ class ClientCreate(ClientBase):
 class ClientRead(ClientBase):
     id: UUID
     default_group_id: UUID
+    # Content hash of the logo; use as ``?v=`` on /clients/{id}/logo for immutable caching.
+    logo_sha256: str | None = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,95 @@
+from datetime import date, datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.schemas.wallet import Currency
+
+Frequency = Literal["daily", "weekly", "biweekly", "monthly", "quarterly", "yearly", "custom"]
+# Amounts are integers in the currency's minor unit.
+OptionalAmount = Field(None, gt=0, le=10**15)
+GoalStatus = Literal["planned", "active", "paused", "completed", "cancelled"]
+
+
+class GoalCreate(BaseModel):
+    # A group goal (every active member contributes); omit for a personal goal.
+    group_id: Optional[UUID] = None
+    name: str = Field(min_length=1, max_length=255)
+    description: Optional[str] = Field(None, max_length=255)
+    currency: str = Currency
+    target_amount: Optional[int] = OptionalAmount
+    # Per member and period; personal goals may give only target_amount instead.
+    contribution_amount: Optional[int] = OptionalAmount
+    frequency: Frequency = "monthly"
+    # Days between due dates for the "custom" frequency.
+    interval_days: Optional[int] = Field(None, ge=1, le=3660)
+    start_date: date
+    end_date: date
+    include_subgroups: bool = True
+    status: GoalStatus = "active"
+
+
+class GoalUpdate(BaseModel):
+    """Changes apply from the first period due today on; earlier periods are kept."""
+
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = Field(None, max_length=255)
+    target_amount: Optional[int] = OptionalAmount
+    contribution_amount: Optional[int] = OptionalAmount
+    frequency: Optional[Frequency] = None
+    interval_days: Optional[int] = Field(None, ge=1, le=3660)
+    end_date: Optional[date] = None
+    include_subgroups: Optional[bool] = None
+    status: Optional[GoalStatus] = None
+
+    @field_validator("name", "frequency", "end_date", "include_subgroups", "status")
+    @classmethod
+    def _not_null(cls, value):
+        # Omit these to keep them; the columns cannot be null.
+        if value is None:
+            raise ValueError("may not be null")
+        return value
+
+
+class GoalRead(BaseModel):
+    id: UUID
+    group_id: Optional[UUID]
+    user_id: Optional[UUID]
+    name: str
+    description: Optional[str]
+    currency: str
+    target_amount: Optional[int]
+    contribution_amount: Optional[int]
+    frequency: str
+    interval_days: Optional[int]
+    start_date: date
+    end_date: date
+    include_subgroups: bool
+    status: str
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ScheduleRead(BaseModel):
+    period: int
+    due_date: date
+    amount: int
+
+    class Config:
+        from_attributes = True
+
+
+class ObligationRead(BaseModel):
+    goal_id: UUID
+    goal_name: str
+    currency: str
+    period: int
+    due_date: date
+    amount: int
+
+    class Config:
+        from_attributes = True
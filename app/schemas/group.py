@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 
 class GroupBase(BaseModel):
@@ -21,3 +21,25 @@ class GroupRead(GroupBase):
     class Config:
         from_attributes = True
 
+
+class GroupUpdate(BaseModel):
+    """Partial update; send ``parent_group_id: null`` to make the group a root."""
+
+    name: str | None = None
+    code: str | None = None
+    description: str | None = None
+    status: str | None = None
+    parent_group_id: UUID | None = None
+
+    @field_validator("name", "status")
+    @classmethod
+    def _not_null(cls, value):
+        # Omit these to keep them; the columns cannot be null.
+        if value is None:
+            raise ValueError("may not be null")
+        return value
+
+
+class GroupTreeNode(GroupRead):
+    # Distance from the group the query was made for.
+    depth: int
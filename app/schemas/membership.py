@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+
+
+class MembershipImportError(BaseModel):
+    line: int
+    identifier: str
+    error: str
+
+    class Config:
+        from_attributes = True
+
+
+class MembershipImportResult(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    # Capped at MEMBER_IMPORT_MAX_ERRORS; ``errors_truncated`` tells if more were dropped.
+    errors: list[MembershipImportError]
+    errors_truncated: bool
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,8 @@
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+
+from app.core.config import settings
 
 
 class UserBase(BaseModel):
@@ -32,3 +34,21 @@ class UserMeRead(UserBase):
     class Config:
         from_attributes = True
 
+
+class BulkUserCreate(BaseModel):
+    # Checked before any record is validated, so oversized requests fail fast.
+    users: list[UserCreate] = Field(max_length=settings.BULK_PROVISION_MAX_USERS)
+
+
+class BulkUserItemResult(BaseModel):
+    index: int
+    email: str
+    status: str  # "created" or "error"
+    id: UUID | None = None
+    error: str | None = None
+
+
+class BulkUserResult(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkUserItemResult]
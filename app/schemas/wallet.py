@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+# Amounts are integers in the currency's minor unit (e.g. cents).
+Amount = Field(gt=0, le=10**15)
+Currency = Field(pattern=r"^[A-Z]{3}$", description="ISO 4217 code.")
+# Client-chosen idempotency key: retrying with the same reference is safe.
+Reference = Field(min_length=1, max_length=64)
+
+
+class WalletCreate(BaseModel):
+    owner_type: Literal["user", "group", "pool"]
+    owner_id: UUID
+    currency: str = Currency
+    # Lowest available balance debits may leave; negative allows an overdraft.
+    min_balance: int = 0
+
+
+class WalletRead(BaseModel):
+    id: UUID
+    owner_type: str
+    owner_id: UUID
+    currency: str
+    balance: int
+    held: int
+    available: int
+    min_balance: int
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class WalletPosting(BaseModel):
+    amount: int = Amount
+    reference: str = Reference
+    description: str | None = Field(None, max_length=255)
+
+
+class WalletTransfer(WalletPosting):
+    to_wallet_id: UUID
+
+
+class HoldCapture(BaseModel):
+    # Default: the funds leave the platform (like a debit).
+    to_wallet_id: UUID | None = None
+
+
+class LedgerLegRead(BaseModel):
+    wallet_id: UUID
+    amount: int
+    # The wallet's entry number and balance after this leg; null on external wallets.
+    sequence: int | None
+    balance_after: int | None
+
+    class Config:
+        from_attributes = True
+
+
+class PostingRead(BaseModel):
+    id: UUID
+    reference: str
+    kind: str
+    amount: int
+    currency: str
+    description: str | None
+    created_at: datetime
+    entries: list[LedgerLegRead]
+
+    class Config:
+        from_attributes = True
+
+
+class WalletEntryRead(BaseModel):
+    transaction_id: UUID
+    kind: str
+    reference: str
+    description: str | None
+    amount: int
+    sequence: int
+    balance_after: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class HoldRead(BaseModel):
+    id: UUID
+    wallet_id: UUID
+    amount: int
+    currency: str
+    reference: str
+    status: str
+    description: str | None
+    transaction_id: UUID | None
+    created_at: datetime
+    resolved_at: datetime | None
+
+    class Config:
+        from_attributes = True
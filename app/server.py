@@ -0,0 +1,137 @@
+"""
+Production server entrypoint.
+
+    python -m app.server [--workers N] [--host 0.0.0.0] [--port 8000]
+
+Runs uvicorn with one worker process per available CPU (``WEB_CONCURRENCY``
+overrides), under uvicorn's supervisor, which restarts workers that exit:
+- Workers are spawned, not forked, and import the app themselves. The
+  supervisor never imports it, and engines and pools are created in each
+  worker's lifespan, so no connection is shared across processes.
+- SIGTERM drains: workers stop accepting connections, finish in-flight
+  requests for up to ``GRACEFUL_SHUTDOWN_SECONDS``, then run the lifespan
+  shutdown, which closes their pools.
+- ``WORKER_MAX_REQUESTS`` recycles a worker after that many requests (plus
+  up to ``WORKER_MAX_REQUESTS_JITTER``, so workers do not restart together).
+- With ``DB_CONNECTION_BUDGET`` (the connections this instance may hold in
+  total, e.g. its share of Postgres ``max_connections``), the per-worker
+  ``DB_POOL_SIZE``/``DB_MAX_OVERFLOW`` are computed so that all workers
+  together stay within it. The result is passed to the workers through the
+  environment.
+- Unless ``PASSWORD_HASH_PROCESSES`` is set, each worker's bulk hashing
+  process pool gets its share of the CPUs (available CPUs // workers), so
+  the pools of all workers together do not oversubscribe the machine.
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import settings
+from app.core.cpus import available_cpus
+
+logger = logging.getLogger(__name__)
+
+APP = "app.main:app"
+
+
+@dataclass
+class PoolSizing:
+    pool_size: int
+    max_overflow: int
+
+    @property
+    def env(self) -> Dict[str, str]:
+        return {"DB_POOL_SIZE": str(self.pool_size), "DB_MAX_OVERFLOW": str(self.max_overflow)}
+
+
+def worker_pool_sizing(budget: int, workers: int) -> PoolSizing:
+    """
+    Split a connection budget across workers and their engines.
+
+    Each worker runs the sync engine and, with ``DB_ASYNC``, the async engine
+    (both use the same pool settings), plus one dedicated connection for the
+    change listener (permissions, refresh token revocations) on Postgres. The
+    configured ``DB_POOL_SIZE``:``DB_MAX_OVERFLOW`` ratio is kept.
+    """
+    per_worker = budget // workers
+    if settings.DATABASE_URL.startswith("postgresql"):
+        per_worker -= 1
+    per_engine = per_worker // (2 if settings.DB_ASYNC else 1)
+    if per_engine < 1:
+        raise ValueError(f"DB_CONNECTION_BUDGET={budget} is too small for {workers} workers")
+    configured = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    pool_size = round(per_engine * settings.DB_POOL_SIZE / configured) if configured else per_engine
+    pool_size = min(max(pool_size, 1), per_engine)
+    return PoolSizing(pool_size=pool_size, max_overflow=per_engine - pool_size)
+
+
+class RecyclingServer(uvicorn.Server):
+    """``uvicorn.Server`` that jitters ``limit_max_requests`` in each worker."""
+
+    def __init__(self, config: uvicorn.Config, jitter: int = 0) -> None:
+        super().__init__(config)
+        self.jitter = jitter
+
+    def run(self, sockets=None) -> None:
+        # Runs in the worker process, so every worker draws its own limit.
+        if self.config.limit_max_requests and self.jitter:
+            self.config.limit_max_requests += random.randint(0, self.jitter)
+        super().run(sockets=sockets)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the API with multiple worker processes.")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+    workers = max(args.workers or available_cpus(), 1)
+    if not settings.PASSWORD_HASH_PROCESSES:
+        os.environ["PASSWORD_HASH_PROCESSES"] = str(max(1, available_cpus() // workers))
+
+    if settings.DB_CONNECTION_BUDGET:
+        try:
+            sizing = worker_pool_sizing(settings.DB_CONNECTION_BUDGET, workers)
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        # Spawned workers read their settings from the environment.
+        os.environ.update(sizing.env)
+        logger.info(
+            "%d workers, pool_size=%d max_overflow=%d per engine (budget %d connections)",
+            workers,
+            sizing.pool_size,
+            sizing.max_overflow,
+            settings.DB_CONNECTION_BUDGET,
+        )
+    else:
+        logger.info("%d workers", workers)
+
+    config = uvicorn.Config(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
+        limit_max_requests=settings.WORKER_MAX_REQUESTS or None,
+    )
+    server = RecyclingServer(config, jitter=settings.WORKER_MAX_REQUESTS_JITTER)
+    if workers == 1:
+        server.run()
+    else:
+        Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
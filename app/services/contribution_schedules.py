@@ -0,0 +1,380 @@
+"""
+Contribution schedules of savings goals, materialised in ``contribution_schedules``.
+
+Schedules are computed for all members of a goal at once by
+``app.services.schedule_engine`` (NumPy, imported on first use so it stays
+off the cold-start path) and bulk-written: ``COPY`` on psycopg2, multi-row
+INSERT batches of ``SCHEDULE_INSERT_BATCH_SIZE`` elsewhere.
+
+- Creating a goal writes every eligible member's schedule.
+- Adjusting a goal only rewrites the tail: rows from the first period due
+  today on are deleted and recomputed with the new terms; earlier rows are
+  history and stay as they were.
+- Membership changes are incremental. Mapper events note the groups and
+  users whose memberships were inserted, changed or deleted in a flush (and
+  the groups moved in the hierarchy); after the flush, only the goals
+  covering those groups are synced for those users: eligible members
+  without future rows get them, owed from when they joined, and members who
+  left lose theirs. Core bulk inserts bypass mapper events, so callers of
+  those run ``sync_members`` themselves (``membership_import`` does).
+
+Importing this module registers the events.
+"""
+
+import uuid
+from datetime import date, datetime, timezone
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Select, and_, delete, event, exists, func, insert, inspect, or_, select
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.db.copy import CsvStream, copy_sql
+from app.models.goal import ContributionSchedule, SavingsGoal
+from app.models.group import Group, GroupMembership
+from app.services.group_hierarchy import closure, subtree_ids_query
+
+ACTIVE_STATUSES = ("planned", "active")
+GOAL_STATUSES = (*ACTIVE_STATUSES, "paused", "completed", "cancelled")
+SCHEDULE_COLUMNS = ("goal_id", "user_id", "period", "due_date", "amount")
+
+# session.info key: {group_id: user ids to sync, or None for every member}.
+_PENDING_KEY = "contribution_schedule_sync"
+
+Member = Tuple[uuid.UUID, date]
+
+
+class GoalError(ValueError):
+    """Raised for goal definitions or changes that cannot produce a schedule."""
+
+
+def _engine():
+    from app.services import schedule_engine
+
+    return schedule_engine
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def goal_grid(goal: SavingsGoal):
+    """The goal's current grid: periods due from its last adjustment on."""
+    engine = _engine()
+    try:
+        dates = engine.due_dates(
+            goal.start_date, goal.end_date, goal.frequency, goal.interval_days
+        )
+    except ValueError as exc:
+        raise GoalError(str(exc)) from exc
+    return engine.grid(dates, goal.schedule_cut_date, goal.schedule_cut_period)
+
+
+def validate_goal(goal: SavingsGoal) -> None:
+    if (goal.group_id is None) == (goal.user_id is None):
+        raise GoalError("A goal belongs to either a group or a user")
+    if goal.end_date < goal.start_date:
+        raise GoalError("end_date is before start_date")
+    if goal.status not in GOAL_STATUSES:
+        raise GoalError(f"Unknown status '{goal.status}'")
+    if goal.frequency not in _engine().FREQUENCIES:
+        raise GoalError(f"Unknown frequency '{goal.frequency}'")
+    if goal.contribution_amount is None:
+        if goal.group_id is not None:
+            raise GoalError("Group goals need a contribution_amount")
+        if goal.target_amount is None:
+            raise GoalError("Personal goals need a contribution_amount or a target_amount")
+    if goal.schedule_cut_period + goal_grid(goal).dates.size > settings.GOAL_MAX_PERIODS:
+        raise GoalError(
+            f"The goal would have more than {settings.GOAL_MAX_PERIODS} periods"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Members
+# ---------------------------------------------------------------------------
+
+
+def eligible_members_query(goal: SavingsGoal) -> Select:
+    """(user_id, joined_at) of the active members a group goal covers."""
+    if goal.include_subgroups:
+        in_scope = GroupMembership.group_id.in_(subtree_ids_query(goal.group_id))
+    else:
+        in_scope = GroupMembership.group_id == goal.group_id
+    return (
+        select(GroupMembership.user_id, func.min(GroupMembership.joined_at).label("joined_at"))
+        .where(
+            in_scope,
+            GroupMembership.status == "active",
+            GroupMembership.exited_at.is_(None),
+        )
+        .group_by(GroupMembership.user_id)
+    )
+
+
+def _members(db: Session, goal: SavingsGoal) -> List[Member]:
+    if goal.user_id is not None:
+        return [(goal.user_id, goal.start_date)]
+    return [(user_id, joined.date()) for user_id, joined in db.execute(eligible_members_query(goal))]
+
+
+def covering_goals_query(group_ids: Iterable[uuid.UUID]) -> Select:
+    """Active group goals whose members include members of any of ``group_ids``."""
+    group_ids = list(group_ids)
+    ancestors = select(closure.c.ancestor_id).where(closure.c.descendant_id.in_(group_ids))
+    return select(SavingsGoal).where(
+        SavingsGoal.status.in_(ACTIVE_STATUSES),
+        or_(
+            SavingsGoal.group_id.in_(group_ids),
+            and_(SavingsGoal.include_subgroups.is_(True), SavingsGoal.group_id.in_(ancestors)),
+        ),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Writing schedules
+# ---------------------------------------------------------------------------
+
+
+def _write(db: Session, goal: SavingsGoal, user_ids: Sequence[uuid.UUID], schedule) -> int:
+    if not len(schedule):
+        return 0
+    rows = schedule.rows(goal.id, user_ids)
+    connection = db.connection()
+    if connection.dialect.driver == "psycopg2":
+        # COPY through the session's own connection, inside its transaction.
+        with connection.connection.cursor() as cursor:
+            cursor.copy_expert(
+                copy_sql(ContributionSchedule.__tablename__, SCHEDULE_COLUMNS), CsvStream(rows)
+            )
+        return len(schedule)
+    table = ContributionSchedule.__table__
+    while True:
+        batch = [
+            dict(zip(SCHEDULE_COLUMNS, row))
+            for row in islice(rows, settings.SCHEDULE_INSERT_BATCH_SIZE)
+        ]
+        if not batch:
+            return len(schedule)
+        db.execute(insert(table), batch)
+
+
+def _build(
+    db: Session,
+    goal: SavingsGoal,
+    members: List[Member],
+    owed_since: date,
+    totals: Optional[Sequence[int]] = None,
+) -> int:
+    """Write the schedules of ``members`` over the goal's grid, owed from joining or ``owed_since``."""
+    if not members:
+        return 0
+    engine = _engine()
+    user_ids = [user_id for user_id, _ in members]
+    owed_from = [max(joined, owed_since) for _, joined in members]
+    if goal.contribution_amount is not None:
+        schedule = engine.expand(goal_grid(goal), owed_from, amount=goal.contribution_amount)
+    else:
+        schedule = engine.expand(goal_grid(goal), owed_from, totals=totals)
+    return _write(db, goal, user_ids, schedule)
+
+
+def create_goal(db: Session, **fields) -> SavingsGoal:
+    """Add a goal and every eligible member's schedule (flushed, not committed)."""
+    fields.setdefault("status", "active")
+    fields.setdefault("include_subgroups", True)
+    goal = SavingsGoal(**fields, schedule_cut_date=fields["start_date"], schedule_cut_period=0)
+    validate_goal(goal)
+    db.add(goal)
+    db.flush()
+    if goal.status in ACTIVE_STATUSES:
+        totals = None if goal.contribution_amount is not None else [goal.target_amount]
+        _build(db, goal, _members(db, goal), goal.start_date, totals)
+    return goal
+
+
+def adjust_goal(db: Session, goal: SavingsGoal, changes: Dict[str, object]) -> SavingsGoal:
+    """
+    Apply ``changes`` to the goal and recompute the tail of its schedules:
+    periods due before today are kept, the rest are replaced (or dropped if
+    the goal is no longer active).
+    """
+    cut = max(_today(), goal.start_date)
+    cut_period = goal_grid(goal).period_at(cut)
+    for name, value in changes.items():
+        setattr(goal, name, value)
+    goal.schedule_cut_date = cut
+    goal.schedule_cut_period = cut_period
+    validate_goal(goal)
+
+    db.execute(
+        delete(ContributionSchedule).where(
+            ContributionSchedule.goal_id == goal.id,
+            ContributionSchedule.period >= cut_period,
+        ).execution_options(synchronize_session=False)
+    )
+    db.flush()
+    if goal.status not in ACTIVE_STATUSES:
+        return goal
+    members = _members(db, goal)
+    totals = None
+    if goal.contribution_amount is None:
+        # What is left of the target after the periods already due.
+        paid = dict(
+            db.execute(
+                select(ContributionSchedule.user_id, func.sum(ContributionSchedule.amount))
+                .where(ContributionSchedule.goal_id == goal.id)
+                .group_by(ContributionSchedule.user_id)
+            ).all()
+        )
+        totals = [goal.target_amount - int(paid.get(user_id) or 0) for user_id, _ in members]
+    _build(db, goal, members, cut, totals)
+    return goal
+
+
+def sync_members(
+    db: Session,
+    group_ids: Iterable[uuid.UUID],
+    user_ids: Optional[Iterable[uuid.UUID]] = None,
+) -> int:
+    """
+    Bring the future schedules of the goals covering ``group_ids`` in line
+    with membership, for ``user_ids`` (every member when None). Returns the
+    number of rows written.
+    """
+    group_ids = list(group_ids)
+    if not group_ids:
+        return 0
+    users = None if user_ids is None else list(user_ids)
+    written = 0
+    for goal in db.scalars(covering_goals_query(group_ids)).all():
+        written += _sync_goal(db, goal, users)
+    return written
+
+
+def _sync_goal(db: Session, goal: SavingsGoal, user_ids: Optional[List[uuid.UUID]]) -> int:
+    today = _today()
+    since = max(today, goal.schedule_cut_date)
+    next_period = goal_grid(goal).period_at(since)
+    eligible = eligible_members_query(goal).subquery()
+    future = and_(
+        ContributionSchedule.goal_id == goal.id, ContributionSchedule.period >= next_period
+    )
+
+    # Members who left (or whose group moved out of the goal's scope).
+    gone = delete(ContributionSchedule).where(
+        future, ContributionSchedule.user_id.not_in(select(eligible.c.user_id))
+    )
+    if user_ids is not None:
+        gone = gone.where(ContributionSchedule.user_id.in_(user_ids))
+    db.execute(gone.execution_options(synchronize_session=False))
+
+    # Eligible members without future rows: they owe from joining (or today).
+    missing = select(eligible.c.user_id, eligible.c.joined_at).where(
+        ~exists().where(future, ContributionSchedule.user_id == eligible.c.user_id)
+    )
+    if user_ids is not None:
+        missing = missing.where(eligible.c.user_id.in_(user_ids))
+    members = [(user_id, joined.date()) for user_id, joined in db.execute(missing)]
+    return _build(db, goal, members, since)
+
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+
+def _note(session: Optional[Session], group_id: uuid.UUID, user_id: Optional[uuid.UUID]) -> None:
+    if session is None or group_id is None:
+        return
+    pending: Dict[uuid.UUID, Optional[Set[uuid.UUID]]] = session.info.setdefault(_PENDING_KEY, {})
+    if user_id is None:
+        pending[group_id] = None
+    elif group_id not in pending:
+        pending[group_id] = {user_id}
+    elif pending[group_id] is not None:
+        pending[group_id].add(user_id)
+
+
+@event.listens_for(GroupMembership, "after_insert")
+@event.listens_for(GroupMembership, "after_delete")
+def _on_membership_change(mapper, connection, target: GroupMembership) -> None:
+    _note(object_session(target), target.group_id, target.user_id)
+
+
+@event.listens_for(GroupMembership, "after_update")
+def _on_membership_update(mapper, connection, target: GroupMembership) -> None:
+    attrs = inspect(target).attrs
+    if not any(
+        attrs[name].history.has_changes() for name in ("status", "exited_at", "joined_at", "group_id")
+    ):
+        return
+    session = object_session(target)
+    _note(session, target.group_id, target.user_id)
+    for old_group in attrs.group_id.history.deleted:
+        _note(session, old_group, target.user_id)
+
+
+@event.listens_for(Group, "before_update")
+def _on_group_move(mapper, connection, target: Group) -> None:
+    if not inspect(target).attrs.parent_group_id.history.has_changes():
+        return
+    # Goals above the old and the new parent gain or lose the whole subtree.
+    # The old ancestors are read from the closure before the move rewrites
+    # it; the attribute history has no old value once it was expired.
+    session = object_session(target)
+    old_ancestors = connection.scalars(
+        select(closure.c.ancestor_id).where(
+            closure.c.descendant_id == target.id, closure.c.depth > 0
+        )
+    )
+    for group_id in (*old_ancestors, target.parent_group_id):
+        _note(session, group_id, None)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _sync_after_flush(session: Session, flush_context) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    everyone = [group_id for group_id, users in pending.items() if users is None]
+    some = {group_id: users for group_id, users in pending.items() if users is not None}
+    if everyone:
+        sync_members(session, everyone)
+    if some:
+        sync_members(session, some, set().union(*some.values()))
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+
+def member_schedule_query(goal_id: uuid.UUID, user_id: uuid.UUID) -> Select:
+    return (
+        select(ContributionSchedule)
+        .where(ContributionSchedule.goal_id == goal_id, ContributionSchedule.user_id == user_id)
+        .order_by(ContributionSchedule.period)
+    )
+
+
+def obligations_query(user_id: uuid.UUID, from_date: date, to_date: date) -> Select:
+    """A user's dues across all goals between two dates (inclusive), soonest first."""
+    return (
+        select(
+            ContributionSchedule.goal_id,
+            SavingsGoal.name.label("goal_name"),
+            SavingsGoal.currency,
+            ContributionSchedule.period,
+            ContributionSchedule.due_date,
+            ContributionSchedule.amount,
+        )
+        .join(SavingsGoal, SavingsGoal.id == ContributionSchedule.goal_id)
+        .where(
+            ContributionSchedule.user_id == user_id,
+            ContributionSchedule.due_date >= from_date,
+            ContributionSchedule.due_date <= to_date,
+        )
+        .order_by(ContributionSchedule.due_date, ContributionSchedule.goal_id)
+    )
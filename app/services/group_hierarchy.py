@@ -0,0 +1,162 @@
+"""
+Group hierarchy backed by the ``group_closure`` table.
+
+Mapper events keep the closure consistent with ``Group.parent_group_id``
+inside the same flush/transaction:
+- insert: copy the parent's ancestor rows (+1 depth) and add the self row;
+- re-parent: detach the subtree from its old ancestors and attach it under
+  the new parent's ancestors (rejecting cycles);
+- delete: detach the subtree (children become roots, matching the
+  ``ON DELETE SET NULL`` on ``parent_group_id``).
+
+On Postgres each of these first takes a transaction-level advisory lock
+(``lock_hierarchy``), so concurrent moves cannot both pass the cycle check
+and together create a cycle, and a subgroup created under a group being
+moved copies its parent's ancestors after the move.
+
+Importing this module registers the events.
+"""
+
+import uuid
+from typing import Iterable, Optional
+
+from sqlalchemy import Select, delete, event, exists, insert, inspect, select, text, true
+from sqlalchemy.engine import Connection
+
+from app.models.group import Group, GroupClosure
+
+closure = GroupClosure.__table__
+
+# Serialises hierarchy changes across transactions (Postgres only).
+_HIERARCHY_LOCK_KEY = 0x6A0C_0012
+
+
+class GroupHierarchyError(ValueError):
+    """Raised when a change would make the hierarchy inconsistent (e.g. a cycle)."""
+
+
+def lock_hierarchy(connection: Connection) -> None:
+    """Hold the hierarchy lock until the transaction ends (a no-op outside Postgres)."""
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": _HIERARCHY_LOCK_KEY}
+        )
+
+
+def _attach(connection: Connection, group_id: uuid.UUID, parent_id: uuid.UUID) -> None:
+    """Link the subtree rooted at ``group_id`` under every ancestor of ``parent_id``."""
+    above = closure.alias("above")
+    below = closure.alias("below")
+    connection.execute(
+        insert(closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(
+                above.c.ancestor_id,
+                below.c.descendant_id,
+                above.c.depth + below.c.depth + 1,
+            )
+            # Intentional cross join: every ancestor of the parent x every node of the subtree.
+            .select_from(above.join(below, true()))
+            .where(above.c.descendant_id == parent_id, below.c.ancestor_id == group_id),
+        )
+    )
+
+
+def _detach(connection: Connection, group_id: uuid.UUID) -> None:
+    """Remove links between the subtree rooted at ``group_id`` and that group's ancestors."""
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == group_id)
+    ancestors = select(closure.c.ancestor_id).where(
+        closure.c.descendant_id == group_id, closure.c.ancestor_id != group_id
+    )
+    connection.execute(
+        delete(closure).where(
+            closure.c.descendant_id.in_(subtree), closure.c.ancestor_id.in_(ancestors)
+        )
+    )
+
+
+@event.listens_for(Group, "after_insert")
+def _on_group_insert(mapper, connection: Connection, target: Group) -> None:
+    connection.execute(
+        insert(closure).values(ancestor_id=target.id, descendant_id=target.id, depth=0)
+    )
+    if target.parent_group_id is not None:
+        lock_hierarchy(connection)
+        _attach(connection, target.id, target.parent_group_id)
+
+
+@event.listens_for(Group, "after_update")
+def _on_group_update(mapper, connection: Connection, target: Group) -> None:
+    history = inspect(target).attrs.parent_group_id.history
+    if not history.has_changes():
+        return
+    lock_hierarchy(connection)
+    new_parent = target.parent_group_id
+    if new_parent is not None and connection.execute(
+        in_subtree_query(target.id, new_parent)
+    ).scalar():
+        raise GroupHierarchyError("A group cannot be moved under itself or its descendants")
+    _detach(connection, target.id)
+    if new_parent is not None:
+        _attach(connection, target.id, new_parent)
+
+
+@event.listens_for(Group, "before_delete")
+def _on_group_delete(mapper, connection: Connection, target: Group) -> None:
+    # The group's own rows go with ON DELETE CASCADE; its descendants must also
+    # lose the links to the group's ancestors.
+    lock_hierarchy(connection)
+    _detach(connection, target.id)
+
+
+# ---------------------------------------------------------------------------
+# Queries (single indexed statements; usable from Session and AsyncSession)
+# ---------------------------------------------------------------------------
+
+
+def in_subtree_query(root_id: uuid.UUID, group_id: uuid.UUID) -> Select:
+    """``SELECT EXISTS`` whether ``group_id`` is ``root_id`` or under it (cycle pre-check)."""
+    return select(
+        exists().where(closure.c.ancestor_id == root_id, closure.c.descendant_id == group_id)
+    )
+
+
+def descendants_query(
+    group_id: uuid.UUID, max_depth: Optional[int] = None, include_self: bool = False
+) -> Select:
+    """Groups under ``group_id`` with their depth relative to it, shallowest first."""
+    stmt = (
+        select(Group, GroupClosure.depth)
+        .join(GroupClosure, GroupClosure.descendant_id == Group.id)
+        .where(GroupClosure.ancestor_id == group_id)
+    )
+    if not include_self:
+        stmt = stmt.where(GroupClosure.depth > 0)
+    if max_depth is not None:
+        stmt = stmt.where(GroupClosure.depth <= max_depth)
+    return stmt.order_by(GroupClosure.depth, Group.name, Group.id)
+
+
+def ancestors_query(group_id: uuid.UUID) -> Select:
+    """Path from the root down to the parent of ``group_id`` (depth = distance up)."""
+    return (
+        select(Group, GroupClosure.depth)
+        .join(GroupClosure, GroupClosure.ancestor_id == Group.id)
+        .where(GroupClosure.descendant_id == group_id, GroupClosure.depth > 0)
+        .order_by(GroupClosure.depth.desc())
+    )
+
+
+def subtree_ids_query(group_id: uuid.UUID) -> Select:
+    """Ids of ``group_id`` and everything under it, for use in ``IN (...)`` filters."""
+    return select(closure.c.descendant_id).where(closure.c.ancestor_id == group_id)
+
+
+def subtrees_ids_query(root_ids: Iterable[uuid.UUID]) -> Select:
+    """Ids of every group in the union of the subtrees rooted at ``root_ids``."""
+    return select(closure.c.descendant_id).where(closure.c.ancestor_id.in_(list(root_ids)))
+
+
+def ancestor_ids_query(group_id: uuid.UUID) -> Select:
+    """Ids of ``group_id`` and all its ancestors."""
+    return select(closure.c.ancestor_id).where(closure.c.descendant_id == group_id)
@@ -0,0 +1,577 @@
+"""
+Double-entry wallet ledger.
+
+Every posting is a ``LedgerTransaction`` whose ``LedgerEntry`` legs sum to
+zero; entries are never updated or deleted (corrections are new postings).
+Each leg also moves its wallet's balance snapshot, in the same transaction,
+with one conditional statement:
+
+    UPDATE wallets SET balance = balance + :amount, sequence = sequence + 1
+    WHERE id = :id [AND balance - held + :amount >= min_balance]
+    RETURNING sequence, balance
+
+- The row lock that UPDATE takes serialises postings per wallet; other
+  wallets are not blocked (no table lock), and the lock is held only from
+  the UPDATE to COMMIT, so keep the caller's transaction short.
+- The funds check and the write are one statement: Postgres re-evaluates the
+  WHERE on the latest row version after waiting for the lock, so concurrent
+  debits can neither overdraw the wallet nor overwrite each other's balance.
+- Legs are applied in wallet id order, so opposite transfers cannot deadlock.
+  Holds are always locked before wallets for the same reason.
+
+``reference`` is an idempotency key: the transaction row is inserted first
+with ``ON CONFLICT DO NOTHING``, and a retry returns the original posting.
+
+External wallets (one per currency) are the counterparty of top-ups and
+withdrawals. Their snapshot is not maintained, because every top-up would
+otherwise queue on that single row; their balance is minus the sum of all
+others. ``audit`` checks the invariants against the full history.
+
+Functions here never commit: the caller commits, or rolls back on
+``LedgerError``.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.utils import insert_for, utcnow
+from app.models.group import Group
+from app.models.user import User
+from app.models.wallet import LedgerEntry, LedgerTransaction, Wallet, WalletHold
+
+EXTERNAL = "external"
+# Owner types and the table their owner_id refers to.
+OWNER_MODELS = {"user": User, "group": Group, "pool": Group}
+
+# Namespace of the deterministic external wallet ids (uuid5 of the currency).
+_EXTERNAL_NAMESPACE = uuid.UUID("7d0b1a52-3f6e-4f43-9c1e-5a0c2b8e6d14")
+
+
+class LedgerError(ValueError):
+    """A posting, hold or wallet change was rejected; roll back the transaction."""
+
+
+class WalletNotFound(LedgerError):
+    pass
+
+
+class OwnerNotFound(LedgerError):
+    pass
+
+
+class WalletExists(LedgerError):
+    pass
+
+
+class HoldNotFound(LedgerError):
+    pass
+
+
+class InsufficientFunds(LedgerError):
+    pass
+
+
+class CurrencyMismatch(LedgerError):
+    pass
+
+
+class InvalidPosting(LedgerError):
+    pass
+
+
+class ReferenceConflict(LedgerError):
+    """The reference was already used for a different posting or hold."""
+
+
+class HoldNotActive(LedgerError):
+    pass
+
+
+@dataclass
+class Leg:
+    wallet_id: uuid.UUID
+    # Positive: credit, negative: debit.
+    amount: int
+    # Reject the posting unless balance - held + amount >= min_balance.
+    check_funds: bool = False
+    # Reserved funds the leg consumes (hold captures).
+    release_held: int = 0
+
+
+@dataclass
+class PostedEntry:
+    wallet_id: uuid.UUID
+    amount: int
+    sequence: Optional[int]
+    balance_after: Optional[int]
+
+
+@dataclass
+class Posting:
+    id: uuid.UUID
+    reference: str
+    kind: str
+    amount: int
+    currency: str
+    description: Optional[str]
+    created_at: datetime
+    entries: List[PostedEntry] = field(default_factory=list)
+    # True when ``reference`` had already been posted and nothing changed.
+    replayed: bool = False
+
+
+def external_wallet_id(currency: str) -> uuid.UUID:
+    return uuid.uuid5(_EXTERNAL_NAMESPACE, currency)
+
+
+# ---------------------------------------------------------------------------
+# Wallets
+# ---------------------------------------------------------------------------
+
+
+def create_wallet(
+    db: Session,
+    owner_type: str,
+    owner_id: uuid.UUID,
+    currency: str,
+    min_balance: int = 0,
+) -> Wallet:
+    """Open a wallet (and, on first use of the currency, its external wallet)."""
+    model = OWNER_MODELS[owner_type]
+    if db.scalar(select(model.id).where(model.id == owner_id)) is None:
+        raise OwnerNotFound(f"{owner_type.capitalize()} not found")
+    now = utcnow()
+    db.execute(
+        insert_for(db, Wallet)
+        .values(
+            id=external_wallet_id(currency),
+            owner_type=EXTERNAL,
+            owner_id=None,
+            currency=currency,
+            created_at=now,
+            updated_at=now,
+        )
+        .on_conflict_do_nothing()
+    )
+    wallet = db.scalars(
+        insert_for(db, Wallet)
+        .values(
+            id=uuid.uuid4(),
+            owner_type=owner_type,
+            owner_id=owner_id,
+            currency=currency,
+            min_balance=min_balance,
+            created_at=now,
+            updated_at=now,
+        )
+        .on_conflict_do_nothing()
+        .returning(Wallet)
+    ).first()
+    if wallet is None:
+        raise WalletExists(f"The {owner_type} already has a {currency} wallet")
+    return wallet
+
+
+def _rejection(db: Session, wallet_id: uuid.UUID, currency: str) -> LedgerError:
+    """Why a conditional wallet update matched no row."""
+    row = db.execute(
+        select(Wallet.owner_type, Wallet.currency).where(Wallet.id == wallet_id)
+    ).first()
+    if row is None or row.owner_type == EXTERNAL:
+        return WalletNotFound("Wallet not found")
+    if row.currency != currency:
+        return CurrencyMismatch(f"Wallet currency is {row.currency}, not {currency}")
+    return InsufficientFunds("Insufficient funds")
+
+
+# ---------------------------------------------------------------------------
+# Postings
+# ---------------------------------------------------------------------------
+
+
+def _apply(db: Session, leg: Leg, currency: str, now: datetime) -> PostedEntry:
+    if leg.wallet_id == external_wallet_id(currency):
+        return PostedEntry(leg.wallet_id, leg.amount, None, None)
+    stmt = (
+        update(Wallet)
+        .where(
+            Wallet.id == leg.wallet_id,
+            Wallet.currency == currency,
+            Wallet.owner_type != EXTERNAL,
+        )
+        .values(
+            balance=Wallet.balance + leg.amount,
+            held=Wallet.held - leg.release_held,
+            sequence=Wallet.sequence + 1,
+            updated_at=now,
+        )
+        .returning(Wallet.sequence, Wallet.balance)
+        .execution_options(synchronize_session=False)
+    )
+    if leg.check_funds:
+        stmt = stmt.where(Wallet.balance - Wallet.held + leg.amount >= Wallet.min_balance)
+    row = db.execute(stmt).first()
+    if row is None:
+        raise _rejection(db, leg.wallet_id, currency)
+    return PostedEntry(leg.wallet_id, leg.amount, row.sequence, row.balance)
+
+
+def load_posting(db: Session, transaction_id: uuid.UUID, replayed: bool = False) -> Posting:
+    txn = db.get(LedgerTransaction, transaction_id)
+    entries = db.execute(
+        select(
+            LedgerEntry.wallet_id,
+            LedgerEntry.amount,
+            LedgerEntry.sequence,
+            LedgerEntry.balance_after,
+        )
+        .where(LedgerEntry.transaction_id == transaction_id)
+        .order_by(LedgerEntry.amount)
+    ).all()
+    return Posting(
+        id=txn.id,
+        reference=txn.reference,
+        kind=txn.kind,
+        amount=txn.amount,
+        currency=txn.currency,
+        description=txn.description,
+        created_at=txn.created_at,
+        entries=[PostedEntry(*entry) for entry in entries],
+        replayed=replayed,
+    )
+
+
+def _replay(db: Session, reference: str, kind: str, legs: Sequence[Leg]) -> Posting:
+    transaction_id = db.scalar(
+        select(LedgerTransaction.id).where(LedgerTransaction.reference == reference)
+    )
+    posting = load_posting(db, transaction_id, replayed=True)
+    posted = sorted((entry.wallet_id, entry.amount) for entry in posting.entries)
+    if posting.kind != kind or posted != sorted((leg.wallet_id, leg.amount) for leg in legs):
+        raise ReferenceConflict("Reference already used for a different posting")
+    return posting
+
+
+def post(
+    db: Session,
+    kind: str,
+    reference: str,
+    currency: str,
+    legs: Sequence[Leg],
+    description: Optional[str] = None,
+    created_by: Optional[uuid.UUID] = None,
+) -> Posting:
+    """Record a balanced transaction and move the snapshots of its wallets."""
+    if sum(leg.amount for leg in legs) != 0:
+        raise ValueError("Ledger legs must sum to zero")
+    if len({leg.wallet_id for leg in legs}) != len(legs):
+        raise InvalidPosting("A posting cannot move funds within one wallet")
+    now = utcnow()
+    transaction_id = uuid.uuid4()
+    amount = sum(leg.amount for leg in legs if leg.amount > 0)
+    inserted = db.execute(
+        insert_for(db, LedgerTransaction)
+        .values(
+            id=transaction_id,
+            reference=reference,
+            kind=kind,
+            amount=amount,
+            currency=currency,
+            description=description,
+            created_by=created_by,
+            created_at=now,
+        )
+        .on_conflict_do_nothing()
+    ).rowcount
+    if inserted != 1:
+        return _replay(db, reference, kind, legs)
+
+    applied = {
+        leg.wallet_id: _apply(db, leg, currency, now)
+        for leg in sorted(legs, key=lambda leg: leg.wallet_id)
+    }
+    entries = [applied[leg.wallet_id] for leg in legs]
+    db.execute(
+        insert(LedgerEntry),
+        [
+            {
+                "transaction_id": transaction_id,
+                "wallet_id": entry.wallet_id,
+                "amount": entry.amount,
+                "sequence": entry.sequence,
+                "balance_after": entry.balance_after,
+                "created_at": now,
+            }
+            for entry in entries
+        ],
+    )
+    return Posting(
+        id=transaction_id,
+        reference=reference,
+        kind=kind,
+        amount=amount,
+        currency=currency,
+        description=description,
+        created_at=now,
+        entries=entries,
+    )
+
+
+def credit(
+    db: Session,
+    wallet: Wallet,
+    amount: int,
+    reference: str,
+    description: Optional[str] = None,
+    created_by: Optional[uuid.UUID] = None,
+) -> Posting:
+    """Funds entering the platform (top-up): external wallet -> ``wallet``."""
+    return post(
+        db,
+        "credit",
+        reference,
+        wallet.currency,
+        [Leg(external_wallet_id(wallet.currency), -amount), Leg(wallet.id, amount)],
+        description,
+        created_by,
+    )
+
+
+def debit(
+    db: Session,
+    wallet: Wallet,
+    amount: int,
+    reference: str,
+    description: Optional[str] = None,
+    created_by: Optional[uuid.UUID] = None,
+) -> Posting:
+    """Funds leaving the platform (withdrawal): ``wallet`` -> external wallet."""
+    return post(
+        db,
+        "debit",
+        reference,
+        wallet.currency,
+        [
+            Leg(wallet.id, -amount, check_funds=True),
+            Leg(external_wallet_id(wallet.currency), amount),
+        ],
+        description,
+        created_by,
+    )
+
+
+def transfer(
+    db: Session,
+    source: Wallet,
+    target_id: uuid.UUID,
+    amount: int,
+    reference: str,
+    description: Optional[str] = None,
+    created_by: Optional[uuid.UUID] = None,
+) -> Posting:
+    """Move funds between two wallets of the same currency."""
+    if target_id == external_wallet_id(source.currency):
+        raise WalletNotFound("Wallet not found")
+    return post(
+        db,
+        "transfer",
+        reference,
+        source.currency,
+        [Leg(source.id, -amount, check_funds=True), Leg(target_id, amount)],
+        description,
+        created_by,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Holds
+# ---------------------------------------------------------------------------
+
+
+def place_hold(
+    db: Session,
+    wallet: Wallet,
+    amount: int,
+    reference: str,
+    description: Optional[str] = None,
+) -> WalletHold:
+    """Reserve ``amount`` of the wallet's available funds."""
+    now = utcnow()
+    hold = db.scalars(
+        insert_for(db, WalletHold)
+        .values(
+            id=uuid.uuid4(),
+            wallet_id=wallet.id,
+            amount=amount,
+            currency=wallet.currency,
+            reference=reference,
+            status="active",
+            description=description,
+            created_at=now,
+        )
+        .on_conflict_do_nothing()
+        .returning(WalletHold)
+    ).first()
+    if hold is None:
+        hold = db.scalars(select(WalletHold).where(WalletHold.reference == reference)).one()
+        if hold.wallet_id != wallet.id or hold.amount != amount:
+            raise ReferenceConflict("Reference already used for a different hold")
+        return hold
+    reserved = db.execute(
+        update(Wallet)
+        .where(
+            Wallet.id == wallet.id,
+            Wallet.balance - Wallet.held - amount >= Wallet.min_balance,
+        )
+        .values(held=Wallet.held + amount, updated_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if reserved != 1:
+        raise _rejection(db, wallet.id, wallet.currency)
+    return hold
+
+
+def _resolve_hold(db: Session, wallet_id: uuid.UUID, hold_id: uuid.UUID, status: str):
+    """Move an active hold to ``status``; None if it is not active (or not found)."""
+    return db.scalars(
+        update(WalletHold)
+        .where(
+            WalletHold.id == hold_id,
+            WalletHold.wallet_id == wallet_id,
+            WalletHold.status == "active",
+        )
+        .values(status=status, resolved_at=utcnow())
+        .returning(WalletHold)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+
+def _resolved_hold(db: Session, wallet_id: uuid.UUID, hold_id: uuid.UUID) -> WalletHold:
+    hold = db.get(WalletHold, hold_id)
+    if hold is None or hold.wallet_id != wallet_id:
+        raise HoldNotFound("Hold not found")
+    return hold
+
+
+def capture_hold(
+    db: Session,
+    wallet_id: uuid.UUID,
+    hold_id: uuid.UUID,
+    target_id: Optional[uuid.UUID] = None,
+    created_by: Optional[uuid.UUID] = None,
+) -> Posting:
+    """
+    Post the held amount to ``target_id`` (default: out of the platform).
+    Capturing a captured hold again returns the original posting.
+    """
+    hold = _resolve_hold(db, wallet_id, hold_id, "captured")
+    if hold is None:
+        hold = _resolved_hold(db, wallet_id, hold_id)
+        if hold.status == "captured":
+            return load_posting(db, hold.transaction_id, replayed=True)
+        raise HoldNotActive(f"Hold is {hold.status}")
+    target_id = target_id or external_wallet_id(hold.currency)
+    posting = post(
+        db,
+        "capture",
+        f"capture:{hold.id}",
+        hold.currency,
+        [
+            Leg(hold.wallet_id, -hold.amount, release_held=hold.amount),
+            Leg(target_id, hold.amount),
+        ],
+        hold.description,
+        created_by,
+    )
+    db.execute(
+        update(WalletHold)
+        .where(WalletHold.id == hold.id)
+        .values(transaction_id=posting.id)
+        .execution_options(synchronize_session=False)
+    )
+    return posting
+
+
+def release_hold(db: Session, wallet_id: uuid.UUID, hold_id: uuid.UUID) -> WalletHold:
+    """Return the held amount to the wallet's available funds (idempotent)."""
+    hold = _resolve_hold(db, wallet_id, hold_id, "released")
+    if hold is None:
+        hold = _resolved_hold(db, wallet_id, hold_id)
+        if hold.status == "released":
+            return hold
+        raise HoldNotActive(f"Hold is {hold.status}")
+    db.execute(
+        update(Wallet)
+        .where(Wallet.id == hold.wallet_id)
+        .values(held=Wallet.held - hold.amount, updated_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    return hold
+
+
+# ---------------------------------------------------------------------------
+# Audit
+# ---------------------------------------------------------------------------
+
+
+def audit(db: Session) -> List[str]:
+    """
+    Check the ledger against its history (full scans; for benchmarks,
+    reconciliation jobs and incident response, not for requests):
+    - every transaction's entries sum to zero;
+    - every wallet's snapshot balance is the sum of its entries, and its
+      sequence the number of entries (unique per wallet, so gapless);
+    - every wallet's ``held`` is the sum of its active holds.
+    Returns one message per violation; empty when consistent.
+    """
+    problems = []
+    unbalanced = db.execute(
+        select(LedgerEntry.transaction_id, func.sum(LedgerEntry.amount))
+        .group_by(LedgerEntry.transaction_id)
+        .having(func.sum(LedgerEntry.amount) != 0)
+    )
+    for transaction_id, total in unbalanced:
+        problems.append(f"transaction {transaction_id} is unbalanced by {total}")
+
+    history = (
+        select(
+            LedgerEntry.wallet_id,
+            func.sum(LedgerEntry.amount).label("total"),
+            func.count().label("entries"),
+        )
+        .group_by(LedgerEntry.wallet_id)
+        .subquery()
+    )
+    holds = (
+        select(WalletHold.wallet_id, func.sum(WalletHold.amount).label("held"))
+        .where(WalletHold.status == "active")
+        .group_by(WalletHold.wallet_id)
+        .subquery()
+    )
+    wallets = db.execute(
+        select(
+            Wallet.id,
+            Wallet.balance,
+            Wallet.sequence,
+            Wallet.held,
+            func.coalesce(history.c.total, 0),
+            func.coalesce(history.c.entries, 0),
+            func.coalesce(holds.c.held, 0),
+        )
+        .outerjoin(history, history.c.wallet_id == Wallet.id)
+        .outerjoin(holds, holds.c.wallet_id == Wallet.id)
+        .where(Wallet.owner_type != EXTERNAL)
+    )
+    for wallet_id, balance, sequence, held, total, entries, active_held in wallets:
+        if balance != total:
+            problems.append(f"wallet {wallet_id}: balance {balance} != sum of entries {total}")
+        if sequence != entries:
+            problems.append(f"wallet {wallet_id}: sequence {sequence} != {entries} entries")
+        if held != active_held:
+            problems.append(f"wallet {wallet_id}: held {held} != active holds {active_held}")
+    return problems
@@ -0,0 +1,328 @@
+"""
+Streaming bulk import of group memberships from CSV or NDJSON.
+
+The request body is consumed as a byte stream and parsed line by line; rows
+are processed in batches of ``MEMBER_IMPORT_BATCH_SIZE``. Each batch costs
+three statements regardless of its size: resolve users by email/phone, find
+which of them are already members, and a multi-row INSERT of the rest that
+skips users who became members concurrently (the partial unique index on
+active memberships). Only the current batch, one row of at most
+``MEMBER_IMPORT_MAX_LINE_LENGTH`` characters and at most
+``MEMBER_IMPORT_MAX_ERRORS`` error entries are kept in memory, so memory use
+does not grow with the file; longer rows are rejected.
+
+CSV needs a header row and quoted fields may span lines; both formats accept
+``email``, ``phone`` and an optional ``status`` per row (one of email/phone is
+required).
+"""
+
+import codecs
+import csv
+import json
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import Session
+
+from app.db.utils import insert_for
+from app.models.group import GroupMembership
+from app.models.user import User
+from app.services.contribution_schedules import sync_members
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+
+MEMBERSHIP_STATUSES = {"pending", "active", "suspended"}
+
+
+@dataclass
+class ImportRow:
+    line: int
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    status: str = "active"
+
+    @property
+    def identifier(self) -> str:
+        return self.email or self.phone or ""
+
+
+@dataclass
+class ImportRowError:
+    line: int
+    identifier: str
+    error: str
+
+
+@dataclass
+class ImportReport:
+    max_errors: int
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = field(default_factory=list)
+    errors_truncated: bool = False
+
+    def add_error(self, line: int, identifier: str, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(ImportRowError(line, identifier, error))
+        else:
+            self.errors_truncated = True
+
+
+def detect_format(content_type: Optional[str]) -> Optional[str]:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in ("text/csv", "application/csv"):
+        return FORMAT_CSV
+    if media_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return FORMAT_NDJSON
+    return None
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_length: int
+) -> AsyncIterator[Optional[str]]:
+    """
+    Decode a UTF-8 byte stream into lines, buffering at most ``max_length``
+    characters of the current line. A longer line is discarded and yielded as
+    ``None`` so the caller can reject it; only each new chunk is scanned.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    parts: List[str] = []
+    size = 0
+    too_long = False
+    async for chunk in chunks:
+        decoded = decoder.decode(chunk)
+        start = 0
+        while True:
+            end = decoded.find("\n", start)
+            if end < 0:
+                break
+            piece = decoded[start:end]
+            if too_long or size + len(piece) > max_length:
+                yield None
+            else:
+                parts.append(piece)
+                yield "".join(parts).rstrip("\r")
+            parts, size, too_long = [], 0, False
+            start = end + 1
+        rest = decoded[start:]
+        if not too_long and size + len(rest) > max_length:
+            parts, too_long = [], True
+        elif not too_long:
+            parts.append(rest)
+            size += len(rest)
+    rest = decoder.decode(b"", final=True)
+    if too_long or size + len(rest) > max_length:
+        yield None
+    elif size or rest:
+        parts.append(rest)
+        yield "".join(parts).rstrip("\r")
+
+
+def _row_from_mapping(line: int, data: Dict[str, object]) -> ImportRow:
+    email = str(data.get("email") or "").strip() or None
+    phone = str(data.get("phone") or "").strip() or None
+    status = str(data.get("status") or "active").strip().lower()
+    return ImportRow(line=line, email=email, phone=phone, status=status)
+
+
+class _Records:
+    """
+    The input of one ``csv.reader`` that lives for the whole import. Lines are
+    queued until their quotes balance, i.e. they hold a complete record (a
+    quoted field may span lines), and only then is the reader advanced.
+    """
+
+    def __init__(self) -> None:
+        self.lines: Deque[str] = deque()
+        self.reader = csv.reader(self)
+        self.first_line = 0
+        self.size = 0
+        self.open_quote = False
+
+    def __iter__(self) -> "_Records":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+    def add(self, line_no: int, line: str) -> None:
+        if not self.lines:
+            self.first_line, self.size = line_no, 0
+        self.lines.append(line + "\n")
+        self.size += len(line) + 1
+        if line.count('"') % 2:
+            self.open_quote = not self.open_quote
+
+    def read(self) -> List[str]:
+        try:
+            return next(self.reader)
+        finally:
+            self.clear()
+
+    def clear(self) -> None:
+        self.lines.clear()
+        self.size = 0
+        self.open_quote = False
+
+
+async def iter_rows(
+    chunks: AsyncIterator[bytes], fmt: str, report: ImportReport, max_line_length: int
+) -> AsyncIterator[ImportRow]:
+    """
+    Yield parsed rows; malformed or overlong lines (and CSV records longer
+    than ``max_line_length``) are recorded on ``report`` and skipped.
+    """
+    header: Optional[List[str]] = None
+    records = _Records()
+    skipping = False
+    line_no = 0
+    too_long = f"row longer than {max_line_length} characters"
+
+    def reject(line: int, identifier: str, error: str) -> None:
+        report.total_rows += 1
+        report.add_error(line, identifier, error)
+
+    async for raw in iter_lines(chunks, max_line_length):
+        line_no += 1
+        if fmt == FORMAT_NDJSON:
+            if raw is None:
+                reject(line_no, "", too_long)
+                continue
+            if not raw.strip():
+                continue
+            report.total_rows += 1
+            try:
+                data = json.loads(raw)
+                if not isinstance(data, dict):
+                    raise ValueError
+            except ValueError:
+                report.add_error(line_no, raw[:64], "invalid JSON object")
+                continue
+            yield _row_from_mapping(line_no, data)
+            continue
+
+        if raw is None:
+            reject(records.first_line if records.lines else line_no, "", too_long)
+            records.clear()
+            skipping = False
+            continue
+        if skipping:
+            # Still inside an overlong record: drop lines until its quotes close.
+            skipping = raw.count('"') % 2 == 0
+            continue
+        if records.size + len(raw) > max_line_length:
+            reject(records.first_line if records.lines else line_no, "", too_long)
+            skipping = records.open_quote != bool(raw.count('"') % 2)
+            records.clear()
+            continue
+        if not records.lines and not raw.strip():
+            continue
+        records.add(line_no, raw)
+        if records.open_quote:
+            continue
+        first_line = records.first_line
+        try:
+            values = records.read()
+        except csv.Error:
+            reject(first_line, raw[:64], "invalid CSV line")
+            continue
+        if header is None:
+            header = [h.strip().lower() for h in values]
+            if "email" not in header and "phone" not in header:
+                report.add_error(first_line, "", "header must contain email and/or phone")
+                return
+            continue
+        report.total_rows += 1
+        yield _row_from_mapping(first_line, dict(zip(header, values)))
+
+    if records.lines:
+        reject(records.first_line, "", "unterminated quoted field")
+
+
+def import_batch(
+    db: Session, group_id: uuid.UUID, rows: List[ImportRow], report: ImportReport
+) -> None:
+    """Resolve, de-duplicate and insert one batch of rows, then commit."""
+    valid: List[ImportRow] = []
+    for row in rows:
+        if not row.email and not row.phone:
+            report.add_error(row.line, "", "email or phone is required")
+        elif row.status not in MEMBERSHIP_STATUSES:
+            report.add_error(row.line, row.identifier, f"invalid status '{row.status}'")
+        else:
+            valid.append(row)
+    if not valid:
+        return
+
+    emails = {r.email for r in valid if r.email}
+    phones = {r.phone for r in valid if r.phone}
+    conditions = []
+    if emails:
+        conditions.append(User.email.in_(emails))
+    if phones:
+        conditions.append(User.phone.in_(phones))
+    by_email: Dict[str, uuid.UUID] = {}
+    by_phone: Dict[str, uuid.UUID] = {}
+    for user_id, email, phone in db.execute(
+        select(User.id, User.email, User.phone).where(or_(*conditions))
+    ):
+        by_email[email] = user_id
+        if phone:
+            by_phone[phone] = user_id
+
+    resolved: Dict[uuid.UUID, ImportRow] = {}
+    for row in valid:
+        user_id = by_email.get(row.email) if row.email else by_phone.get(row.phone)
+        if user_id is None:
+            report.add_error(row.line, row.identifier, "user not found")
+        elif user_id in resolved:
+            report.add_error(row.line, row.identifier, "duplicate row for the same user")
+        else:
+            resolved[user_id] = row
+    if not resolved:
+        return
+
+    existing = set(
+        db.scalars(
+            select(GroupMembership.user_id).where(
+                GroupMembership.group_id == group_id,
+                GroupMembership.user_id.in_(resolved),
+                GroupMembership.exited_at.is_(None),
+            )
+        )
+    )
+    new_rows = []
+    for user_id, row in resolved.items():
+        if user_id in existing:
+            report.add_error(row.line, row.identifier, "already a member")
+        else:
+            new_rows.append(
+                {"id": uuid.uuid4(), "user_id": user_id, "group_id": group_id, "status": row.status}
+            )
+    inserted: List[uuid.UUID] = []
+    if new_rows:
+        # The partial unique index on active memberships settles races with
+        # concurrent imports: rows that lose are skipped and reported below.
+        stmt = (
+            insert_for(db, GroupMembership.__table__)
+            .on_conflict_do_nothing(
+                index_elements=["user_id", "group_id"], index_where=text("exited_at IS NULL")
+            )
+            .returning(GroupMembership.user_id)
+        )
+        inserted = list(db.scalars(stmt, new_rows))
+        for user_id in set(resolved).difference(existing, inserted):
+            row = resolved[user_id]
+            report.add_error(row.line, row.identifier, "already a member")
+        # Core inserts skip the mapper events that schedule new members' contributions.
+        sync_members(db, [group_id], inserted)
+    db.commit()
+    report.imported += len(inserted)
@@ -0,0 +1,128 @@
+"""
+Vectorised contribution schedule computation (NumPy).
+
+All members of a goal share its grid of due dates (``due_dates``); a member
+owes every grid period due on or after a given date (when they joined, or
+when the goal was adjusted). ``expand`` builds the schedule of m members
+over n periods as flat arrays, one element per (member, period) row, with
+no Python loop over members or periods, so a 10k-member goal costs a few
+array operations rather than 10k iterations.
+
+Amounts are integers in the currency's minor unit: either a fixed amount
+per period, or a per-member total split evenly over the member's periods
+(the remainder goes to the earliest ones).
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from itertools import repeat
+from typing import Any, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+DAY_STEPS = {"daily": 1, "weekly": 7, "biweekly": 14}
+MONTH_STEPS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+FREQUENCIES = (*DAY_STEPS, *MONTH_STEPS, "custom")
+
+
+@dataclass
+class Grid:
+    """Due dates (``datetime64[D]``, ascending); ``dates[i]`` is period ``first_period + i``."""
+
+    dates: np.ndarray
+    first_period: int = 0
+
+    def period_at(self, day: date) -> int:
+        """Index of the first period due on or after ``day``."""
+        return self.first_period + int(np.searchsorted(self.dates, np.datetime64(day, "D")))
+
+
+@dataclass
+class Schedule:
+    """Flat schedule rows: ``member[i]`` owes ``amount[i]`` on ``due_date[i]`` (period ``period[i]``)."""
+
+    member: np.ndarray
+    period: np.ndarray
+    due_date: np.ndarray
+    amount: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.member)
+
+    def rows(self, goal_id: Any, user_ids: Sequence[Any]) -> Iterator[Tuple]:
+        """``(goal_id, user_id, period, due_date, amount)`` tuples of Python values."""
+        users = np.asarray(user_ids, dtype=object)[self.member]
+        return zip(
+            repeat(goal_id),
+            users.tolist(),
+            self.period.tolist(),
+            self.due_date.tolist(),
+            self.amount.tolist(),
+        )
+
+
+def due_dates(
+    start: date, end: date, frequency: str, interval_days: Optional[int] = None
+) -> np.ndarray:
+    """Due dates from ``start`` to ``end`` (both inclusive)."""
+    first = np.datetime64(start, "D")
+    last = np.datetime64(end, "D")
+    if last < first:
+        return np.empty(0, dtype="datetime64[D]")
+    if frequency in MONTH_STEPS:
+        first_month = np.datetime64(start, "M")
+        span = int((np.datetime64(end, "M") - first_month).astype(int))
+        months = first_month + np.arange(0, span + 1, MONTH_STEPS[frequency])
+        month_starts = months.astype("datetime64[D]")
+        month_lengths = ((months + 1).astype("datetime64[D]") - month_starts).astype(int)
+        # Same day of the month as the start, clamped to short months (31st -> 28th).
+        dates = month_starts + (np.minimum(start.day, month_lengths) - 1)
+        return dates[dates <= last]
+    step = interval_days if frequency == "custom" else DAY_STEPS[frequency]
+    if not step or step < 1:
+        raise ValueError("custom frequency needs interval_days >= 1")
+    return np.arange(first, last + 1, np.timedelta64(step, "D"))
+
+
+def grid(dates: np.ndarray, since: date, first_period: int = 0) -> Grid:
+    """The periods of ``dates`` due on or after ``since``, numbered from ``first_period``."""
+    return Grid(dates[dates >= np.datetime64(since, "D")], first_period)
+
+
+def expand(
+    grid: Grid,
+    owed_from: Sequence[date],
+    amount: Optional[int] = None,
+    totals: Optional[Sequence[int]] = None,
+) -> Schedule:
+    """
+    Schedule rows for members who owe the periods due on or after
+    ``owed_from[m]`` (one date per member). Pass either a fixed
+    ``amount`` per period or per-member ``totals`` to amortise over the
+    member's periods.
+    """
+    owed_from = np.asarray(owed_from, dtype="datetime64[D]")
+    starts = np.searchsorted(grid.dates, owed_from, side="left")
+    counts = len(grid.dates) - starts
+    total = int(counts.sum())
+    member = np.repeat(np.arange(len(owed_from)), counts)
+    # Position of each row within its member's run: 0, 1, ..., counts[m] - 1.
+    run_starts = np.cumsum(counts) - counts
+    offset = np.arange(total) - np.repeat(run_starts, counts)
+    index = np.repeat(starts, counts) + offset
+
+    if totals is not None:
+        totals = np.maximum(np.asarray(totals, dtype=np.int64), 0)
+        periods = np.maximum(counts, 1)
+        base = np.repeat(totals // periods, counts)
+        remainder = np.repeat(totals % periods, counts)
+        amounts = base + (offset < remainder)
+    else:
+        amounts = np.full(total, amount, dtype=np.int64)
+
+    return Schedule(
+        member=member,
+        period=grid.first_period + index,
+        due_date=grid.dates[index],
+        amount=amounts.astype(np.int64),
+    )
@@ -0,0 +1,131 @@
+"""
+Bulk user provisioning.
+
+Duplicate emails/phones are detected with one set-based query for the whole
+request (plus an in-memory pass for duplicates inside the payload); passwords
+are hashed on the bulk process pool; rows are inserted in multi-row batches.
+The insert uses ``ON CONFLICT DO NOTHING RETURNING id`` so a concurrent
+registration turns into a per-record error instead of failing the whole batch.
+"""
+
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.db.utils import insert_for
+from app.models.user import User
+from app.schemas.user import BulkUserItemResult, UserCreate
+
+users_table = User.__table__
+
+
+def find_taken_identifiers(
+    db: Session, emails: Set[str], phones: Set[str]
+) -> Tuple[Set[str], Set[str]]:
+    """Return the subset of ``emails`` and ``phones`` already registered (one query)."""
+    conditions = []
+    if emails:
+        conditions.append(User.email.in_(emails))
+    if phones:
+        conditions.append(User.phone.in_(phones))
+    if not conditions:
+        return set(), set()
+    taken_emails: Set[str] = set()
+    taken_phones: Set[str] = set()
+    for email, phone in db.execute(select(User.email, User.phone).where(or_(*conditions))):
+        if email in emails:
+            taken_emails.add(email)
+        if phone and phone in phones:
+            taken_phones.add(phone)
+    return taken_emails, taken_phones
+
+
+def screen_duplicates(
+    db: Session, users: List[UserCreate]
+) -> Tuple[List[int], Dict[int, str]]:
+    """Split payload indexes into those to create and those rejected (with reason)."""
+    emails = {u.email for u in users}
+    phones = {u.phone for u in users if u.phone}
+    taken_emails, taken_phones = find_taken_identifiers(db, emails, phones)
+
+    accepted: List[int] = []
+    rejected: Dict[int, str] = {}
+    seen_emails: Set[str] = set()
+    seen_phones: Set[str] = set()
+    for index, user in enumerate(users):
+        if user.email in taken_emails:
+            rejected[index] = "Email already registered"
+        elif user.phone and user.phone in taken_phones:
+            rejected[index] = "Phone already registered"
+        elif user.email in seen_emails:
+            rejected[index] = "Duplicate email in request"
+        elif user.phone and user.phone in seen_phones:
+            rejected[index] = "Duplicate phone in request"
+        else:
+            accepted.append(index)
+            seen_emails.add(user.email)
+            if user.phone:
+                seen_phones.add(user.phone)
+    return accepted, rejected
+
+
+def insert_users(
+    db: Session,
+    users: List[UserCreate],
+    indexes: List[int],
+    hashed_passwords: List[str],
+    batch_size: int,
+) -> Dict[int, Optional[uuid.UUID]]:
+    """Insert accepted users in batches; map payload index -> new id (None if it conflicted)."""
+    stmt = insert_for(db, users_table).on_conflict_do_nothing().returning(users_table.c.id)
+    created: Dict[int, Optional[uuid.UUID]] = {}
+    for start in range(0, len(indexes), batch_size):
+        batch = indexes[start : start + batch_size]
+        rows = []
+        for index, hashed in zip(batch, hashed_passwords[start : start + batch_size]):
+            user = users[index]
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "email": user.email,
+                    "phone": user.phone,
+                    "full_name": user.full_name,
+                    "hashed_password": hashed,
+                    "is_active": True,
+                    "is_superuser": False,
+                }
+            )
+        inserted = set(db.scalars(stmt, rows))
+        db.commit()
+        for index, row in zip(batch, rows):
+            created[index] = row["id"] if row["id"] in inserted else None
+    return created
+
+
+def build_results(
+    users: List[UserCreate],
+    rejected: Dict[int, str],
+    created: Dict[int, Optional[uuid.UUID]],
+) -> List[BulkUserItemResult]:
+    results = []
+    for index, user in enumerate(users):
+        if index in rejected:
+            results.append(
+                BulkUserItemResult(index=index, email=user.email, status="error", error=rejected[index])
+            )
+        elif created.get(index) is None:
+            results.append(
+                BulkUserItemResult(
+                    index=index,
+                    email=user.email,
+                    status="error",
+                    error="Email or phone registered concurrently",
+                )
+            )
+        else:
+            results.append(
+                BulkUserItemResult(index=index, email=user.email, status="created", id=created[index])
+            )
+    return results
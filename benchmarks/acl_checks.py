@@ -0,0 +1,45 @@
+"""
+Microbenchmark: string-set ACL checks vs compiled bit-mask checks.
+
+    python -m benchmarks.acl_checks [--number 1000000]
+
+"set" reproduces the previous dependency path (``set(required)`` on every
+call, then ``has_any_permission``); "mask" is what ``require_permissions``
+does now (required mask compiled once, one AND per call).
+"""
+
+import argparse
+import timeit
+
+from app.core.acl import has_any_permission, mask_has_any, permission_mask, required_mask
+
+REQUIRED = ("system.admin", "group.view", "group.manage_members")
+
+CASES = {
+    "granted (last)": {"wallet.view", "wallet.debit", "events.manage", "group.manage_members"},
+    "denied": {"wallet.view", "wallet.debit", "events.manage", "notifications.configure"},
+    "all": {"all"},
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    required_bits = required_mask(REQUIRED)
+    print(f"{'case':<16} {'set ns/check':>13} {'mask ns/check':>14} {'speedup':>8}")
+    for name, perms in CASES.items():
+        mask = permission_mask(perms)
+        assert has_any_permission(perms, set(REQUIRED)) == mask_has_any(mask, required_bits)
+        set_s = timeit.timeit(
+            lambda: has_any_permission(perms, set(REQUIRED)), number=args.number
+        )
+        mask_s = timeit.timeit(lambda: mask_has_any(mask, required_bits), number=args.number)
+        set_ns = set_s / args.number * 1e9
+        mask_ns = mask_s / args.number * 1e9
+        print(f"{name:<16} {set_ns:>13.1f} {mask_ns:>14.1f} {set_ns / mask_ns:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+Benchmark: load test of the API in-process, with a realistic request mix.
+
+    python -m benchmarks.api_load [--database-url URL] [--async] [--mix read]
+        [--concurrency 16] [--requests 2000 | --duration 30] [--output FILE]
+        [--compare BASELINE.json]
+
+Boots ``create_application()`` and drives it through ``httpx.ASGITransport``
+(no sockets, no server process), so the numbers cover routing, auth,
+permission checks, SQL and serialization. Every response carries
+``Server-Timing`` (enabled for the run), which gives the queries and DB time
+of each request.
+
+Without ``--database-url`` the run uses a throwaway SQLite file as a
+containerless stand-in; pass a Postgres URL (migrated to head) for numbers
+that mean something for production. The fixture (users, a group tree, group
+and platform roles, clients) is created on first use and reused afterwards,
+so runs against the same database are comparable.
+
+Mixes are ``name=weight`` lists over the scenarios below, or a preset:
+``read`` (default), ``login`` (a login burst) and ``lists``. Results go to
+``benchmarks/results/api_load-<timestamp>.json``; ``--compare`` prints the
+change against an earlier result file.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+BENCH_PASSWORD = "bench-password"
+BENCH_DOMAIN = "bench.example.com"
+ADMIN_EMAIL = f"bench-admin@{BENCH_DOMAIN}"
+
+PRESETS = {
+    "read": "login=1,me=10,group_read=6,list_groups=4,list_clients=2,list_roles=2",
+    "login": "login=1",
+    "lists": "list_groups=2,list_clients=1,list_roles=1",
+}
+
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="queries=(\d+)"')
+
+
+@dataclass
+class Fixture:
+    emails: List[str]
+    group_of: Dict[str, str]
+    tokens: Dict[str, str] = field(default_factory=dict)
+    admin_token: str = ""
+
+
+@dataclass
+class Sample:
+    scenario: str
+    seconds: float
+    status: int
+    queries: Optional[int]
+    db_seconds: Optional[float]
+
+
+# ---------------------------------------------------------------------------
+# Fixture
+# ---------------------------------------------------------------------------
+
+
+def ensure_fixture(users: int, groups: int) -> Fixture:
+    """Create (or reuse) the benchmark users, groups, roles and clients."""
+    import app.services.group_hierarchy  # noqa: F401  (closure rows for seeded groups)
+    from sqlalchemy import insert, select
+    from sqlalchemy.orm import Session
+
+    from app.core.security import get_password_hash
+    from app.db.base import Base
+    from app.db.session import get_engine
+    from app.models.client import Client
+    from app.models.group import Group, GroupMembership
+    from app.models.role import Role, UserRoleAssignment
+    from app.models.user import User
+
+    engine = get_engine()
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        existing = db.execute(
+            select(User.email, GroupMembership.group_id)
+            .join(GroupMembership, GroupMembership.user_id == User.id)
+            .where(User.email.like(f"bench-user-%@{BENCH_DOMAIN}"))
+        ).all()
+        if existing:
+            return Fixture(
+                emails=sorted(email for email, _ in existing),
+                group_of={email: str(group_id) for email, group_id in existing},
+            )
+
+        viewer = Role(name="bench-viewer", permissions=["group.view"])
+        admin_role = Role(name="bench-admin", permissions=["system.admin"])
+        tree: List[Group] = []
+        for i in range(groups):
+            parent = tree[(i - 1) // 4] if i else None
+            tree.append(Group(name=f"bench-group-{i}", parent_group=parent))
+        db.add_all([viewer, admin_role, *tree])
+        db.flush()
+        db.add_all(
+            Client(name=f"bench-client-{i}", default_group_id=tree[i].id)
+            for i in range(min(groups, 20))
+        )
+
+        # bcrypt once: every benchmark user shares the same password hash.
+        hashed = get_password_hash(BENCH_PASSWORD)
+        admin = User(email=ADMIN_EMAIL, hashed_password=hashed)
+        db.add(admin)
+        db.flush()
+        db.add(UserRoleAssignment(user_id=admin.id, role_id=admin_role.id))
+
+        rows = [
+            {"email": f"bench-user-{i:05d}@{BENCH_DOMAIN}", "hashed_password": hashed}
+            for i in range(users)
+        ]
+        user_ids = db.scalars(insert(User).returning(User.id), rows).all()
+        memberships = []
+        assignments = []
+        group_of = {}
+        for i, (row, user_id) in enumerate(zip(rows, user_ids)):
+            group = tree[i % len(tree)]
+            group_of[row["email"]] = str(group.id)
+            memberships.append({"user_id": user_id, "group_id": group.id, "status": "active"})
+            assignments.append(
+                {
+                    "user_id": user_id,
+                    "role_id": viewer.id,
+                    "scope_type": "group",
+                    "scope_id": group.id,
+                }
+            )
+        db.execute(insert(GroupMembership), memberships)
+        db.execute(insert(UserRoleAssignment), assignments)
+        db.commit()
+        return Fixture(emails=[r["email"] for r in rows], group_of=group_of)
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+
+def _bearer(token: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def login(client: httpx.AsyncClient, email: str) -> httpx.Response:
+    return await client.post(
+        "/api/v1/auth/login/json", json={"email": email, "password": BENCH_PASSWORD}
+    )
+
+
+async def _scenario_login(client, fixture, rng):
+    return await login(client, rng.choice(fixture.emails))
+
+
+async def _scenario_me(client, fixture, rng):
+    email = rng.choice(list(fixture.tokens))
+    return await client.get("/api/v1/auth/me", headers=_bearer(fixture.tokens[email]))
+
+
+async def _scenario_group_read(client, fixture, rng):
+    email = rng.choice(list(fixture.tokens))
+    return await client.get(
+        f"/api/v1/groups/{fixture.group_of[email]}", headers=_bearer(fixture.tokens[email])
+    )
+
+
+async def _scenario_list_groups(client, fixture, rng):
+    email = rng.choice(list(fixture.tokens))
+    return await client.get(
+        "/api/v1/groups/", params={"limit": 50}, headers=_bearer(fixture.tokens[email])
+    )
+
+
+async def _scenario_list_clients(client, fixture, rng):
+    return await client.get(
+        "/api/v1/clients/", params={"limit": 50}, headers=_bearer(fixture.admin_token)
+    )
+
+
+async def _scenario_list_roles(client, fixture, rng):
+    return await client.get(
+        "/api/v1/roles/", params={"limit": 50}, headers=_bearer(fixture.admin_token)
+    )
+
+
+SCENARIOS = {
+    "login": _scenario_login,
+    "me": _scenario_me,
+    "group_read": _scenario_group_read,
+    "list_groups": _scenario_list_groups,
+    "list_clients": _scenario_list_clients,
+    "list_roles": _scenario_list_roles,
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    spec = PRESETS.get(spec, spec)
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r} (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    fixture: Fixture,
+    mix: Dict[str, float],
+    concurrency: int,
+    requests: Optional[int],
+    duration: Optional[float],
+    seed: int,
+) -> Tuple[List[Sample], float]:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples: List[Sample] = []
+    issued = 0
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    async def worker(index: int) -> None:
+        nonlocal issued
+        rng = random.Random(seed * 1000 + index)
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+            elif issued >= requests:
+                return
+            issued += 1
+            scenario = rng.choices(names, weights)[0]
+            t0 = time.perf_counter()
+            response = await SCENARIOS[scenario](client, fixture, rng)
+            elapsed = time.perf_counter() - t0
+            timing = SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+            samples.append(
+                Sample(
+                    scenario,
+                    elapsed,
+                    response.status_code,
+                    int(timing.group(2)) if timing else None,
+                    float(timing.group(1)) / 1000 if timing else None,
+                )
+            )
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[Sample], wall_seconds: float) -> dict:
+    latencies = sorted(s.seconds for s in samples)
+    queries = [s.queries for s in samples if s.queries is not None]
+    db_seconds = [s.db_seconds for s in samples if s.db_seconds is not None]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s.status >= 400),
+        "throughput_rps": round(len(samples) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(_percentile(latencies, 50) * 1000, 3),
+            "p95": round(_percentile(latencies, 95) * 1000, 3),
+            "p99": round(_percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+        "db_ms_per_request": round(statistics.fmean(db_seconds) * 1000, 3) if db_seconds else None,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result: dict, baseline: Optional[dict]) -> None:
+    print(
+        f"{'scenario':<14} {'reqs':>6} {'err':>5} {'rps':>9} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'p99 ms':>9} {'q/req':>6}"
+    )
+    rows = [*sorted(result["scenarios"].items()), ("TOTAL", result["total"])]
+    for name, s in rows:
+        lat = s["latency_ms"]
+        line = (
+            f"{name:<14} {s['requests']:>6} {s['errors']:>5} {s['throughput_rps']:>9.1f} "
+            f"{lat['p50']:>9.2f} {lat['p95']:>9.2f} {lat['p99']:>9.2f} "
+            f"{s['queries_per_request'] if s['queries_per_request'] is not None else '-':>6}"
+        )
+        old = (
+            baseline["total"]
+            if baseline and name == "TOTAL"
+            else (baseline or {}).get("scenarios", {}).get(name)
+        )
+        if old and old["latency_ms"]["p95"]:
+            change = (lat["p95"] / old["latency_ms"]["p95"] - 1) * 100
+            line += f"   p95 {change:+.1f}% vs baseline"
+        print(line)
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    from app.db.session import get_engine
+    from app.main import create_application
+
+    mix = parse_mix(args.mix)
+    fixture = ensure_fixture(args.users, args.groups)
+    app = create_application()
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Sessions used by the authenticated scenarios (login itself is a scenario).
+            emails = fixture.emails[: args.sessions]
+            responses = await asyncio.gather(*(login(client, email) for email in emails))
+            responses.append(await login(client, ADMIN_EMAIL))
+            for email, response in zip([*emails, ADMIN_EMAIL], responses):
+                response.raise_for_status()
+                fixture.tokens[email] = response.json()["access_token"]
+            fixture.admin_token = fixture.tokens.pop(ADMIN_EMAIL)
+
+            for _ in range(args.warmup):
+                for scenario in mix:
+                    await SCENARIOS[scenario](client, fixture, random.Random(args.seed))
+
+            samples, wall = await run_load(
+                client,
+                fixture,
+                mix,
+                args.concurrency,
+                None if args.duration else args.requests,
+                args.duration,
+                args.seed,
+            )
+
+    by_scenario: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_scenario.setdefault(sample.scenario, []).append(sample)
+    return {
+        "benchmark": "api_load",
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "database": get_engine().dialect.name,
+        "db_async": os.environ.get("DB_ASYNC") == "true",
+        "config": {
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "requests": None if args.duration else args.requests,
+            "duration": args.duration,
+            "users": len(fixture.emails),
+            "sessions": len(fixture.tokens),
+            "seed": args.seed,
+        },
+        "wall_seconds": round(wall, 3),
+        "total": summarize(samples, wall),
+        "scenarios": {name: summarize(group, wall) for name, group in by_scenario.items()},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="default: a throwaway SQLite file")
+    parser.add_argument("--async", dest="db_async", action="store_true", help="use the async DB stack")
+    parser.add_argument("--mix", default="read", help=f"preset ({', '.join(PRESETS)}) or name=weight,...")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--duration", type=float, help="run for N seconds instead of --requests")
+    parser.add_argument("--warmup", type=int, default=3, help="requests per scenario before measuring")
+    parser.add_argument("--users", type=int, default=200, help="benchmark users to create")
+    parser.add_argument("--groups", type=int, default=50, help="benchmark groups to create")
+    parser.add_argument("--sessions", type=int, default=20, help="logged-in users driving reads")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time, so configure the app before importing it.
+    if args.database_url is None:
+        path = Path(tempfile.gettempdir()) / "savemo-bench.db"
+        args.database_url = f"sqlite:///{path}"
+        if args.db_async:
+            os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DB_ASYNC"] = "true" if args.db_async else "false"
+    os.environ["SERVER_TIMING_ENABLED"] = "true"
+
+    result = asyncio.run(_main(args))
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(result, baseline)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / f"api_load-{stamp}.json"
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Benchmark: contribution schedule generation, per-member loop vs the vectorised engine.
+
+    python -m benchmarks.contribution_schedules [--members 10000] [--years 2]
+        [--database-url URL] [--no-write] [--seed 1] [--output FILE]
+
+For goals of every frequency (monthly, quarterly, weekly, biweekly and
+every 10 days) over ``--years``, with ``--members`` members who joined at
+random dates, computes all schedules twice:
+- a straightforward Python loop over members and due dates, and
+- ``app.services.schedule_engine`` (NumPy arrays, no per-member loop),
+checks that both produce exactly the same rows, and reports the time of
+each. Exits with status 1 if they differ.
+
+Unless ``--no-write``, it then creates a group with ``--members`` active
+members and times ``contribution_schedules.create_goal`` end to end
+(member query, computation and the bulk write: COPY on Postgres, INSERT
+batches elsewhere) for a weekly goal. Without ``--database-url`` that runs
+on a throwaway SQLite file; pass a Postgres URL (migrated to head) for the
+COPY path. Results go to
+``benchmarks/results/contribution_schedules-<timestamp>.json``.
+"""
+
+import argparse
+import calendar
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.api_load import RESULTS_DIR, _git_revision
+
+GOALS = [
+    ("monthly", None),
+    ("quarterly", None),
+    ("weekly", None),
+    ("biweekly", None),
+    ("custom", 10),
+]
+AMOUNT = 500
+BENCH_DOMAIN = "bench.example.com"
+
+
+def _nth_due_date(start: date, months: int, days: int, n: int) -> date:
+    if months:
+        month = start.month - 1 + n * months
+        year, month = start.year + month // 12, month % 12 + 1
+        return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+    return start + timedelta(days=n * days)
+
+
+def loop_schedules(
+    start: date, end: date, frequency: str, interval_days: Optional[int], owed_from: List[date]
+) -> List[tuple]:
+    """One member and one due date at a time."""
+    from app.services.schedule_engine import DAY_STEPS, MONTH_STEPS
+
+    months = MONTH_STEPS.get(frequency, 0)
+    days = interval_days if frequency == "custom" else DAY_STEPS.get(frequency, 0)
+    rows = []
+    for member, since in enumerate(owed_from):
+        period = 0
+        due = start
+        while due <= end:
+            if due >= since:
+                rows.append((member, period, due, AMOUNT))
+            period += 1
+            due = _nth_due_date(start, months, days, period)
+    return rows
+
+
+def engine_schedules(
+    start: date, end: date, frequency: str, interval_days: Optional[int], owed_from: List[date]
+):
+    from app.services import schedule_engine
+
+    grid = schedule_engine.grid(
+        schedule_engine.due_dates(start, end, frequency, interval_days), start
+    )
+    return schedule_engine.expand(grid, owed_from, amount=AMOUNT)
+
+
+def compare(args: argparse.Namespace) -> Dict[str, dict]:
+    rng = random.Random(args.seed)
+    start = date(2026, 1, 31)
+    end = start + timedelta(days=round(365.25 * args.years))
+    span = (end - start).days
+    owed_from = [start + timedelta(days=rng.randint(-30, span)) for _ in range(args.members)]
+
+    results = {}
+    for frequency, interval_days in GOALS:
+        name = frequency if interval_days is None else f"every {interval_days} days"
+        started = time.perf_counter()
+        expected = loop_schedules(start, end, frequency, interval_days, owed_from)
+        loop_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        schedule = engine_schedules(start, end, frequency, interval_days, owed_from)
+        engine_seconds = time.perf_counter() - started
+
+        actual = list(
+            zip(
+                schedule.member.tolist(),
+                schedule.period.tolist(),
+                schedule.due_date.tolist(),
+                schedule.amount.tolist(),
+            )
+        )
+        results[name] = {
+            "rows": len(expected),
+            "loop_ms": round(loop_seconds * 1000, 2),
+            "engine_ms": round(engine_seconds * 1000, 2),
+            "speedup": round(loop_seconds / engine_seconds, 1) if engine_seconds else None,
+            "identical": actual == expected,
+        }
+    return results
+
+
+def write_goal(members: int) -> dict:
+    """Time ``create_goal`` for a weekly goal over a fresh group of ``members``."""
+    from sqlalchemy import func, insert, select
+    from sqlalchemy.orm import Session
+
+    from app.db.base import Base
+    from app.db.session import get_engine
+    from app.models.goal import ContributionSchedule
+    from app.models.group import Group, GroupMembership
+    from app.models.user import User
+    from app.services import contribution_schedules
+
+    engine = get_engine()
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+
+    run_id = uuid.uuid4().hex[:8]
+    today = datetime.now(timezone.utc).date()
+    with Session(engine) as db:
+        group = Group(name=f"bench-goals-{run_id}")
+        db.add(group)
+        db.flush()
+        users = [
+            {
+                "id": uuid.uuid4(),
+                "email": f"bench-goals-{run_id}-{i}@{BENCH_DOMAIN}",
+                "hashed_password": "!",
+            }
+            for i in range(members)
+        ]
+        db.execute(insert(User.__table__), users)
+        db.execute(
+            insert(GroupMembership.__table__),
+            [
+                {"id": uuid.uuid4(), "user_id": user["id"], "group_id": group.id, "status": "active"}
+                for user in users
+            ],
+        )
+        db.commit()
+
+        started = time.perf_counter()
+        goal = contribution_schedules.create_goal(
+            db,
+            group_id=group.id,
+            name=f"bench-goals-{run_id}",
+            currency="KES",
+            contribution_amount=AMOUNT,
+            frequency="weekly",
+            start_date=today,
+            end_date=today + timedelta(days=364),
+        )
+        db.commit()
+        seconds = time.perf_counter() - started
+        rows = db.scalar(
+            select(func.count())
+            .select_from(ContributionSchedule)
+            .where(ContributionSchedule.goal_id == goal.id)
+        )
+    return {
+        "database": engine.dialect.name,
+        "members": members,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--members", type=int, default=10_000)
+    parser.add_argument("--years", type=float, default=2.0, help="length of each goal")
+    parser.add_argument("--database-url", help="default: a throwaway SQLite file")
+    parser.add_argument("--no-write", action="store_true", help="skip the end-to-end create_goal run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time, so configure the app before importing it.
+    if args.database_url is None:
+        path = Path(tempfile.gettempdir()) / "savemo-bench-goals.db"
+        args.database_url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = args.database_url
+
+    goals = compare(args)
+    for name, r in goals.items():
+        print(
+            f"{name:>14}: {r['rows']:>9} rows  loop {r['loop_ms']:>9.1f} ms  "
+            f"engine {r['engine_ms']:>7.1f} ms  x{r['speedup']}"
+            + ("" if r["identical"] else "  DIFFERENT OUTPUT")
+        )
+    write = None if args.no_write else write_goal(args.members)
+    if write:
+        print(
+            f"create_goal ({write['database']}): {write['rows']} rows for {write['members']} "
+            f"members in {write['seconds']:.2f}s ({write['rows_per_second']}/s)"
+        )
+
+    result = {
+        "benchmark": "contribution_schedules",
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {"members": args.members, "years": args.years, "seed": args.seed},
+        "goals": goals,
+        "create_goal": write,
+    }
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / f"contribution_schedules-{stamp}.json"
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"results written to {output}", file=sys.stderr)
+    if not all(r["identical"] for r in goals.values()):
+        print("FAILED: the engine and the loop disagree")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: import-time budget for ``app.main`` (worker cold start).
+
+    python -m benchmarks.import_time [--max-ratio 2.5] [--budget-ms MS] [--runs 5]
+        [--async] [--top 15]
+
+Imports the app in fresh interpreters under ``python -X importtime`` and
+takes the fastest run. Exits with status 1 when
+- the cumulative import time of ``app.main`` exceeds ``--max-ratio`` times
+  that of the frameworks it cannot avoid (``BASELINE_IMPORTS``, measured
+  the same way on the same machine), or ``--budget-ms`` when given, or
+- a module that must only load at startup or on first use is imported:
+  DB drivers (engines are created in the lifespan), NumPy (loaded by the
+  contribution schedule engine on first use) and, for the sync stack,
+  the async route modules (the async ones reuse helpers from the sync
+  modules, so the reverse does not hold).
+
+The same checks run in ``tests/test_import_time.py``. Absolute times depend
+on the machine (and its load), so the default gate is relative to the
+framework baseline; set ``--budget-ms`` only from times measured on the CI
+runner, with headroom.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# app.main may take at most this many times as long as BASELINE_IMPORTS.
+DEFAULT_MAX_RATIO = 2.5
+BASELINE_IMPORTS = (
+    "import fastapi, fastapi.security, sqlalchemy.orm, pydantic_settings,"
+    " email_validator, jwt, bcrypt"
+)
+
+DEFERRED_MODULES = ["psycopg2", "asyncpg", "aiosqlite", "numpy"]
+ROUTE_MODULES = ["auth", "clients", "goals", "groups", "roles", "users", "wallets"]
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    # Imported by the measured statement itself, not by another module.
+    top_level: bool
+
+
+def measure(db_async: bool, code: str = "import app.main") -> List[ImportRecord]:
+    env = dict(os.environ, DB_ASYNC="true" if db_async else "false")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"{code!r} failed:\n{proc.stderr[-2000:]}")
+    records = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        top_level = not name[1:].startswith(" ")
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), top_level))
+    return records
+
+
+def total_ms(records: List[ImportRecord]) -> float:
+    return sum(r.cumulative_us for r in records if r.top_level) / 1000
+
+
+def fastest_ms(db_async: bool, runs: int, code: str) -> float:
+    return min(total_ms(measure(db_async, code)) for _ in range(max(runs, 1)))
+
+
+def unexpected_modules(records: List[ImportRecord], db_async: bool) -> List[str]:
+    forbidden = set(DEFERRED_MODULES)
+    if not db_async:
+        forbidden.update(f"app.api.v1.routes_{name}_async" for name in ROUTE_MODULES)
+    return sorted({r.name for r in records if r.name in forbidden})
+
+
+def report(records: List[ImportRecord], top: int) -> None:
+    packages: Dict[str, int] = {}
+    for r in records:
+        root = r.name.split(".")[0]
+        if root != "app":
+            packages[root] = packages.get(root, 0) + r.self_us
+    own = sorted((r for r in records if r.name.split(".")[0] == "app"), key=lambda r: -r.self_us)
+
+    print("slowest third-party / stdlib packages (self ms, all modules):")
+    for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {us / 1000:>8.1f}  {name}")
+    print("slowest app modules (self ms):")
+    for r in own[:top]:
+        print(f"  {r.self_us / 1000:>8.1f}  {r.name}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO)
+    parser.add_argument("--budget-ms", type=float, help="also fail above this absolute time")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters; the fastest counts")
+    parser.add_argument("--async", dest="db_async", action="store_true", help="DB_ASYNC=true")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.db_async) for _ in range(max(args.runs, 1))]
+    best = min(runs, key=total_ms)
+    report(best, args.top)
+
+    elapsed = total_ms(best)
+    baseline = fastest_ms(args.db_async, args.runs, BASELINE_IMPORTS)
+    failures = []
+    if elapsed > args.max_ratio * baseline:
+        failures.append(
+            f"import app.main took {elapsed:.0f} ms, more than {args.max_ratio}x"
+            f" the framework baseline ({baseline:.0f} ms)"
+        )
+    if args.budget_ms is not None and elapsed > args.budget_ms:
+        failures.append(f"import app.main took {elapsed:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for name in unexpected_modules(best, args.db_async):
+        failures.append(f"{name} is imported at import time")
+
+    print(
+        f"import app.main: {elapsed:.0f} ms, {elapsed / baseline:.2f}x the framework"
+        f" baseline of {baseline:.0f} ms (max {args.max_ratio}x)"
+    )
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
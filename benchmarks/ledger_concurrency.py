@@ -0,0 +1,289 @@
+"""
+Benchmark: concurrent postings on one hot group wallet, checked for lost updates.
+
+    python -m benchmarks.ledger_concurrency [--database-url URL] [--threads 32]
+        [--postings 5000 | --duration 30] [--members 50] [--payout-share 0.45]
+        [--output FILE]
+
+Opens a group wallet and ``--members`` funded member wallets, then runs
+``--threads`` workers, each posting through ``app.services.ledger`` on its
+own session as fast as it can: contributions (member -> group transfers)
+and, with probability ``--payout-share``, payouts (group -> member) that
+race the contributions for the group's funds and are rejected when the
+group cannot cover them. Every posting touches the group wallet's row.
+
+Afterwards it checks that
+- each wallet's snapshot is its opening balance plus the net of the
+  postings the workers saw commit (a lost update leaves them apart);
+- ``ledger.audit`` finds nothing: snapshots match the entry history,
+  sequences are gapless and every transaction balances;
+- no wallet's available funds went below its minimum;
+and exits with status 1 otherwise. It reports committed postings/s (all on
+the hot wallet) and commit latency percentiles; results go to
+``benchmarks/results/ledger_concurrency-<timestamp>.json``.
+
+Without ``--database-url`` the run uses a throwaway SQLite file. SQLite has
+one lock for all writers, so that checks correctness but not row-lock
+throughput: pass a Postgres URL (migrated to head) for numbers that mean
+something for production.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.api_load import RESULTS_DIR, _git_revision, _percentile
+
+CURRENCY = "KES"
+BENCH_DOMAIN = "bench.example.com"
+
+
+@dataclass
+class Fixture:
+    run_id: str
+    hot: Any
+    members: List[Any]
+    opening: Dict[uuid.UUID, int]
+
+
+@dataclass
+class WorkerStats:
+    committed: int = 0
+    rejected: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    latencies: List[float] = field(default_factory=list)
+    # Net amount each wallet moved by, over the postings seen to commit.
+    net: Dict[uuid.UUID, int] = field(default_factory=dict)
+
+
+def create_fixture(members: int, opening: int) -> Fixture:
+    """A fresh group wallet and funded member wallets (new owners on every run)."""
+    from sqlalchemy.orm import Session
+
+    from app.db.base import Base
+    from app.db.session import get_engine
+    from app.models.group import Group
+    from app.models.user import User
+    from app.services import ledger
+
+    engine = get_engine()
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+
+    run_id = uuid.uuid4().hex[:8]
+    with Session(engine, expire_on_commit=False) as db:
+        group = Group(name=f"bench-ledger-{run_id}")
+        users = [
+            User(email=f"bench-ledger-{run_id}-{i}@{BENCH_DOMAIN}", hashed_password="!")
+            for i in range(members)
+        ]
+        db.add_all([group, *users])
+        db.flush()
+        hot = ledger.create_wallet(db, "group", group.id, CURRENCY)
+        wallets = [ledger.create_wallet(db, "user", user.id, CURRENCY) for user in users]
+        for i, wallet in enumerate(wallets):
+            ledger.credit(db, wallet, opening, f"bench-{run_id}-fund-{i}")
+        db.commit()
+    balances = {wallet.id: opening for wallet in wallets}
+    balances[hot.id] = 0
+    return Fixture(run_id=run_id, hot=hot, members=wallets, opening=balances)
+
+
+def run_workers(fixture: Fixture, args: argparse.Namespace) -> tuple:
+    from sqlalchemy.exc import DBAPIError
+    from sqlalchemy.orm import Session
+
+    from app.db.session import get_engine
+    from app.services import ledger
+
+    engine = get_engine()
+    issued = itertools.count()
+    deadline = time.perf_counter() + args.duration if args.duration else None
+    start = threading.Barrier(args.threads + 1)
+
+    def worker(index: int, stats: WorkerStats) -> None:
+        rng = random.Random(args.seed * 1000 + index)
+        start.wait()
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+                n = next(issued)
+            else:
+                n = next(issued)
+                if n >= args.postings:
+                    return
+            member = rng.choice(fixture.members)
+            amount = rng.randint(1, 100)
+            if rng.random() < args.payout_share:
+                source, target = fixture.hot, member
+            else:
+                source, target = member, fixture.hot
+            started = time.perf_counter()
+            with Session(engine) as db:
+                try:
+                    ledger.transfer(
+                        db, source, target.id, amount, f"bench-{fixture.run_id}-{n}"
+                    )
+                    db.commit()
+                except ledger.InsufficientFunds:
+                    db.rollback()
+                    stats.rejected += 1
+                    continue
+                except DBAPIError as exc:
+                    # Deadlocks or lock timeouts would land here; there should be none.
+                    db.rollback()
+                    name = type(exc.orig).__name__
+                    stats.errors[name] = stats.errors.get(name, 0) + 1
+                    continue
+            stats.latencies.append(time.perf_counter() - started)
+            stats.committed += 1
+            stats.net[source.id] = stats.net.get(source.id, 0) - amount
+            stats.net[target.id] = stats.net.get(target.id, 0) + amount
+
+    stats = [WorkerStats() for _ in range(args.threads)]
+    threads = [
+        threading.Thread(target=worker, args=(i, s), daemon=True) for i, s in enumerate(stats)
+    ]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return stats, time.perf_counter() - began
+
+
+def verify(fixture: Fixture, stats: List[WorkerStats]) -> List[str]:
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    from app.db.session import get_engine
+    from app.models.wallet import Wallet
+    from app.services import ledger
+
+    expected = dict(fixture.opening)
+    for s in stats:
+        for wallet_id, net in s.net.items():
+            expected[wallet_id] += net
+
+    with Session(get_engine()) as db:
+        problems = ledger.audit(db)
+        rows = db.execute(
+            select(Wallet.id, Wallet.balance, Wallet.held, Wallet.min_balance).where(
+                Wallet.id.in_(expected)
+            )
+        ).all()
+    for wallet_id, balance, held, min_balance in rows:
+        if balance != expected[wallet_id]:
+            problems.append(
+                f"wallet {wallet_id}: balance {balance}, committed postings say {expected[wallet_id]}"
+            )
+        if balance - held < min_balance:
+            problems.append(f"wallet {wallet_id}: available {balance - held} < minimum {min_balance}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="default: a throwaway SQLite file")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--postings", type=int, default=5000)
+    parser.add_argument("--duration", type=float, help="run for N seconds instead of --postings")
+    parser.add_argument("--members", type=int, default=50, help="member wallets contributing")
+    parser.add_argument("--opening", type=int, default=1_000_000, help="member opening balance")
+    parser.add_argument("--payout-share", type=float, default=0.45)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time, so configure the app before importing it.
+    if args.database_url is None:
+        path = Path(tempfile.gettempdir()) / "savemo-bench-ledger.db"
+        args.database_url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = args.database_url
+    # One connection per worker: measure lock waits, not pool queueing.
+    os.environ["DB_POOL_SIZE"] = str(args.threads)
+    os.environ["DB_MAX_OVERFLOW"] = "0"
+
+    from app.db.session import get_engine
+
+    fixture = create_fixture(args.members, args.opening)
+    stats, wall = run_workers(fixture, args)
+    problems = verify(fixture, stats)
+
+    latencies = sorted(itertools.chain.from_iterable(s.latencies for s in stats))
+    committed = sum(s.committed for s in stats)
+    errors: Dict[str, int] = {}
+    for s in stats:
+        for name, count in s.errors.items():
+            errors[name] = errors.get(name, 0) + count
+    result = {
+        "benchmark": "ledger_concurrency",
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "database": get_engine().dialect.name,
+        "config": {
+            "threads": args.threads,
+            "postings": None if args.duration else args.postings,
+            "duration": args.duration,
+            "members": args.members,
+            "payout_share": args.payout_share,
+            "seed": args.seed,
+        },
+        "wall_seconds": round(wall, 3),
+        "committed": committed,
+        "rejected_insufficient_funds": sum(s.rejected for s in stats),
+        "errors": errors,
+        "hot_wallet_postings_per_second": round(committed / wall, 2) if wall else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(_percentile(latencies, 50) * 1000, 3),
+            "p95": round(_percentile(latencies, 95) * 1000, 3),
+            "p99": round(_percentile(latencies, 99) * 1000, 3),
+        },
+        "problems": problems,
+    }
+
+    print(
+        f"{result['database']}: {committed} postings committed in {wall:.2f}s "
+        f"({result['hot_wallet_postings_per_second']:.1f}/s on the hot wallet), "
+        f"{result['rejected_insufficient_funds']} rejected (insufficient funds), "
+        f"errors {errors or 'none'}"
+    )
+    lat = result["latency_ms"]
+    print(f"commit latency ms: p50 {lat['p50']:.2f}  p95 {lat['p95']:.2f}  p99 {lat['p99']:.2f}")
+    if problems:
+        print(f"FAILED: {len(problems)} consistency problem(s)")
+        for problem in problems[:20]:
+            print(f"  {problem}")
+    else:
+        print("consistent: no lost updates, snapshots match the history, no overdraft")
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / f"ledger_concurrency-{stamp}.json"
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"results written to {output}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
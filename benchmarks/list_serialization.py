@@ -0,0 +1,79 @@
+"""
+Benchmark: per-row cost of a list page, ORM + response_model vs the fast path.
+
+    python -m benchmarks.list_serialization [--rows 200] [--repeat 50]
+
+Runs against an in-memory SQLite database so it measures Python-side work:
+"orm" loads ``Group`` objects, validates each through ``GroupRead`` and
+encodes with ``jsonable_encoder`` + stdlib json (what FastAPI does for a
+returned list); "fast" selects the schema columns as Core rows and encodes
+them with ``rows_response`` (orjson, no per-row validation).
+"""
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.api.serialization import rows_response, schema_columns
+from app.db.base import Base
+from app.models.group import Group
+from app.schemas import GroupRead
+
+
+def orm_page(db: Session, limit: int) -> bytes:
+    groups = db.scalars(select(Group).order_by(Group.created_at, Group.id).limit(limit)).all()
+    content = jsonable_encoder([GroupRead.model_validate(g) for g in groups])
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_page(db: Session, limit: int) -> bytes:
+    stmt = select(*schema_columns(Group, GroupRead)).order_by(Group.created_at, Group.id)
+    rows = db.execute(stmt.limit(limit)).all()
+    return rows_response(rows, Group, GroupRead, Response()).body
+
+
+def per_row_us(engine, page: Callable[[Session, int], bytes], rows: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        with Session(engine) as db:
+            started = time.perf_counter()
+            page(db, rows)
+            best = min(best, time.perf_counter() - started)
+    return best / rows * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.execute(
+            insert(Group),
+            [
+                {"name": f"Group {i}", "code": f"G{i:06d}", "description": "Savings group"}
+                for i in range(args.rows)
+            ],
+        )
+        db.commit()
+        assert json.loads(orm_page(db, args.rows)) == json.loads(fast_page(db, args.rows))
+
+    orm_us = per_row_us(engine, orm_page, args.rows, args.repeat)
+    fast_us = per_row_us(engine, fast_page, args.rows, args.repeat)
+    print(f"rows per page: {args.rows}")
+    print(f"orm + response_model: {orm_us:8.2f} us/row")
+    print(f"fast path:            {fast_us:8.2f} us/row  ({orm_us / fast_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Shared fixtures.
+
+Tests that need PostgreSQL (LISTEN/NOTIFY, query plans) use ``postgres_engine``
+and are skipped unless ``TEST_DATABASE_URL`` points at a Postgres database
+migrated to head.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import create_engine
+
+
+@pytest.fixture(scope="session")
+def postgres_engine():
+    url = os.environ.get("TEST_DATABASE_URL", "")
+    if not url.startswith("postgresql"):
+        pytest.skip("TEST_DATABASE_URL is not a PostgreSQL URL")
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from starlette.requests import Request
+
+from app.api.conditional import Validators
+
+
+def make_request(query: str = "", headers: Optional[dict] = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": raw}
+    return Request({**scope, "query_string": query.encode()})
+
+
+def test_page_ignores_if_modified_since_after_a_row_leaves():
+    kept, deleted = uuid.uuid4(), uuid.uuid4()
+    before = [(kept, datetime(2026, 1, 2)), (deleted, datetime(2026, 1, 1))]
+    validators = Validators.for_page(make_request(), before)
+    assert "Last-Modified" not in validators.headers
+
+    # The newest updated_at is unchanged, but the page lost a row.
+    after = Validators.for_page(make_request(), before[:1])
+    since = {"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    assert not after.is_fresh(make_request(headers=since))
+    assert not after.is_fresh(make_request(headers={"If-None-Match": validators.etag}))
+    assert after.is_fresh(make_request(headers={"If-None-Match": after.etag}))
+
+
+def test_row_honours_if_modified_since():
+    validators = Validators.for_row(uuid.uuid4(), datetime(2026, 1, 1))
+    assert "Last-Modified" in validators.headers
+    since = {"If-Modified-Since": validators.headers["Last-Modified"]}
+    assert validators.is_fresh(make_request(headers=since))
@@ -0,0 +1,24 @@
+import pytest
+
+from benchmarks.import_time import (
+    BASELINE_IMPORTS,
+    DEFAULT_MAX_RATIO,
+    fastest_ms,
+    measure,
+    unexpected_modules,
+)
+
+
+@pytest.mark.parametrize("db_async", [False, True], ids=["sync", "async"])
+def test_deferred_modules_are_not_imported(db_async):
+    assert unexpected_modules(measure(db_async), db_async) == []
+
+
+def test_import_time_relative_to_frameworks():
+    # Both sides measured on this machine, fastest of three, so load and
+    # hardware cancel out; the ratio leaves room for noise.
+    app = fastest_ms(False, 3, "import app.main")
+    baseline = fastest_ms(False, 3, BASELINE_IMPORTS)
+    assert app <= DEFAULT_MAX_RATIO * baseline, (
+        f"import app.main took {app:.0f} ms, {app / baseline:.2f}x {baseline:.0f} ms"
+    )
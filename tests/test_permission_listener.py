@@ -0,0 +1,102 @@
+import socket
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+from sqlalchemy import create_engine, text
+
+from app.core.permission_cache import (
+    NOTIFY_CHANNEL,
+    PermissionChangeListener,
+    PermissionSnapshot,
+    _encode_payload,
+    permission_cache,
+)
+
+Notify = namedtuple("Notify", "channel payload")
+
+
+class FakeConnection:
+    """Readable when a notification is queued, like a psycopg2 connection."""
+
+    def __init__(self) -> None:
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self.notifies = []
+
+    def fileno(self) -> int:
+        return self._reader.fileno()
+
+    def poll(self) -> None:
+        try:
+            self._reader.recv(4096)
+        except BlockingIOError:
+            pass
+
+    def send(self, channel: str, payload: str) -> None:
+        self.notifies.append(Notify(channel, payload))
+        self._writer.send(b"\0")
+
+    def close(self) -> None:
+        self._reader.close()
+        self._writer.close()
+
+
+def _cache_entry(user_id: uuid.UUID) -> None:
+    version = permission_cache.version_for(user_id)
+    permission_cache.set(user_id, PermissionSnapshot({"group.view"}, version, None))
+    assert permission_cache.get(user_id) is not None
+
+
+def _wait_for_eviction(user_id: uuid.UUID, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if permission_cache.get(user_id) is None:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_notification_evicts_cached_permissions(monkeypatch):
+    user_id = uuid.uuid4()
+    _cache_entry(user_id)
+    conn = FakeConnection()
+    listener = PermissionChangeListener(create_engine("sqlite://"), poll_seconds=0.05)
+    monkeypatch.setattr(listener, "_connect", lambda: conn)
+    monkeypatch.setattr(listener, "_load_versions", lambda conn: None)
+    received = []
+    listener.subscribe("other_channel", received.append)
+    # start() only runs on Postgres; drive the loop directly.
+    listener._thread = threading.Thread(target=listener._run, daemon=True)
+    listener._thread.start()
+    try:
+        version = permission_cache.version_for(user_id) + 1
+        conn.send(NOTIFY_CHANNEL, _encode_payload(version, user_id))
+        conn.send("other_channel", "payload")
+        assert _wait_for_eviction(user_id)
+        assert permission_cache.version_for(user_id) == version
+        assert received == ["payload"]
+    finally:
+        listener.stop()
+        conn.close()
+
+
+def test_postgres_notify_evicts_cached_permissions(postgres_engine):
+    user_id = uuid.uuid4()
+    _cache_entry(user_id)
+    listener = PermissionChangeListener(postgres_engine, poll_seconds=0.05)
+    connected = threading.Event()
+    listener.subscribe("savemo_test_listener", lambda payload: None, connected.set)
+    listener.start()
+    try:
+        assert connected.wait(5)
+        version = permission_cache.version_for(user_id) + 1
+        with postgres_engine.begin() as conn:
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": NOTIFY_CHANNEL, "payload": _encode_payload(version, user_id)},
+            )
+        assert _wait_for_eviction(user_id)
+    finally:
+        listener.stop()
@@ -0,0 +1,13 @@
+from sqlalchemy.orm import Session
+
+from app.db.query_plans import HOT_PATHS, check, seed
+
+
+def test_hot_paths_use_indexes(postgres_engine):
+    db = Session(bind=postgres_engine)
+    try:
+        failures = check(db, seed(db, 2000))
+    finally:
+        db.rollback()
+        db.close()
+    assert failures == [], f"{len(failures)} of {len(HOT_PATHS)} hot paths seq-scan"
@@ -0,0 +1,18 @@
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.schemas.user import UserCreate
+from app.services.user_provisioning import insert_users, users_table
+
+
+def test_conflicting_row_is_skipped_not_fatal():
+    engine = create_engine("sqlite://")
+    users_table.create(engine)
+    users = [UserCreate(email=f"u{i}@example.com", password="x") for i in range(3)]
+    with Session(bind=engine) as db:
+        # Registered concurrently, after the duplicate screen ran.
+        db.execute(insert(users_table), {"email": "u1@example.com", "hashed_password": "x"})
+        db.commit()
+        created = insert_users(db, users, [0, 1, 2], ["h0", "h1", "h2"], batch_size=2)
+    assert created[1] is None
+    assert created[0] is not None and created[2] is not None